@@ -0,0 +1,202 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Union
+
+from hp import HEALING_ITEMS, HpDistribution
+from ivs import IVs
+from move import Move
+from results import BattleResult, BranchResult
+from species import Species
+
+class ActionHandler(ABC):
+    """Performs one kind of route action
+
+    key is the action's name in the route file. compile is called once per
+    action before the route runs and turns its value into what run needs,
+    raising for anything invalid; run performs the action on the RouteFile
+    and returns its battle or branch results or text to print, if any.
+    """
+    key: str = ''
+
+    def compile(self, route, value: Any) -> Any:
+        return value
+
+    @abstractmethod
+    def run(self, route, value: Any) -> Union[list[BattleResult], BranchResult, str, None]:
+        pass
+
+    def __reduce__(self):
+        # Handlers are shared, so pickled plans point back to the registry
+        return (_registered, (self.key,))
+
+ACTIONS: dict[str, ActionHandler] = {}
+
+def register(handler_cls: type) -> type:
+    '''Class decorator adding an action handler to the registry'''
+    ACTIONS[handler_cls.key] = handler_cls()
+    return handler_cls
+
+def _registered(key: str) -> ActionHandler:
+    return ACTIONS[key]
+
+@dataclass
+class CompiledAction:
+    """A route action with its handler already resolved
+
+    index is the action's 1-based position in the route
+    """
+    handler: ActionHandler
+    value: Any
+    index: int = 0
+
+    def run(self, route) -> Union[list[BattleResult], BranchResult, str, None]:
+        return self.handler.run(route, self.value)
+
+@dataclass
+class WildPoke:
+    """A wild encounter resolved from an identifier like "L5 PIDGEY" """
+    species: Species
+    level: int
+    ivs: IVs
+
+@dataclass
+class FightPlan:
+    """A fight with every identifier resolved
+
+    opponents are (offset, alias) pairs for trainers and WildPokes for
+    wild fights. Stat modifiers, variations and range checks are in the
+    form Battle takes.
+    """
+    opponents: tuple
+    variations: dict
+    range_checks: dict
+    att_mod: Any # StatModifier or dict
+    def_mod: Any # StatModifier or dict
+    participants: int
+    verbosity: int
+    wild: bool = False
+    max_hits: int = 8
+
+@dataclass
+class BranchPlan:
+    """Named lists of actions run from the same state
+
+    common holds the actions every branch starts with, which are run once
+    """
+    common: list[CompiledAction]
+    branches: dict[str, list[CompiledAction]]
+
+@register
+class Fight(ActionHandler):
+    key = 'fight'
+
+    def compile(self, route, value: dict) -> FightPlan:
+        return route.compile_fight(value)
+
+    def run(self, route, value: FightPlan) -> list[BattleResult]:
+        return route.run_fight(value)
+
+@register
+class Wild(ActionHandler):
+    key = 'wild'
+
+    def compile(self, route, value: dict) -> FightPlan:
+        return route.compile_fight(value, True)
+
+    def run(self, route, value: FightPlan) -> list[BattleResult]:
+        return route.run_fight(value)
+
+@register
+class LearnMove(ActionHandler):
+    key = 'learn move'
+
+    def compile(self, route, value) -> tuple[Move, ...]:
+        return route.compile_moves(value)
+
+    def run(self, route, value: tuple[Move, ...]) -> None:
+        for move in value:
+            route.pokemon.moveset.add_move(move)
+
+@register
+class UnlearnMove(ActionHandler):
+    key = 'unlearn move'
+
+    def compile(self, route, value) -> tuple[Move, ...]:
+        return route.compile_moves(value)
+
+    def run(self, route, value: tuple[Move, ...]) -> None:
+        for move in value:
+            route.pokemon.moveset.delete_move(move)
+
+@register
+class UseItem(ActionHandler):
+    key = 'use item'
+
+    def compile(self, route, value) -> tuple[str, ...]:
+        return route.compile_items(value)
+
+    def run(self, route, value: tuple[str, ...]) -> None:
+        for item in value:
+            if item == 'RARE CANDY':
+                route.pokemon.use_candy()
+            elif item in HEALING_ITEMS:
+                if route.hp is None:
+                    route.log(f'{item} has no effect without track_hp')
+                else:
+                    route.hp.heal(HEALING_ITEMS[item])
+            else:
+                route.pokemon.use_vitamin(item)
+
+@register
+class PokemonCenter(ActionHandler):
+    key = 'pokemon center'
+
+    def run(self, route, value) -> None:
+        if route.hp is None:
+            route.log('pokemon center has no effect without track_hp')
+        else:
+            route.hp = HpDistribution(route.pokemon.max_hp)
+
+@register
+class PrintStats(ActionHandler):
+    key = 'print stats'
+
+    def run(self, route, value) -> str:
+        return route.pokemon.print_possible_stats()
+
+@register
+class GetBadge(ActionHandler):
+    key = 'get badge'
+
+    def compile(self, route, value: str) -> str:
+        return route.badge_attribute(value)
+
+    def run(self, route, value: str) -> None:
+        setattr(route.pokemon, value, True)
+
+@register
+class Evolve(ActionHandler):
+    key = 'evolve'
+
+    def compile(self, route, value: str) -> Species:
+        return route.find_species(value)
+
+    def run(self, route, value: Species) -> None:
+        route.pokemon.evolve(value)
+
+@register
+class PrintMoney(ActionHandler):
+    key = 'print money'
+
+    def run(self, route, value) -> str:
+        return f'Current money: {route.money}'
+
+@register
+class Branch(ActionHandler):
+    key = 'branch'
+
+    def compile(self, route, value: dict) -> BranchPlan:
+        return route.compile_branch(value)
+
+    def run(self, route, value: BranchPlan) -> BranchResult:
+        return route.run_branch(value)
@@ -0,0 +1,64 @@
+from copy import deepcopy
+from dataclasses import dataclass
+
+from actions import CompiledAction
+from results import RENDERERS, ActionResult, PokemonState
+from route_parser import RouteException, RouteFile, discard_log
+
+@dataclass
+class RouteRun:
+    """The results of running a route in memory
+
+    actions are the results of each action in order and final is your
+    pokemon's state after the last one
+    """
+    actions: list[ActionResult]
+    final: PokemonState
+
+    def render(self, output_format: str='text') -> str:
+        '''Renders the results the way they would be written to an output file'''
+        renderer = RENDERERS[output_format]()
+        return ''.join(renderer.render(action) for action in self.actions)
+
+@dataclass
+class RoutePlan:
+    """A compiled route, only valid for the route it was compiled from
+
+    Compiling bakes in parts of the config, like the game, your IVs, the
+    default verbosity and max hits, so route is a copy of the route dict
+    to check the plan against.
+    """
+    route: dict
+    actions: list[CompiledAction]
+
+def load_route(route: dict, name: str='route') -> RouteFile:
+    '''Returns a RouteFile for an already loaded route that never prints progress'''
+    ret = RouteFile(name, route=route)
+    ret.log = discard_log
+    return ret
+
+def compile_route(route: dict) -> RoutePlan:
+    '''Validates a route and resolves its identifiers, for run_route to reuse
+
+    Raises InvalidRouteException listing every invalid action
+    '''
+    return RoutePlan(deepcopy(route), load_route(route).compile())
+
+def run_route(route: dict, plan: RoutePlan=None) -> RouteRun:
+    '''Runs a route given as a dict, like a loaded route file, and returns its results
+
+    Nothing is read, written or printed. plan skips compiling the route
+    again when running the same route more than once, and is rejected
+    with a RouteException for any other route, including one with a
+    different config. Game data is loaded the first time a route needs it
+    and shared by every later run; data.load_database loads it up front.
+    '''
+    route_file = load_route(route)
+    if plan is None:
+        actions = route_file.compile()
+    elif plan.route != route:
+        raise RouteException('The plan was compiled from a different route')
+    else:
+        actions = plan.actions
+    results, final = route_file.perform_all(actions)
+    return RouteRun(results, final)
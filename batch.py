@@ -0,0 +1,158 @@
+import asyncio
+import glob
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import data
+from checkpoint import CACHE_DIR
+
+# Routes can only be stopped with a timer signal where there is one
+CAN_TIME_LIMIT = hasattr(signal, 'setitimer')
+
+@dataclass
+class BatchResult:
+    """Represents the outcome of running a single route file"""
+    path: str
+    ok: bool
+    seconds: float
+    error: str = ''
+
+def find_routes(patterns: list[str]) -> list[str]:
+    '''Expands files, directories and glob patterns into route file paths
+
+    Directories include every .yaml/.yml file directly inside them.
+    Duplicates are removed and the order is stable.
+    '''
+    ret = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(str(p) for p in path.iterdir() if p.suffix in {'.yaml', '.yml'})
+        elif path.is_file():
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        for match in matches:
+            if match not in ret:
+                ret.append(match)
+    return ret
+
+@contextmanager
+def time_limit(seconds: float=None) -> Iterator[None]:
+    '''Raises TimeoutError once seconds have passed, where signals allow it'''
+    if not seconds or not CAN_TIME_LIMIT or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TimeoutError(f'still running after {seconds}s')
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def run_route(path: str, incremental: bool=False, output_format: str=None, timeout: float=None) -> BatchResult:
+    '''Parses a single route file, writing its configured output'''
+    # imported here since route_parser imports this module for --batch
+    from route_parser import RouteFile, discard_log
+
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            route = RouteFile(path, CACHE_DIR if incremental else None, output_format)
+            route.log = discard_log
+            if incremental:
+                route.parse(checkpoints=route.checkpoints(), plan=route.cached_plan())
+            else:
+                route.parse()
+    except Exception as e:
+        return BatchResult(path, False, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return BatchResult(path, True, time.perf_counter() - start)
+
+def run_batch(paths: list[str],
+              workers: int=None,
+              incremental: bool=False,
+              output_format: str=None,
+              timeout: float=None
+    ) -> list[BatchResult]:
+    '''Runs route files across a process pool, results are in input order'''
+    async def collect() -> list[BatchResult]:
+        return [result async for result in stream_batch(paths, workers, None, timeout,
+                                                        incremental, output_format)]
+
+    order = {path: idx for idx, path in enumerate(paths)}
+    return sorted(asyncio.run(collect()), key=lambda result: order[result.path])
+
+async def stream_batch(paths: list[str],
+                       workers: int=None,
+                       concurrency: int=None,
+                       timeout: float=None,
+                       incremental: bool=False,
+                       output_format: str=None
+    ) -> AsyncIterator[BatchResult]:
+    '''Runs route files across a process pool, yielding results as they finish
+
+    At most concurrency routes, defaulting to the number of workers, are
+    in the pool at once. A route still running after timeout seconds is
+    stopped and reported as failed. Without signals (on Windows) it can
+    only be reported as failed, timing from when it was submitted, and
+    it keeps its worker and its place among the concurrency routes until
+    it finishes. Closing the generator, or
+    cancelling the task iterating it, cancels every route that hasn't
+    started.
+    '''
+    loop = asyncio.get_running_loop()
+    run = partial(run_route, incremental=incremental, output_format=output_format, timeout=timeout)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=data.load_database)
+    limit = asyncio.Semaphore(concurrency or workers or os.cpu_count() or 1)
+
+    async def job(path: str) -> BatchResult:
+        await limit.acquire()
+        start = time.perf_counter()
+        future = loop.run_in_executor(pool, run, path)
+        # The slot is only free once the route is out of the pool, even if
+        # it's reported as timed out before then
+        future.add_done_callback(lambda _: limit.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), None if CAN_TIME_LIMIT else timeout)
+        except asyncio.TimeoutError:
+            return BatchResult(path, False, time.perf_counter() - start,
+                               f'TimeoutError: still running after {timeout}s')
+
+    tasks = [asyncio.ensure_future(job(path)) for path in paths]
+    try:
+        for result in asyncio.as_completed(tasks):
+            yield await result
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Timed out routes can still be running, which mustn't block the event loop
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def format_results(results: list[BatchResult], wall_seconds: float) -> str:
+    '''Returns a per-file status and timing table'''
+    ret = 'status | seconds | route\n'
+    for result in results:
+        status = 'ok' if result.ok else 'FAILED'
+        line = f'{status.ljust(6)} | {result.seconds:7.2f} | {result.path}'
+        if result.error:
+            line += f' ({result.error})'
+        ret += line + '\n'
+
+    failed = sum(not result.ok for result in results)
+    ret += f'{len(results)} routes, {failed} failed in {wall_seconds:.2f}s'
+    if wall_seconds > 0:
+        ret += f' ({len(results) / wall_seconds:.2f} routes/s)'
+    return ret
@@ -3,8 +3,15 @@ from damage_calc import DamageCalc, n_shot_with_mods
 from pokemon import Pokemon
 from fight_variation import FightVariation
 from move import Move
+from trainer_ai import damage_taken, move_choices
+from results import (BattleResult, EnemyResult, HpResult, MatchupResult, RangeCheckResult,
+                     RangeCheckTurn, SideResult, render_battle, render_matchup,
+                     render_side)
+from workers import Done, executor, submit
 
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from math import ceil
 from typing import Any
 
 @dataclass
@@ -14,36 +21,35 @@ class SingleBattle:
     defender: Pokemon
     att_mod: StatModifier
     def_mod: StatModifier
+    max_hits: int=8 # most hits to show kill chances for
+    ai_layers: tuple[int, ...]=() # the defender's trainer AI move choice layers
 
     def choose_summary(self, verbosity: int, indent: bool=False) -> str:
-        sep = '\n'
-        if indent:
-            sep = '\n\t'
-        ret = ''
-        if verbosity == 0:
-            pass
-        elif verbosity == 1:
-            ret = f'{sep}{sep.join(self.short_summary)}'
-        elif verbosity == 2:
-            ret = f'{sep}{sep.join(self.short_summary)}'
-            ret += f'{sep}{sep.join(self.move_summary())}'
-            ret += f'\n{sep}{sep.join(self.move_summary(reverse=True))}'
-            ret += '\n'
-        else:
-            raise IndexError(f'Could not parse verbosity level {verbosity}')
+        return render_matchup(self.result(verbosity), verbosity, indent)
 
+    def result(self, verbosity: int=2) -> MatchupResult:
+        '''Returns the battle's results, moves are only calculated for verbosity 2
+
+        Verbosity 3 adds the enemy's move choices and the damage it deals
+        '''
+        ret = MatchupResult(self.attacker.level, self.attacker.exp_to_next_level,
+                            self.attacker.exp_for_level, self.attacker.level_name,
+                            self.defender.level_name, self.defender.exp_given())
+        if verbosity >= 2:
+            ret.player = self.side_result()
+            ret.opponent = self.side_result(reverse=True)
+        if verbosity == 3:
+            choices = move_choices(tuple(self.defender.moveset), self.ai_layers, self.attacker)
+            for move, choice in zip(ret.opponent.moves, choices):
+                move.choice_pct = 100 * choice
+            ret.damage_taken = damage_taken(self.defender, self.attacker, self.def_mod,
+                                            self.att_mod, self.ai_layers)
         return ret
 
     @property
     def short_summary(self) -> list[str]:
         '''Returns a shortened summary associated with verbosity = 1'''
-
-        ret = []
-        ret.append(f'LVL {self.attacker.level} EXP NEEDED: {self.attacker.exp_to_next_level}/{self.attacker.exp_for_level}')
-        line = f'{self.attacker.level_name} vs {self.defender.level_name}'
-        line += f'          >>> EXP GIVEN: {self.defender.exp_given()}'
-        ret.append(line)
-        return ret
+        return render_matchup(self.result(1), 1).split('\n')[1:]
 
     def move_summary(self, reverse: bool=False) -> list[str]:
         '''Returns the extra move summary associated with verbosity = 2
@@ -51,19 +57,20 @@ class SingleBattle:
         The reverse parameter is used to switch the attacker and defender to
         print opponent move data
         '''
+        return render_side(self.side_result(reverse))
 
-        ret = []
+    def side_result(self, reverse: bool=False) -> SideResult:
+        '''Returns one side's stats and moves, reverse for the opponent's'''
         attacker, defender, a_mod, d_mod = self.attacker, self.defender, self.att_mod, self.def_mod
         if reverse:
             attacker, defender, a_mod, d_mod = self.defender, self.attacker, self.def_mod, self.att_mod
-        x = f'{attacker.name} ({attacker.stats_str})'
+        mods = ''
         if a_mod.has_bbs or a_mod.has_mods:
-            x += f' {a_mod} -> ({a_mod.mod_stats_str(attacker)})'
-        ret.append(f'{x}')
+            mods = f'{a_mod} -> ({a_mod.mod_stats_str(attacker)})'
 
-        for move in attacker.moveset:
-            ret += DamageCalc(move, attacker, defender, a_mod, d_mod).summary
-        return ret
+        moves = [DamageCalc(move, attacker, defender, a_mod, d_mod).result(self.max_hits)
+                 for move in attacker.moveset]
+        return SideResult(attacker.name, attacker.stats_str, mods, moves)
 
 @dataclass
 class Battle:
@@ -77,10 +84,20 @@ class Battle:
     participants: int=1
     verbosity: int=1
     wild: bool=False
+    workers: int=1
+    cache: Any=None # NShotCache for range checks
+    profiler: Any=None # RouteProfiler timing each enemy
+    max_hits: int=8
+    hp: Any=None # HpDistribution carried from enemy to enemy
 
     def __post_init__(self):
         self.pokes = self.opponent if self.wild else self.opponent.pokes
 
+    @property
+    def ai_layers(self) -> tuple[int, ...]:
+        '''Returns the opponent's trainer AI move choice layers, none for wild pokemon'''
+        return () if self.wild else self.opponent.trainer_class.ai_layers
+
     def battle(self) -> str:
         """Performs a battle.
 
@@ -90,6 +107,14 @@ class Battle:
 
         Finally, it will give the correct amount of exp to self.pokemon
         """
+        return render_battle(self.result())
+
+    def result(self) -> BattleResult:
+        """Performs a battle, returning its results
+
+        Calculates the main battle, variations and range checks against
+        every enemy pokemon and gives self.pokemon the exp for each.
+        """
 
         # Fill in the blanks for non-specified modifiers
         for mod in self.att_mod, self.def_mod:
@@ -101,96 +126,138 @@ class Battle:
         # Convert all single-specified data to dictionaries per pokemon index
         if self.wild:
             self.pokes = {1: self.pokes}
-        if isinstance(self.pokes, list):
+        if isinstance(self.pokes, (list, tuple)):
             self.pokes = {idx+1: p for idx, p in enumerate(self.pokes)}
         if isinstance(self.att_mod, StatModifier):
             self.att_mod = {idx: self.att_mod for idx in range(1, len(self.pokes) + 1)}
         if isinstance(self.def_mod, StatModifier):
             self.def_mod = {idx: self.def_mod for idx in range(1, len(self.pokes) + 1)}
 
-        ret = ''
-        orig_ivs = self.pokemon.ivs
+        opponent = f'{self.opponent.level_name}' if self.wild else f'{self.opponent}'
+        ret = BattleResult(opponent, self.wild, self.verbosity)
+        pool = executor(self.workers)
         combined = {idx: (self.pokes[idx], self.att_mod[idx], self.def_mod[idx])
                     for idx in self.pokes}
 
-
+        label = self.opponent.level_name if self.wild else self.opponent.alias or self.opponent.trainer_class.name
         for idx, (poke, a_mod, d_mod) in combined.items():
-            orig_wild_ivs = poke.ivs
-            # main battle
-            single_battle = SingleBattle(self.pokemon, poke, a_mod, d_mod)
-            ret += f'{single_battle.choose_summary(self.verbosity)}'
-
-            # Process variations
-            fights: dict[str,str] = {}
-            if idx in self.variations:
-                for name, v in self.variations[idx].items():
-                    fight = self.parse_single_battle(v, poke)
-                    fights[name] = fight.choose_summary(self.verbosity, True)
-
-            if 'all' in self.variations:
-                for name, v in self.variations['all'].items():
-                    fight = self.parse_single_battle(v, poke)
-                    fights[name] = fight.choose_summary(self.verbosity, True)
-
-            # Process range checks
-            range_checks = {}
-            rc_data = {}
-            if idx in self.range_checks:
-                for name, rc in self.range_checks[idx].items():
-                    turns = rc['turns']
-                    if isinstance(rc['moves'], Move):
-                        rc['moves'] = [rc['moves']] * turns
-                    if isinstance(rc['att_mods'], StatModifier):
-                        rc['att_mods'] = [rc['att_mods']] * turns
-                    if isinstance(rc['def_mods'], StatModifier):
-                        rc['def_mods'] = [rc['def_mods']] * turns
-                    range_checks[name] = n_shot_with_mods(
-                        attacker=self.pokemon,
-                        defender=poke,
-                        turns=rc['turns'],
-                        moves=rc['moves'],
-                        att_mods=rc['att_mods'],
-                        def_mods=rc['def_mods']
-                    )
-                    rc_data[name] = rc
-
-            for name, fight in fights.items():
-                ret += f'\nVariation {name}:\n{fight}'
-
-            rcs = ''
-            for name, rc in range_checks.items():
-                rcs += f'\nRange Check {name}: {rc:.5f}%'
-                for turn in range(rc_data[name]['turns']):
-                    rcs += f'\n\tTurn #{turn+1}: '
-                    rcs += f'Move: {rc_data[name]["moves"][turn].name}'
-                    rcs += f'\n\t\tatt_mod: {rc_data[name]["att_mods"][turn]}'
-                    rcs += f'\n\t\tdef_mod: {rc_data[name]["def_mods"][turn]}'
-            if rcs:
-                ret += rcs + '\n\n'
-
-            # Reset IVs in between each fight
-            if poke.ivs != orig_wild_ivs:
-                poke.ivs = orig_wild_ivs
-                poke.calculate_stats()
-            if self.pokemon.ivs != orig_ivs:
-                self.pokemon.ivs = orig_ivs
-                self.pokemon.calculate_stats()
-
+            measure = nullcontext()
+            if self.profiler is not None:
+                measure = self.profiler.enemy(f'{label}: {poke.name} ({idx})', self.cache)
+            with measure:
+                ret.enemies.append(self.enemy_result(idx, poke, a_mod, d_mod, pool))
+            if self.hp is not None:
+                ret.enemies[-1].matchup.hp = self.take_turns(poke, a_mod, d_mod)
             poke.battle(self.pokemon, self.participants)
+            if self.hp is not None:
+                self.hp.set_max_hp(self.pokemon.max_hp)
 
-        ret = ret.strip()
-
-        if self.verbosity:
-            details = f'{self.opponent.level_name}' if self.wild else f'{self.opponent}'
-            ret = f'\n{details}\n{ret}\n\n'
         return ret
 
+    def enemy_result(self,
+                     idx: int,
+                     poke: Pokemon,
+                     a_mod: StatModifier,
+                     d_mod: StatModifier,
+                     pool: Any
+        ) -> EnemyResult:
+        '''Calculates the main battle, variations and range checks against one enemy'''
+        # Variations and range checks don't depend on each other, so
+        # they are all submitted before calculating the main battle
+        fights = {}
+        for key in (idx, 'all'):
+            for name, v in self.variations.get(key, {}).items():
+                fights[name] = submit(pool, variation_result,
+                                      self.pokemon, poke, v, self.verbosity, self.max_hits,
+                                      self.ai_layers)
+
+        range_checks = {}
+        rc_data = {}
+        rc_keys = {}
+        for name, rc in self.range_checks.get(idx, {}).items():
+            turns = rc['turns']
+            if isinstance(rc['moves'], Move):
+                rc['moves'] = [rc['moves']] * turns
+            if isinstance(rc['att_mods'], StatModifier):
+                rc['att_mods'] = [rc['att_mods']] * turns
+            if isinstance(rc['def_mods'], StatModifier):
+                rc['def_mods'] = [rc['def_mods']] * turns
+            rc_data[name] = rc
+            if self.cache is not None:
+                rc_key = self.cache.key(self.pokemon, poke, rc['turns'], rc['moves'],
+                                        rc['att_mods'], rc['def_mods'])
+                if (kill_pct := self.cache.get(rc_key)) is not None:
+                    range_checks[name] = Done(kill_pct)
+                    continue
+                rc_keys[name] = rc_key
+            range_checks[name] = submit(pool, n_shot_with_mods,
+                                        self.pokemon, poke, rc['turns'], rc['moves'],
+                                        rc['att_mods'], rc['def_mods'])
+
+        # main battle
+        single_battle = SingleBattle(self.pokemon, poke, a_mod, d_mod, self.max_hits, self.ai_layers)
+        enemy = EnemyResult(idx, single_battle.result(self.verbosity))
+        for name, fight in fights.items():
+            enemy.variations[name] = fight.result()
+        for name, rc in range_checks.items():
+            data = rc_data[name]
+            turns = [RangeCheckTurn(data['moves'][turn].name, data['att_mods'][turn], data['def_mods'][turn])
+                     for turn in range(data['turns'])]
+            enemy.range_checks.append(RangeCheckResult(name, rc.result(), turns))
+            if name in rc_keys:
+                self.cache.put(rc_keys[name], rc.result())
+        return enemy
+
+    def take_turns(self, poke: Pokemon, a_mod: StatModifier, d_mod: StatModifier) -> HpResult:
+        '''Carries self.hp through an enemy's turns, returning the HP left'''
+        turns = enemy_turns(self.pokemon, poke, a_mod, d_mod, self.max_hits)
+        for turn in range(1, turns + 1):
+            self.hp.take_damage(damage_taken(poke, self.pokemon, d_mod, a_mod, self.ai_layers, turn))
+        return HpResult(turns, self.hp.max_hp, self.hp.average, 100 * self.hp.fainted)
+
     def parse_single_battle(self, variation: FightVariation, poke: Pokemon) -> SingleBattle:
         '''Recalculates stats and returns a SingleBattle struct'''
+        return variation_battle(self.pokemon, poke, variation)
+
+def enemy_turns(pokemon: Pokemon,
+                enemy: Pokemon,
+                att_mod: StatModifier,
+                def_mod: StatModifier,
+                max_hits: int=8
+    ) -> int:
+    '''Returns how many turns an enemy gets before your strongest move KOs it
+
+    The strongest move is the one with the highest average damage without
+    crits, used at most max_hits times, and you attack first when you are
+    faster. Speed ties count as the enemy attacking first.
+    '''
+    damage = max(((calc.min_damage() + calc.max_damage()) / 2
+                  for calc in (DamageCalc(move, pokemon, enemy, att_mod, def_mod)
+                               for move in pokemon.moveset)), default=0)
+    hits = min(ceil(enemy.max_hp / damage), max_hits) if damage else max_hits
+    if att_mod.mod_spd(pokemon) > def_mod.mod_spd(enemy):
+        hits -= 1
+    return hits
+
+def variation_battle(pokemon: Pokemon, poke: Pokemon, variation: FightVariation) -> SingleBattle:
+    '''Returns the SingleBattle for a fight variation
+
+    Both pokemon are copied rather than changed when the variation uses
+    different IVs, since the enemy is shared trainer data and variations
+    shouldn't affect each other
+    '''
+    return SingleBattle(pokemon.with_ivs(variation.ivs), poke.with_ivs(variation.enemy_ivs),
+                        variation.att_mod, variation.def_mod)
 
-        if self.pokemon.ivs != variation.ivs:
-            self.pokemon.ivs = variation.ivs
-            self.pokemon.calculate_stats()
-        poke.ivs = variation.enemy_ivs
-        poke.calculate_stats()
-        return SingleBattle(self.pokemon, poke, variation.att_mod, variation.def_mod)
+def variation_result(pokemon: Pokemon,
+                     poke: Pokemon,
+                     variation: FightVariation,
+                     verbosity: int,
+                     max_hits: int=8,
+                     ai_layers: tuple[int, ...]=()
+    ) -> MatchupResult:
+    '''Calculates a single fight variation, run in worker processes'''
+    battle = variation_battle(pokemon, poke, variation)
+    battle.max_hits = max_hits
+    battle.ai_layers = ai_layers
+    return battle.result(verbosity)
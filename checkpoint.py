@@ -0,0 +1,143 @@
+import hashlib
+import json
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_DIR = Path('.routeone_cache')
+CHECKPOINT_VERSION = 1
+
+@dataclass
+class Checkpoint:
+    """Player state and rendered output right after a route action"""
+    key: str
+    state: bytes
+    output: str
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    '''Hashes this tool's source so checkpoints expire when the code or data changes
+
+    Falls back to CHECKPOINT_VERSION alone when the source isn't available,
+    e.g. in the packaged executable
+    '''
+    h = hashlib.sha256(str(CHECKPOINT_VERSION).encode())
+    for path in sorted(Path(__file__).parent.glob('*.py')):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+def action_keys(config: dict, actions: list) -> list[str]:
+    '''Returns one key per action, hashing the config and every action up to it'''
+    h = hashlib.sha256(code_fingerprint().encode())
+    h.update(_encode(config))
+    ret = []
+    for action in actions:
+        h.update(_encode(action))
+        ret.append(h.copy().hexdigest())
+    return ret
+
+def _encode(value) -> bytes:
+    '''Stable encoding of parsed yaml'''
+    return json.dumps(value, default=str).encode()
+
+def checkpoint_path(route_file: str, cache_dir: Path=CACHE_DIR, output_format: str='text') -> Path:
+    '''Returns where checkpoints for a route file and output format are stored'''
+    path = Path(route_file).resolve()
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:12]
+    return Path(cache_dir) / f'{path.stem}-{digest}.{output_format}.checkpoints'
+
+def snapshot(route) -> bytes:
+    '''Returns the player state of a route, everything actions can change'''
+    return pickle.dumps((route.pokemon, route.money, route.hp))
+
+def restore_snapshot(route, state: bytes) -> None:
+    '''Puts a route back into the state from snapshot'''
+    route.pokemon, route.money, route.hp = pickle.loads(state)
+
+def source_path(source: bytes, suffix: str, cache_dir: Path=CACHE_DIR) -> Path:
+    '''Returns where data derived from a route file's contents is cached
+
+    Keyed by the contents rather than the path, so renamed or copied route
+    files share entries
+    '''
+    h = hashlib.sha256(code_fingerprint().encode())
+    h.update(source)
+    return Path(cache_dir) / 'routes' / f'{h.hexdigest()}{suffix}'
+
+def load_cached(path: Path):
+    '''Loads a cached value, None if there isn't a readable one'''
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError):
+        return None
+
+def save_cached(path: Path, value) -> None:
+    '''Caches a value for load_cached'''
+    _dump(path, value)
+
+class RouteCheckpoints:
+    """Per-action checkpoints of a route, persisted between runs
+
+    Checkpoints are keyed by a hash of the config and the action prefix, so
+    a run can resume after the last action that hasn't changed since the
+    previous run and only recompute the rest. Without a path they are only
+    kept in memory, resuming from the saved checkpoints of an earlier run.
+    """
+
+    def __init__(self, config: dict, actions: list, path: Path=None, saved: list[Checkpoint]=None):
+        self.keys = action_keys(config, actions)
+        self.path = None if path is None else Path(path)
+        self.saved = list(saved or []) if path is None else self._load()
+        self.checkpoints: list[Checkpoint] = []
+
+    def _load(self) -> list[Checkpoint]:
+        '''Loads checkpoints from the last run, ignoring unreadable files'''
+        try:
+            with open(self.path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return []
+
+    @property
+    def resume_index(self) -> int:
+        '''Number of leading actions unchanged since the last run'''
+        idx = 0
+        for key, saved in zip(self.keys, self.saved):
+            if key != saved.key:
+                break
+            idx += 1
+        return idx
+
+    def restore(self, route) -> int:
+        '''Restores the route to its last unchanged checkpoint
+
+        Writes the saved output of every unchanged action to the route's
+        sink and returns the index of the first action to compute
+        '''
+        idx = self.resume_index
+        self.checkpoints = self.saved[:idx]
+        for checkpoint in self.checkpoints:
+            route.sink.write(checkpoint.output)
+        if self.checkpoints:
+            restore_snapshot(route, self.checkpoints[-1].state)
+        return idx
+
+    def record(self, route, output: str) -> None:
+        '''Snapshots the route after the next action'''
+        key = self.keys[len(self.checkpoints)]
+        self.checkpoints.append(Checkpoint(key, snapshot(route), output))
+
+    def save(self) -> None:
+        '''Persists every recorded checkpoint'''
+        if self.path is not None:
+            _dump(self.path, self.checkpoints)
+
+def _dump(path: Path, value) -> None:
+    '''Pickles to a temporary file first so readers never see a partial file'''
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(value, f)
+    tmp.replace(path)
@@ -2,55 +2,55 @@ from exp_curve import ExpCurve
 from type import Type
 
 TRAINER_DATA = [
-    # Class name, base money
-    ('xxx', 99),
-    ('YOUNGSTER', 15),
-    ('BUG CATCHER', 10),
-    ('LASS', 15),
-    ('SAILOR', 30),
-    ('JRTRAINERM', 20),
-    ('JRTRAINERF', 20),
-    ('POKEMANIAC', 50),
-    ('SUPER NERD', 25),
-    ('HIKER', 35),
-    ('BIKER', 20),
-    ('BURGLAR', 90),
-    ('ENGINEER', 50),
-    ('JUGGLER X', 35),
-    ('FISHER', 35),
-    ('SWIMMER', 5),
-    ('CUEBALL', 25),
-    ('GAMBLER', 70),
-    ('BEAUTY', 70),
-    ('PSYCHIC', 10),
-    ('ROCKER', 25),
-    ('JUGGLER', 35),
-    ('TAMER', 40),
-    ('BIRDKEEPER', 25),
-    ('BLACKBELT', 25),
-    ('RIVAL1', 35),
-    ('PROFOAK', 99),
-    ('SCIENTIST', 50),
-    ('GIOVANNI', 99),
-    ('ROCKET', 30),
-    ('COOLTRAINERM', 35),
-    ('COOLTRAINERF', 35),
-    ('BRUNO', 99),
-    ('BROCK', 99),
-    ('MISTY', 99),
-    ('LTSURGE', 99),
-    ('ERIKA', 99),
-    ('KOGA', 99),
-    ('BLAINE', 99),
-    ('SABRINA', 99),
-    ('GENTLEMAN', 70),
-    ('RIVAL2', 65),
-    ('RIVAL3', 99),
-    ('LORELEI', 99),
-    ('CHANNELER', 30),
-    ('AGATHA', 99),
-    ('LANCE', 99),
-    ('JESSIEJAMES', 30)
+    # Class name, base money, trainer AI move choice layers
+    ('xxx', 99, ()),
+    ('YOUNGSTER', 15, ()),
+    ('BUG CATCHER', 10, (1,)),
+    ('LASS', 15, (1,)),
+    ('SAILOR', 30, (1, 3)),
+    ('JRTRAINERM', 20, (1,)),
+    ('JRTRAINERF', 20, (1,)),
+    ('POKEMANIAC', 50, (1, 2, 3)),
+    ('SUPER NERD', 25, (1, 2)),
+    ('HIKER', 35, (1,)),
+    ('BIKER', 20, (1,)),
+    ('BURGLAR', 90, (1, 3)),
+    ('ENGINEER', 50, (1,)),
+    ('JUGGLER X', 35, (1, 2)),
+    ('FISHER', 35, (1, 3)),
+    ('SWIMMER', 5, (1, 3)),
+    ('CUEBALL', 25, ()),
+    ('GAMBLER', 70, (1,)),
+    ('BEAUTY', 70, (1, 3)),
+    ('PSYCHIC', 10, (1, 2)),
+    ('ROCKER', 25, (1,)),
+    ('JUGGLER', 35, (1,)),
+    ('TAMER', 40, (1,)),
+    ('BIRDKEEPER', 25, (1,)),
+    ('BLACKBELT', 25, (1,)),
+    ('RIVAL1', 35, (1,)),
+    ('PROFOAK', 99, (1, 3)),
+    ('SCIENTIST', 50, (1, 2)),
+    ('GIOVANNI', 99, (1, 3)),
+    ('ROCKET', 30, (1,)),
+    ('COOLTRAINERM', 35, (1, 3)),
+    ('COOLTRAINERF', 35, (1, 3)),
+    ('BRUNO', 99, (1,)),
+    ('BROCK', 99, (1,)),
+    ('MISTY', 99, (1, 3)),
+    ('LTSURGE', 99, (1, 3)),
+    ('ERIKA', 99, (1, 3)),
+    ('KOGA', 99, (1, 3)),
+    ('BLAINE', 99, (1, 3)),
+    ('SABRINA', 99, (1, 3)),
+    ('GENTLEMAN', 70, (1, 2)),
+    ('RIVAL2', 65, (1, 3)),
+    ('RIVAL3', 99, (1, 3)),
+    ('LORELEI', 99, (1, 2, 3)),
+    ('CHANNELER', 30, (1,)),
+    ('AGATHA', 99, (1,)),
+    ('LANCE', 99, (1, 3)),
+    ('JESSIEJAMES', 30, (1,))
 ]
 
 POKE_DATA = [
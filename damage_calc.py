@@ -1,11 +1,12 @@
 from move import Move
+from results import MoveResult, render_move
 from pokemon import Pokemon
 from stat_modifier import StatModifier
-from type import apply_effectiveness
+from type import Type, apply_effectiveness
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import ClassVar, Tuple
+from typing import ClassVar, Optional, Tuple
 from itertools import product
 
 
@@ -59,46 +60,38 @@ class DamageCalc:
 
         Return value is a list of strings for ease of formatting
         '''
-        ret = []
+        return render_move(self.result())
 
-        line = f'{self.move.name}'
-        max_dmg = self.max_damage()
-        max_crit_dmg = self.max_damage(True)
+    def result(self, max_hits: int=8) -> MoveResult:
+        '''Returns damage ranges, roll tables and n-hit kill chances
 
-        min_dmg = self.min_damage()
-        min_crit_dmg = self.min_damage(True)
-
-        if max_dmg == 0 and max_crit_dmg == 0:
-            return [line]
-
-        if max_dmg:
-            line += f' {min_dmg}-{max_dmg}'
-
-        line += '\t(crit: '
-
-        line += f'{min_crit_dmg}-{max_crit_dmg})'
-        ret.append(line)
-
-        dmg_rolls, crit_dmg_rolls = _range_rolls(
-            move=self.move,
-            attacker=self.attacker,
-            defender=self.defender,
-            att_mod=self.att_mod,
-            def_mod=self.def_mod
-        )
-
-        for name, rolls in zip(['Normal', 'Crit'], [dmg_rolls, crit_dmg_rolls]):
-            line = f'\t{name} rolls: '
-            for roll, frequency in rolls.items():
-                line += f'{roll}x{frequency}, '
-            line = line.strip(', ')
-            ret.append(line)
-
-        for hits in range(1, 9):
-            kill_pct = n_shot_with_mods(self.attacker, self.defender, hits, self.move, self.att_mod, self.def_mod, True)
-
-            if kill_pct >= 1 and kill_pct <= 99.999:
-                ret.append(f'\t(Overall {hits}-hit Kill%: {kill_pct:.4f}%)')
+        Only kill chances that are shown are calculated: up to max_hits, and
+        not those that are certainly 0% or 100% from the damage range
+        '''
+        ret = MoveResult(self.move.name, self.min_damage(), self.max_damage(),
+                         self.min_damage(True), self.max_damage(True))
+        if ret.max_damage == 0 and ret.max_crit == 0:
+            return ret
+
+        rolls = _range_rolls(self.move, self.attacker, self.defender, self.att_mod, self.def_mod)
+        ret.rolls = dict(rolls[0])
+        ret.crit_rolls = dict(rolls[1])
+
+        # The damage rolls are the same every hit, so they're only calculated once
+        turn = _battle_vars(self.move, self.attacker, self.defender, self.att_mod, self.def_mod, rolls)
+        lowest = min(turn.min_nc, turn.min_c)
+        highest = max(turn.max_nc, turn.max_c)
+        for hits in range(1, max_hits + 1):
+            if hits * highest < self.defender._hp:
+                continue
+            if hits * lowest >= self.defender._hp:
+                break
+            kill_pct = _kill_pct(self.defender._hp, [turn] * hits, True)
+            if kill_pct > 99.999:
+                # More hits can only be more likely to kill
+                break
+            if kill_pct >= 1:
+                ret.kill_pcts[hits] = kill_pct
         return ret
 
 def n_shot_with_mods(attacker: Pokemon,
@@ -125,51 +118,65 @@ def n_shot_with_mods(attacker: Pokemon,
     if len(def_mods) != turns:
         raise ValueError('Wrong number of defense mods')
 
-    current_min = 0
-    current_max = 0
-
     turn_dict = {}
     turn_data= []
 
     for move, att_mod, def_mod in zip(moves, att_mods, def_mods):
         # Utilize memoization
-        if data := turn_dict.get((move, att_mod, def_mod)):
-            turn_data.append(data)
-            continue
+        if (move, att_mod, def_mod) not in turn_dict:
+            turn_dict[(move, att_mod, def_mod)] = _battle_vars(move, attacker, defender, att_mod, def_mod)
+        turn_data.append(turn_dict[(move, att_mod, def_mod)])
 
-        _min_nc = _damage(move, attacker, defender, att_mod, def_mod, 217, False)
-        _min_c = _damage(move, attacker, defender, att_mod, def_mod, 217, True)
-        _max_nc = _damage(move, attacker, defender, att_mod, def_mod, 255, False)
-        _max_c = _damage(move, attacker, defender, att_mod, def_mod, 255, True)
-
-        p_nc, p_c = _range_prob_rolls(
-            move=move,
-            attacker=attacker,
-            defender=defender,
-            att_mod=att_mod,
-            def_mod=def_mod
-        )
-
-        if move.name.lower() in {'crabhammer', 'karate chop', 'razor leaf', 'slash'}:
-            crit_chance = min(attacker.species.base_spd * 4, 255) / 256
-        else:
-            crit_chance = (attacker.species.base_spd // 2) / 256
+    return _kill_pct(defender._hp, turn_data, repeat)
+
+def _battle_vars(move: Move,
+                 attacker: Pokemon,
+                 defender: Pokemon,
+                 att_mod: StatModifier,
+                 def_mod: StatModifier,
+                 rolls: Tuple[dict[int, int], dict[int, int]]=None
+    ) -> BattleVars:
+    '''Calculates the damage range and roll probabilities of a single turn
+
+    rolls are the turn's _range_rolls, if already calculated
+    '''
+    _min_nc = _damage(move, attacker, defender, att_mod, def_mod, 217, False)
+    _min_c = _damage(move, attacker, defender, att_mod, def_mod, 217, True)
+    _max_nc = _damage(move, attacker, defender, att_mod, def_mod, 255, False)
+    _max_c = _damage(move, attacker, defender, att_mod, def_mod, 255, True)
+
+    p_nc, p_c = _range_prob_rolls(
+        move=move,
+        attacker=attacker,
+        defender=defender,
+        att_mod=att_mod,
+        def_mod=def_mod,
+        rolls=rolls
+    )
+
+    return BattleVars(move, att_mod, def_mod, _min_nc, _min_c,
+                      _max_nc, _max_c, p_nc, p_c, crit_chance(move, attacker))
 
-        turn = BattleVars(move, att_mod, def_mod, _min_nc, _min_c,
-                        _max_nc, _max_c, p_nc, p_c, crit_chance)
+def crit_chance(move: Move, attacker: Pokemon) -> float:
+    '''Returns the chance of a move being a critical hit'''
+    if move.name.lower() in {'crabhammer', 'karate chop', 'razor leaf', 'slash'}:
+        return min(attacker.species.base_spd * 4, 255) / 256
+    return (attacker.species.base_spd // 2) / 256
 
-        # Memoization
-        turn_data.append(turn)
-        turn_dict[(move, att_mod, def_mod)] = turn
+def _kill_pct(hp: int, turn_data: list[BattleVars], repeat: bool=False) -> float:
+    '''Returns the chance that the turns deal at least hp damage in total'''
+    turns = len(turn_data)
+    current_min = 0
+    current_max = 0
 
     for turn in turn_data:
         current_max += max(turn.max_nc, turn.max_c)
         current_min += min(turn.min_nc, turn.min_c)
 
     # Not a range, return 100 or 0
-    if current_min >= defender._hp:
+    if current_min >= hp:
         return 100
-    if current_max < defender._hp:
+    if current_max < hp:
         return 0
 
     # Generate all permutation of crits
@@ -200,7 +207,7 @@ def n_shot_with_mods(attacker: Pokemon,
 
         for i in range(bottom_range, top_range):
             x = _n_shot_percent_inner(
-                hp = defender._hp,
+                hp = hp,
                 all_turn_data=turn_data,
                 stacked_dmg=0,
                 rolled_dmg=i,
@@ -300,7 +307,8 @@ def _range_prob_rolls(move: Move,
                       attacker: Pokemon,
                       defender: Pokemon,
                       att_mod: StatModifier,
-                      def_mod: StatModifier
+                      def_mod: StatModifier,
+                      rolls: Tuple[dict[int, int], dict[int, int]]=None
     ) -> Tuple[dict[int, int], dict[int, int]]:
     '''
     Returns two dictionaries (non-crit and crit) of damage rolls and
@@ -310,8 +318,9 @@ def _range_prob_rolls(move: Move,
     probs_nc = defaultdict(int)
     probs_c = defaultdict(int)
 
-    dmg_rolls, crit_dmg_rolls = _range_rolls(move, attacker, defender,
-                                             att_mod, def_mod)
+    if rolls is None:
+        rolls = _range_rolls(move, attacker, defender, att_mod, def_mod)
+    dmg_rolls, crit_dmg_rolls = rolls
     min_dmg = min(dmg_rolls.keys())
     min_crit_dmg = min(crit_dmg_rolls.keys())
 
@@ -337,30 +346,73 @@ def _damage(move: Move,
     STAB, and crits
     '''
 
+    fixed = _fixed_damage(move, attacker)
+    if fixed is not None:
+        return fixed
+
+    # limit roll to 217-255
+    roll = max(roll, 217)
+    roll = min(roll, 255)
+
+    att_stat, level, stab = _attack_stats(move, attacker, att_mod, crit)
+    if move.type.special:
+        def_stat = _defense_stat(move, defender._spc, def_mod.mod_spc(defender), crit)
+    else:
+        def_stat = _defense_stat(move, defender._def, def_mod.mod_def(defender), crit)
+
+    return _damage_from_stats(move, level, att_stat, def_stat, stab,
+                              defender.species.type1, defender.species.type2, roll)
+
+def _fixed_damage(move: Move, attacker: Pokemon) -> Optional[int]:
+    '''Damage of moves that skip the damage formula, None for every other move'''
     if move.name.lower() == 'night shade':
         return attacker.level
-
     if move.power <= 0:
         return 0
+    return None
 
-    # limit roll to 217-255
-    roll = max(roll, 217)
-    roll = min(roll, 255)
+def _attack_stats(move: Move, attacker: Pokemon, att_mod: StatModifier, crit: bool) -> Tuple[int, int, bool]:
+    '''Chooses the attacker's side of the damage formula: its stat, level and STAB
 
-    att_stat = attacker._att if crit else att_mod.mod_att(attacker)
-    def_stat = defender._def if crit else def_mod.mod_def(defender)
+    Crits ignore stat modifiers and double the level
+    '''
     if move.type.special:
         att_stat = attacker._spc if crit else att_mod.mod_spc(attacker)
-        def_stat = defender._spc if crit else def_mod.mod_spc(defender)
-
-    if move.name.lower() in {'selfdestruct', 'explosion'}:
-        def_stat = max(def_stat // 2, 1)
+    else:
+        att_stat = attacker._att if crit else att_mod.mod_att(attacker)
 
     stab = move.type in {attacker.species.type1, attacker.species.type2}
     level = attacker.level
     if crit:
         level *= 2
     level %= 256
+    return att_stat, level, stab
+
+def _defense_stat(move: Move, stat: int, modified: int, crit: bool) -> int:
+    '''Chooses the defender's stat from its raw and modified value
+
+    Crits ignore stat modifiers, and Selfdestruct and Explosion halve it
+    '''
+    def_stat = stat if crit else modified
+    if move.name.lower() in {'selfdestruct', 'explosion'}:
+        def_stat = max(def_stat // 2, 1)
+    return def_stat
+
+def _damage_from_stats(move: Move,
+                       level: int,
+                       att_stat: int,
+                       def_stat: int,
+                       stab: bool,
+                       def_type1: Type,
+                       def_type2: Type,
+                       roll: int
+    ) -> int:
+    '''Damage formula on raw stats
+
+    Expects the level to already be doubled for crits and the stats to
+    already be chosen by _attack_stats and _defense_stat. Used directly for bulk
+    calculations that don't have Pokemon objects.
+    '''
 
     dmg = (level * 2 // 5) + 2
     dmg *= att_stat
@@ -373,8 +425,8 @@ def _damage(move: Move,
     dmg = apply_effectiveness(
         damage=dmg,
         att_type=move.type,
-        def_type=defender.species.type1,
-        def_type2=defender.species.type2
+        def_type=def_type1,
+        def_type2=def_type2
     )
 
     if dmg == 0:
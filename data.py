@@ -1,35 +1,48 @@
-from constants import *
+# constants is imported by the functions using it, since the game data tables are slow to load
 from type import Type
 from species import Species
 from trainers import TrainerClass, Trainer
 from item import Item
 from move import Move, LevelMove
-from moveset import get_default_moveset
+from moveset import Moveset, get_default_moveset
 import pokemon
 
-from typing import Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 def get_trainer_classes() -> dict[str, TrainerClass]:
     '''Grabs trainer classes from constants.py'''
-    return {name.upper(): TrainerClass(name, money) for name, money in TRAINER_DATA}
+    import constants
+    return {name.upper(): TrainerClass(name, money, layers) for name, money, layers in constants.TRAINER_DATA}
 
 def get_items() -> dict[str, Item]:
     '''Grabs items from constants.py'''
-    return {name.upper(): Item(name, idx, price) for idx, (name, price) in enumerate(ITEM_DATA)}
+    import constants
+    return {name.upper(): Item(name, idx, price) for idx, (name, price) in enumerate(constants.ITEM_DATA)}
 
+@lru_cache(maxsize=None)
 def get_moves() -> dict[str, Move]:
     '''Grabs moves from constants.py'''
-    return {name.upper(): Move(name, Type(type), pp, power, accuracy, idx) for idx, (name, type, power, accuracy, pp) in enumerate(MOVE_DATA)}
+    import constants
+    return {name.upper(): Move(name, Type(type), pp, power, accuracy, idx) for idx, (name, type, power, accuracy, pp) in enumerate(constants.MOVE_DATA)}
+
+@lru_cache(maxsize=None)
+def get_move_list() -> Tuple[Move, ...]:
+    '''Grabs moves from constants.py, indexed by move index'''
+    return tuple(get_moves().values())
 
 def get_move(move_name: str):
     '''Grabs specific move from constants.py, ignoring case'''
     all_moves = get_moves()
     return all_moves[move_name.upper()]
 
+@lru_cache(maxsize=None)
 def get_all_species() -> dict[str, Species]:
     '''Grabs species from constants.py'''
+    import constants
     species = {}
-    for idx, (name, types, curve, stats, exp) in enumerate(POKE_DATA):
+    for idx, (name, types, curve, stats, exp) in enumerate(constants.POKE_DATA):
         type1, type2 = Type.Null, Type.Null
         if len(types) == 1:
             type1 = Type(types[0])
@@ -41,27 +54,59 @@ def get_all_species() -> dict[str, Species]:
         species[name.upper()] = Species(name, curve, type1, type2, hp, att, defense, spd, spc, exp, idx)
     return species
 
+@lru_cache(maxsize=None)
+def get_species_by_dex() -> Mapping[int, Species]:
+    '''Grabs species from constants.py, indexed by dex #'''
+    return MappingProxyType({s.dex_num: s for s in get_all_species().values()})
+
 def get_species(idx) -> Species:
     '''Grabs specific species from constants.py, with either dex # or name'''
-    all_species = get_all_species()
     if isinstance(idx, int):
-        return next((x for x in all_species.values() if x.idx == idx), None)
+        return get_species_by_dex().get(idx)
     elif isinstance(idx, str):
-        return all_species[idx.upper()]
+        return get_all_species()[idx.upper()]
 
 def get_learnset(game: str='rb') -> list[LevelMove]:
     '''Grabs game learnset from constants.py'''
     return get_learnsets[game]
 
+@lru_cache(maxsize=None)
 def get_learnsets() -> dict[str, list[list[LevelMove]]]:
     '''Grabs both games' learnsets from constants.py'''
-    moves = list(get_moves().values())
-    rb_learnsets = _parse_learnset_data(RB_LEARNSET, moves)
-    y_learnsets = _parse_learnset_data(Y_LEARNSET, moves)
+    import constants
+    moves = get_move_list()
+    rb_learnsets = _parse_learnset_data(constants.RB_LEARNSET, moves)
+    y_learnsets = _parse_learnset_data(constants.Y_LEARNSET, moves)
 
     return {'rb': rb_learnsets,
             'y': y_learnsets}
 
+@lru_cache(maxsize=None)
+def get_default_movesets() -> dict[str, list[Tuple[Tuple[Move, ...], ...]]]:
+    '''Precomputes default movesets for every species and level in both games
+
+    Indexed as [game][dex_num][level] for levels 0-100. The tables are built
+    once and shared, so entries are tuples; wrap one in a Moveset before
+    changing it.
+    '''
+    return {game: [_default_moveset_table(l) for l in learnsets]
+            for game, learnsets in get_learnsets().items()}
+
+def _default_moveset_table(learnset: list[LevelMove]) -> Tuple[Tuple[Move, ...], ...]:
+    '''Internal calculation of a species' default moveset at every level
+
+    The default moveset only changes on levels where a move is learned, so
+    get_default_moveset is only called for those levels.
+    '''
+    table = []
+    current = ()
+    learn_levels = {move.level for move in learnset}
+    for level in range(101):
+        if level in learn_levels:
+            current = tuple(get_default_moveset(learnset, level))
+        table.append(current)
+    return tuple(table)
+
 def _parse_learnset_data(learnset: list, moves: dict) -> list[LevelMove]:
     '''Internal parsing of learnset data'''
     # start with empty list so index = dex num
@@ -75,18 +120,30 @@ def _parse_learnset_data(learnset: list, moves: dict) -> list[LevelMove]:
 
     return ret
 
-def get_game_trainers(game: str='rb') -> dict[int, Trainer]:
+def load_database() -> None:
+    '''Builds all the cached game data up front, e.g. once per worker process'''
+    get_all_species()
+    get_moves()
+    get_default_movesets()
+    get_trainers()
+
+def get_game_trainers(game: str='rb') -> Mapping[int, Trainer]:
     '''Grabs game trainer data from constants.py'''
     return get_trainers()[game]
 
-def get_trainers() -> dict[str, dict[int, Trainer]]:
-    '''Grabs trainer data from constants.py'''
+@lru_cache(maxsize=None)
+def get_trainers() -> Mapping[str, Mapping[int, Trainer]]:
+    '''Grabs trainer data from constants.py
+
+    Trainer data is built once and shared read-only between routes
+    '''
+    import constants
     species = get_all_species()
     trainer_classes = get_trainer_classes()
-    learnsets = get_learnsets()
+    movesets = get_default_movesets()
 
-    y_trainers = _parse_trainer_data(Y_TRAINERS, trainer_classes, species, learnsets['y'])
-    rb_trainers = _parse_trainer_data(RB_TRAINERS, trainer_classes, species, learnsets['rb'])
+    y_trainers = _parse_trainer_data(constants.Y_TRAINERS, trainer_classes, species, movesets['y'])
+    rb_trainers = _parse_trainer_data(constants.RB_TRAINERS, trainer_classes, species, movesets['rb'])
 
     trainers = {
         'y': y_trainers,
@@ -95,12 +152,19 @@ def get_trainers() -> dict[str, dict[int, Trainer]]:
 
     update_special_trainers(trainers, get_moves())
 
-    return trainers
+    return MappingProxyType({game: MappingProxyType(t) for game, t in trainers.items()})
+
+@lru_cache(maxsize=None)
+def get_roster(game: str='rb'):
+    '''Column-oriented table of every trainer pokemon in a game'''
+    # roster depends on the damage calc, which depends on pokemon and data
+    from roster import Roster
+    return Roster.from_trainers(get_game_trainers(game))
 
 def _parse_trainer_data(trainer_data: dict,
                         trainer_classes: dict,
                         species: dict,
-                        learnset: list
+                        movesets: list
     ) -> dict[int, Trainer]:
     '''Internal parsing of trainer data'''
 
@@ -110,11 +174,10 @@ def _parse_trainer_data(trainer_data: dict,
             p_list = []
             for level, poke_name in poke_list:
                 s = species[poke_name]
-                l = learnset[s.dex_num]
-                moveset = get_default_moveset(l, level)
+                moveset = Moveset(movesets[s.dex_num][min(level, 100)])
                 p_list.append(pokemon.Pokemon(s, level, game='y', moveset=moveset))
             t_class = trainer_classes[trainer_class]
-            ret[offset] = Trainer(t_class, p_list, offset)
+            ret[offset] = Trainer(t_class, tuple(p_list), offset)
     return ret
 
 def get_trainer_aliases() -> Tuple[dict[str, int], dict[str,int]]:
@@ -0,0 +1,69 @@
+from array import array
+
+# HP restored by healing items, None for all of it
+HEALING_ITEMS = {
+    'POTION': 20,
+    'SUPER POTION': 50,
+    'HYPER POTION': 200,
+    'MAX POTION': None,
+    'FULL RESTORE': None,
+    'FRESH WATER': 50,
+    'SODA POP': 60,
+    'LEMONADE': 80,
+}
+
+class HpDistribution:
+    """The chance of your pokemon having each amount of HP left
+
+    chances[hp] is the chance of having hp left, where 0 means it fainted
+    at some point. Chances are kept in a compact array of doubles so
+    carrying them over a whole route stays fast.
+    """
+
+    def __init__(self, max_hp: int):
+        self.max_hp = max_hp
+        self.chances = _zeros(max_hp)
+        self.chances[max_hp] = 1
+
+    @property
+    def fainted(self) -> float:
+        return self.chances[0]
+
+    @property
+    def average(self) -> float:
+        return sum(hp * chance for hp, chance in enumerate(self.chances))
+
+    def take_damage(self, damage: dict[int, float]) -> None:
+        '''Applies one enemy turn, given the chance of each amount of damage'''
+        damage = [(dmg, chance) for dmg, chance in damage.items() if chance]
+        ret = _zeros(self.max_hp)
+        ret[0] = self.chances[0]
+        for hp in range(1, self.max_hp + 1):
+            if not (chance := self.chances[hp]):
+                continue
+            for dmg, dmg_chance in damage:
+                ret[max(hp - dmg, 0)] += chance * dmg_chance
+        self.chances = ret
+
+    def heal(self, amount: int=None) -> None:
+        '''Restores amount HP, or all of it, without reviving a fainted pokemon'''
+        ret = _zeros(self.max_hp)
+        ret[0] = self.chances[0]
+        for hp in range(1, self.max_hp + 1):
+            healed = self.max_hp if amount is None else min(hp + amount, self.max_hp)
+            ret[healed] += self.chances[hp]
+        self.chances = ret
+
+    def set_max_hp(self, max_hp: int) -> None:
+        '''Follows a change in max HP, e.g. from a level up, which changes HP by as much'''
+        if max_hp == self.max_hp:
+            return
+        ret = _zeros(max_hp)
+        ret[0] = self.chances[0]
+        for hp in range(1, self.max_hp + 1):
+            ret[min(max(hp + max_hp - self.max_hp, 1), max_hp)] += self.chances[hp]
+        self.max_hp = max_hp
+        self.chances = ret
+
+def _zeros(max_hp: int) -> array:
+    return array('d', bytes(8 * (max_hp + 1)))
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Budget for the time spent in this repo's own modules when importing the
+# route_parser entry point, as a multiple of the standard library modules it
+# imports in the same run. Checked by route_parser.py --import-report rather
+# than the tests, since it's a timing and varies between runs.
+IMPORT_BUDGET = 2.0
+
+@dataclass
+class ImportTime:
+    """Represents a single line of python -X importtime output"""
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def measure_imports(module: str='route_parser') -> list[ImportTime]:
+    '''Imports a module in a fresh interpreter and returns its import times'''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent,
+    )
+    return parse_import_times(result.stderr)
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    '''Parses python -X importtime output, skipping the header line'''
+    ret = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        ret.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return ret
+
+def local_modules() -> set[str]:
+    '''Returns the names of this repo's top-level modules'''
+    return {path.stem for path in Path(__file__).parent.glob('*.py')}
+
+def split_import_us(times: list[ImportTime], module: str='route_parser') -> tuple[int, int]:
+    '''Splits a module's import time between this repo's modules and everything else'''
+    local = local_modules()
+    total = next(t.cumulative_us for t in times if t.name == module)
+    own = sum(t.self_us for t in times if t.name in local)
+    return own, total - own
+
+def import_ratio(module: str='route_parser', runs: int=3) -> float:
+    '''Returns the best ratio of time spent in this repo's modules to other modules over a few runs'''
+    best = None
+    for _ in range(runs):
+        own, other = split_import_us(measure_imports(module), module)
+        best = own / other if best is None else min(best, own / other)
+    return best
+
+def import_report(module: str='route_parser', limit: int=20) -> str:
+    '''Returns the slowest imports of a module, sorted by cumulative time'''
+    times = measure_imports(module)
+    own, other = split_import_us(times, module)
+
+    ret = f'Importing {module}: {(own + other) / 1000:.1f} ms, {own / 1000:.1f} ms in this repo '
+    ret += f'and {other / 1000:.1f} ms elsewhere (budget {IMPORT_BUDGET}x)\n'
+    ret += 'cumulative ms | self ms | module\n'
+    for t in sorted(times, key=lambda t: t.cumulative_us, reverse=True)[:limit]:
+        ret += f'{t.cumulative_us / 1000:13.1f} | {t.self_us / 1000:7.1f} | {t.name}\n'
+    return ret
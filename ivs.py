@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True)
 class IVs:
     attack: int = 9
     defense: int = 8
@@ -9,10 +9,10 @@ class IVs:
     hp: int = 8
 
     def __post_init__(self):
-        self.hp = (((self.attack & 1) << 3) +
+        object.__setattr__(self, 'hp', (((self.attack & 1) << 3) +
         ((self.defense & 1) << 2) +
         ((self.speed & 1) << 1) +
-        (self.special & 1))
+        (self.special & 1)))
 
     @property
     def hex(self) -> int:
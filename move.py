@@ -1,8 +1,14 @@
 from dataclasses import dataclass
 from type import Type
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class Move:
+    """Interned move data, compared and hashed by identity
+
+    Moves are only created once by data.get_moves, so copies and pickles
+    resolve back to that shared instance by index.
+    """
+    __slots__ = ('name', 'type', 'pp', 'power', 'accuracy', 'index')
     name: str
     type: Type
     pp: int
@@ -10,10 +16,15 @@ class Move:
     accuracy: int
     index: int
 
-    def __hash__(self):
-        return hash((self.name, self.index))
+    def __reduce__(self):
+        return (_interned_move, (self.index,))
 
 @dataclass
 class LevelMove:
     level: int
     move: Move
+
+def _interned_move(index: int) -> Move:
+    '''Returns the shared Move for a move index'''
+    import data
+    return data.get_move_list()[index]
@@ -0,0 +1,102 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from checkpoint import code_fingerprint
+from move import Move
+from pokemon import Pokemon
+from stat_modifier import StatModifier
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+def n_shot_key(attacker: Pokemon,
+               defender: Pokemon,
+               turns: int,
+               moves: list[Move],
+               att_mods: list[StatModifier],
+               def_mods: list[StatModifier]
+    ) -> str:
+    '''Canonical key of everything an n_shot_with_mods result depends on
+
+    Pokemon are reduced to the stats, types and level the damage formula
+    uses, so the same matchup shares a key across routes. Keys also change
+    with the code, so results never outlive the calculation they came from.
+    '''
+    parts = (
+        code_fingerprint(),
+        _pokemon_key(attacker),
+        _pokemon_key(defender),
+        turns,
+        tuple((move.name, move.type.name, move.power) for move in moves),
+        tuple(_mod_key(mod) for mod in att_mods),
+        tuple(_mod_key(mod) for mod in def_mods),
+    )
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+def _pokemon_key(pokemon: Pokemon) -> tuple:
+    species = pokemon.species
+    return (pokemon.level, species.base_spd, species.type1.name, species.type2.name,
+            pokemon._hp, pokemon._att, pokemon._def, pokemon._spd, pokemon._spc,
+            pokemon.att_badge, pokemon.def_badge, pokemon.spd_badge, pokemon.spc_badge)
+
+def _mod_key(mod: StatModifier) -> tuple:
+    return (mod.attack, mod.defense, mod.speed, mod.special,
+            mod.att_bb, mod.def_bb, mod.spd_bb, mod.spc_bb)
+
+class NShotCache:
+    """Persistent n_shot_with_mods results, shared by every route and run
+
+    Results are stored in a sqlite database keyed by n_shot_key. New
+    results are written on close, in one short transaction, so several
+    processes can share a database. When it holds more than max_entries
+    results, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: Path, max_entries: int=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS n_shot '
+                        '(key TEXT PRIMARY KEY, kill_pct REAL NOT NULL, used REAL NOT NULL)')
+        self.db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.used = set()
+        self.pending = {}
+
+    key = staticmethod(n_shot_key)
+
+    def get(self, key: str) -> float:
+        '''Returns a cached kill%, None if it hasn't been calculated'''
+        if key in self.pending:
+            self.hits += 1
+            return self.pending[key]
+        row = self.db.execute('SELECT kill_pct FROM n_shot WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used.add(key)
+        return row[0]
+
+    def put(self, key: str, kill_pct: float) -> None:
+        self.pending[key] = kill_pct
+
+    def __len__(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM n_shot').fetchone()[0]
+
+    def close(self) -> None:
+        '''Saves new results and recency of hits, then evicts past max_entries'''
+        now = time.time()
+        self.db.executemany('UPDATE n_shot SET used = ? WHERE key = ?', ((now, key) for key in self.used))
+        self.db.executemany('INSERT OR REPLACE INTO n_shot VALUES (?, ?, ?)',
+                            ((key, kill_pct, now) for key, kill_pct in self.pending.items()))
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.db.execute('DELETE FROM n_shot WHERE key IN '
+                            '(SELECT key FROM n_shot ORDER BY used LIMIT ?)', (excess,))
+        self.db.commit()
+        self.db.close()
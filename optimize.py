@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field, replace
+from itertools import product
+
+from actions import ACTIONS, CompiledAction, FightPlan
+from checkpoint import restore_snapshot, snapshot
+from route_parser import RouteFile, discard_log
+
+@dataclass
+class Placement:
+    """Using an item right before an action"""
+    action: int
+    item: str
+
+@dataclass
+class Optimization:
+    """The best item placements found and how much searching it took
+
+    score is the weighted sum of every range check's kill% with the
+    placements, baseline is the same without them. simulated counts the
+    actions that were performed and pruned the partial placements that
+    were abandoned because they couldn't beat the best so far.
+    """
+    score: float
+    baseline: float
+    placements: list[Placement] = field(default_factory=list)
+    simulated: int = 0
+    pruned: int = 0
+
+def parse_items(items: str) -> dict[str, int]:
+    '''Parses an item pool like "RARE CANDY=2, PROTEIN" into item counts'''
+    ret = {}
+    for item in items.split(','):
+        name, _, count = item.partition('=')
+        ret[name.strip().upper()] = ret.get(name.strip().upper(), 0) + int(count or 1)
+    return ret
+
+def parse_weights(weights: str) -> dict[str, float]:
+    '''Parses range check weights like "2_bbs=2, 1_bb=0.5"'''
+    ret = {}
+    for weight in weights.split(','):
+        name, _, value = weight.partition('=')
+        ret[name.strip()] = float(value)
+    return ret
+
+def optimize(route: RouteFile, items: dict[str, int], weights: dict[str, float]=None) -> Optimization:
+    '''Searches for where to use a pool of items to maximize the route's range checks
+
+    Items can be used before any fight. The objective is the sum of every
+    range check's kill% multiplied by its weight (by range check name,
+    defaulting to 1). Partial placements are extended depth first from
+    snapshots of the state after each action, the same snapshots
+    checkpoints use, so shared prefixes are only simulated once. A branch
+    is pruned once even 100% on every remaining range check couldn't beat
+    the best placement found so far.
+    '''
+    weights = weights or {}
+    use_item = ACTIONS['use item']
+    route.compile_items(list(items))
+    plan = [_quiet(action) for action in route.compile()]
+
+    # Most kill% each action onwards could still add, for pruning
+    potential = [0.0] * (len(plan) + 1)
+    for idx in range(len(plan) - 1, -1, -1):
+        potential[idx] = potential[idx + 1] + _max_score(plan[idx], weights)
+
+    names = sorted(items)
+    start = snapshot(route)
+    memo = {}
+    ret = Optimization(score=float('-inf'), baseline=0.0)
+
+    def step(idx: int, state: bytes, used: tuple[str, ...]) -> tuple[bytes, float]:
+        '''Uses items and performs plan[idx] from state, memoized'''
+        key = (idx, state, used)
+        if key not in memo:
+            restore_snapshot(route, state)
+            if used:
+                use_item.run(route, used)
+            result = route.perform(plan[idx])
+            ret.simulated += 1
+            memo[key] = snapshot(route), _score(result.battles, weights)
+        return memo[key]
+
+    def search(idx: int, state: bytes, remaining: tuple[int, ...], score: float, placed: list[Placement]) -> None:
+        if score + potential[idx] <= ret.score:
+            ret.pruned += 1
+            return
+        if idx == len(plan):
+            ret.score = score
+            ret.placements = placed
+            return
+
+        choices = [(0,) * len(names)]
+        if plan[idx].handler.key in {'fight', 'wild'} and any(remaining):
+            # Using more items first finds good placements early, which prunes more
+            choices = sorted(product(*(range(count + 1) for count in remaining)), key=sum, reverse=True)
+        for choice in choices:
+            used = tuple(name for name, count in zip(names, choice) for _ in range(count))
+            new_state, gained = step(idx, state, used)
+            left = tuple(r - c for r, c in zip(remaining, choice))
+            search(idx + 1, new_state, left, score + gained,
+                   placed + [Placement(plan[idx].index, item) for item in used])
+
+    log, route.log = route.log, discard_log
+    try:
+        state = start
+        for idx in range(len(plan)):
+            state, gained = step(idx, state, ())
+            ret.baseline += gained
+        search(0, start, tuple(items[name] for name in names), 0.0, [])
+    finally:
+        restore_snapshot(route, start)
+        route.log = log
+    return ret
+
+def _quiet(action: CompiledAction) -> CompiledAction:
+    '''Drops output the search doesn't need, only range checks are scored'''
+    if isinstance(action.value, FightPlan):
+        return replace(action, value=replace(action.value, verbosity=0, variations={}))
+    return action
+
+def _max_score(action: CompiledAction, weights: dict[str, float]) -> float:
+    '''Returns the most an action's range checks can add to the objective'''
+    if not isinstance(action.value, FightPlan):
+        return 0.0
+    ret = 0.0
+    for checks in action.value.range_checks.values():
+        for name in checks:
+            ret += 100 * max(weights.get(name, 1.0), 0.0)
+    return ret * len(action.value.opponents)
+
+def _score(battles: list, weights: dict[str, float]) -> float:
+    '''Weighted sum of the kill% of every range check in the battles'''
+    return sum(rc.kill_pct * weights.get(rc.name, 1.0)
+               for battle in battles for enemy in battle.enemies for rc in enemy.range_checks)
+
+def format_optimization(route: RouteFile, result: Optimization) -> str:
+    '''Returns the best placements as use item actions to add to the route'''
+    ret = f'Best score: {result.score:.4f} (without items: {result.baseline:.4f})\n'
+    ret += f'{result.simulated} actions simulated, {result.pruned} placements pruned\n'
+    for placement in result.placements:
+        ret += f'Use {placement.item} before action #{placement.action} ({route.action_label(placement.action)})\n'
+    return ret.strip()
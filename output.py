@@ -0,0 +1,121 @@
+import locale
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TextIO
+
+class OutputSink(ABC):
+    """Destination for rendered route output
+
+    RouteFile writes each action's section as soon as it is rendered and
+    flushes after every action, so sinks never need the whole report.
+    """
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class FileSink(OutputSink):
+    """Buffered writes to an output file"""
+
+    def __init__(self, path: str, buffer_size: int=64 * 1024):
+        self.file = open(path, 'w', buffering=buffer_size)
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+class StreamSink(OutputSink):
+    """Writes to an already open stream, e.g. sys.stdout, without closing it"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+class StringSink(OutputSink):
+    """Collects output in memory"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+    def getvalue(self) -> str:
+        '''Returns everything written so far'''
+        return ''.join(self.parts)
+
+class RewriteSink(OutputSink):
+    """Rewrites a file, leaving the part that hasn't changed untouched
+
+    Output matching the start of the file's current contents is skipped.
+    The file is truncated where the output first differs and only the rest
+    is written. Bytes match what FileSink writes for the same output.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        try:
+            self.existing = self.path.read_bytes()
+        except FileNotFoundError:
+            self.existing = None
+        self.encoding = locale.getpreferredencoding(False)
+        self.pos = 0
+        self.file = None
+
+    @property
+    def rewritten_from(self) -> int:
+        '''Byte offset the file was rewritten from, None if unchanged so far'''
+        return self.pos if self.file is not None else None
+
+    def write(self, text: str) -> None:
+        data = text.replace('\n', os.linesep).encode(self.encoding)
+        if self.file is None:
+            existing = (self.existing or b'')[self.pos:self.pos + len(data)]
+            if existing == data and self.existing is not None:
+                self.pos += len(data)
+                return
+            common = len(os.path.commonprefix([existing, data]))
+            self.pos += common
+            data = data[common:]
+            self._open()
+        self.file.write(data)
+
+    def _open(self) -> None:
+        '''Opens the file for writing, truncated at the current position'''
+        self.file = open(self.path, 'r+b' if self.existing is not None else 'wb')
+        self.file.seek(self.pos)
+        self.file.truncate()
+
+    def flush(self) -> None:
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self) -> None:
+        # Output that got shorter still needs the old tail removed
+        if self.file is None and (self.existing is None or self.pos < len(self.existing)):
+            self._open()
+        if self.file is not None:
+            self.file.close()
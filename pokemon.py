@@ -1,11 +1,22 @@
+from copy import copy
 from dataclasses import dataclass, field
+from functools import lru_cache
 from math import ceil, sqrt
 
 from species import Species
 from ivs import IVs, ivs_from_hex
-from moveset import Moveset, get_default_moveset
+from moveset import Moveset
 import data
 
+@dataclass(frozen=True)
+class Stats:
+    """Unboosted stats, shared by every pokemon with the same species, level, IVs and stat exp"""
+    hp: int
+    attack: int
+    defense: int
+    speed: int
+    special: int
+
 @dataclass
 class Pokemon:
     species: str
@@ -22,11 +33,10 @@ class Pokemon:
             if not self.species:
                 raise ValueError('Could not find valid species')
 
-        # If no moveset is supplied, grab the default learnset
-        # Slightly expensive operation to grab learnset data every time
+        # If no moveset is supplied, copy the precomputed default moveset
         if not self.moveset:
-            learnset = data.get_learnset(self.species.dex_num, self.game)
-            self.moveset = get_default_moveset(learnset, self.level)
+            default = data.get_default_movesets()[self.game][self.species.dex_num]
+            self.moveset = Moveset(default[min(self.level, 100)])
 
         self.ev_hp = 0
         self.ev_att = 0
@@ -40,6 +50,11 @@ class Pokemon:
         self._update_exp()
         self.calculate_stats()
 
+    @property
+    def max_hp(self) -> int:
+        '''Returns max HP'''
+        return self._hp
+
     @property
     def attack(self) -> int:
         '''Returns attack stat'''
@@ -73,7 +88,7 @@ class Pokemon:
     @property
     def stats_str(self) -> str:
         '''Returns stats formatted as hp/att/def/spd/spc'''
-        return f'{self._hp}/{self.attack}/{self.defense}/{self.speed}/{self.special}'
+        return f'{self.max_hp}/{self.attack}/{self.defense}/{self.speed}/{self.special}'
 
     def battle(self, winner, participants: int=1) -> None:
         '''Performs exp/stat calculations for a battle
@@ -92,19 +107,29 @@ class Pokemon:
         underscore variables represent "raw" stat data that is sometimes
         called directly for damage calculations
         '''
-        self._hp = self._calculate_stat_with_iv(self.ivs.hp, self.species.base_hp, self.ev_hp, True)
-        self._att = self._calculate_stat_with_iv(self.ivs.attack, self.species.base_att, self.ev_att)
-        self._def = self._calculate_stat_with_iv(self.ivs.defense, self.species.base_def, self.ev_def)
-        self._spd = self._calculate_stat_with_iv(self.ivs.speed, self.species.base_spd, self.ev_spd)
-        self._spc = self._calculate_stat_with_iv(self.ivs.special, self.species.base_spc, self.ev_spc)
+        bonuses = tuple(ev_calc(ev) for ev in (self.ev_hp, self.ev_att, self.ev_def, self.ev_spd, self.ev_spc))
+        stats = calculate_stats(self.species, self.level, self.ivs, bonuses)
+        self._stats = stats
+        self._hp, self._att, self._def = stats.hp, stats.attack, stats.defense
+        self._spd, self._spc = stats.speed, stats.special
+
+    @property
+    def stats(self) -> Stats:
+        '''Returns the unboosted stats, shared with every pokemon that has the same ones'''
+        return self._stats
+
+    def with_ivs(self, ivs: IVs) -> 'Pokemon':
+        '''Returns a copy with different IVs, leaving this pokemon unchanged'''
+        if ivs == self.ivs:
+            return self
+        ret = copy(self)
+        ret.ivs = ivs
+        ret.calculate_stats()
+        return ret
 
     def _calculate_stat_with_iv(self, iv: int, base: int, ev: int, hp=False) -> int:
         '''Recalculates the stat value given IVs and EVs'''
-        x = calculate_stat_numerator(iv, base, ev) * self.level // 100
-        x += 5
-        if hp:
-            x += self.level + 5
-        return x
+        return calculate_stat(iv, base, ev_calc(ev), self.level, hp)
 
     def _update_exp(self) -> None:
         '''Updates EXP values'''
@@ -190,13 +215,13 @@ class Pokemon:
             self.__dict__[stat] += 2560
             self.calculate_stats()
 
-    def evolve(self, species: str) -> None:
-        '''Transforms self into the supplied species
+    def evolve(self, species) -> None:
+        '''Transforms self into the supplied species, by name or Species
 
         Currently a bit hacky and does not validate whether the evolution is
         actually possible
         '''
-        self.species = data.get_species(species)
+        self.species = species if isinstance(species, Species) else data.get_species(species)
         self.calculate_stats()
 
     def print_possible_stats(self) -> str:
@@ -236,6 +261,24 @@ class Pokemon:
         '''Easily set all badge boosts'''
         self.att_badge = self.def_badge = self.spd_badge = self.spc_badge = value
 
+@lru_cache(maxsize=4096)
+def calculate_stats(species: Species, level: int, ivs: IVs, bonuses: tuple[int, ...]) -> Stats:
+    '''Calculates stats from IVs and the stat exp bonus (ev_calc) of each stat
+
+    Memoized, since trainer pokemon, variations and range checks keep
+    asking for the same stats
+    '''
+    return Stats(calculate_stat(ivs.hp, species.base_hp, bonuses[0], level, True),
+                 calculate_stat(ivs.attack, species.base_att, bonuses[1], level),
+                 calculate_stat(ivs.defense, species.base_def, bonuses[2], level),
+                 calculate_stat(ivs.speed, species.base_spd, bonuses[3], level),
+                 calculate_stat(ivs.special, species.base_spc, bonuses[4], level))
+
+def calculate_stat(iv: int, base: int, bonus: int, level: int, hp: bool=False) -> int:
+    '''Calculates a single stat from its IV, base stat and stat exp bonus (ev_calc)'''
+    ret = (2 * (iv + base) + bonus) * level // 100 + 5
+    return ret + level + 5 if hp else ret
+
 def cap_ev(ev: int) -> int:
     '''Easy way to cap EVs to 65535'''
     return min(ev, 65535)
@@ -243,7 +286,3 @@ def cap_ev(ev: int) -> int:
 def ev_calc(ev: int) -> int:
     '''Calculates EVs'''
     return min(ceil(sqrt(ev)), 255) // 4
-
-def calculate_stat_numerator(iv: int, base: int, ev: int) -> int:
-    '''Used for stat calculations'''
-    return 2 * (iv + base) + ev_calc(ev)
@@ -0,0 +1,105 @@
+import cProfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import damage_calc
+
+@dataclass
+class ProfileEntry:
+    """Time and work spent on a route action or on one enemy of a battle
+
+    action is the 1-based index of the action, also for enemies
+    """
+    action: int
+    name: str
+    seconds: float = 0.0
+    damage_calcs: int = 0
+    n_shots: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+class RouteProfiler:
+    """Records where the time of a route run goes
+
+    Everything run inside the profiler is also profiled by cProfile, which
+    is where the _damage and _kill_pct call counts come from. Work
+    done in worker processes isn't seen, so routes should be profiled with
+    a single worker.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.actions: list[ProfileEntry] = []
+        self.enemies: list[ProfileEntry] = []
+        self._action = 0
+
+    def __enter__(self) -> 'RouteProfiler':
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.profile.disable()
+
+    def action(self, index: int, name: str, cache=None) -> Iterator[ProfileEntry]:
+        '''Context manager measuring a route action'''
+        self._action = index
+        return self._measure(ProfileEntry(index, name), self.actions, cache)
+
+    def enemy(self, name: str, cache=None) -> Iterator[ProfileEntry]:
+        '''Context manager measuring the calculations against one enemy'''
+        return self._measure(ProfileEntry(self._action, name), self.enemies, cache)
+
+    @contextmanager
+    def _measure(self, entry: ProfileEntry, entries: list[ProfileEntry], cache) -> Iterator[ProfileEntry]:
+        damage_calcs, n_shots = self._calls()
+        hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry.seconds = time.perf_counter() - start
+            end_damage_calcs, end_n_shots = self._calls()
+            entry.damage_calcs = end_damage_calcs - damage_calcs
+            entry.n_shots = end_n_shots - n_shots
+            if cache is not None:
+                entry.cache_hits = cache.hits - hits
+                entry.cache_misses = cache.misses - misses
+            entries.append(entry)
+
+    def _calls(self) -> tuple[int, int]:
+        '''Returns how many times _damage and _kill_pct have returned'''
+        damage_calcs = n_shots = 0
+        for stat in self.profile.getstats():
+            if stat.code is damage_calc._damage.__code__:
+                damage_calcs = stat.callcount
+            elif stat.code is damage_calc._kill_pct.__code__:
+                n_shots = stat.callcount
+        return damage_calcs, n_shots
+
+    def dump(self, path: Path) -> None:
+        '''Writes the cProfile stats, for pstats or snakeviz'''
+        self.profile.dump_stats(path)
+
+def format_profile(profiler: RouteProfiler, limit: int=20) -> str:
+    '''Returns the slowest actions and enemies as tables'''
+    actions = profiler.actions
+    hits = sum(entry.cache_hits for entry in actions)
+    lookups = hits + sum(entry.cache_misses for entry in actions)
+    ret = f'Profiled {len(actions)} actions in {sum(entry.seconds for entry in actions):.2f}s: '
+    ret += f'{sum(entry.damage_calcs for entry in actions)} damage calcs, '
+    ret += f'{sum(entry.n_shots for entry in actions)} n-shot evaluations, '
+    ret += f'{hits}/{lookups} range check cache hits\n'
+    for title, entries in (('actions', actions), ('enemies', profiler.enemies)):
+        ret += f'\nSlowest {title}:\n'
+        ret += f'{"Time (s)":>9} | {"Damage calcs":>12} | {"N-shots":>7} | {"Cache hits":>10} | Action\n'
+        entries = sorted(entries, key=lambda entry: entry.seconds, reverse=True)
+        for entry in entries[:limit]:
+            cache = f'{entry.cache_hits}/{entry.cache_hits + entry.cache_misses}'
+            ret += f'{entry.seconds:>9.3f} | {entry.damage_calcs:>12} | {entry.n_shots:>7} | '
+            ret += f'{cache:>10} | #{entry.action} {entry.name}\n'
+        if len(entries) > limit:
+            ret += f'... and {len(entries) - limit} more\n'
+    return ret.strip()
@@ -0,0 +1,349 @@
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from stat_modifier import StatModifier
+
+@dataclass
+class MoveResult:
+    """Damage ranges, roll tables and n-hit kill chances of one move
+
+    rolls map damage to how many of the 39 rolls deal it. kill_pcts map a
+    number of hits to the chance they kill, for chances that aren't
+    (almost) 0 or 100. choice_pct is the chance of the enemy choosing the
+    move, only calculated for enemy moves at verbosity 3
+    """
+    move: str
+    min_damage: int = 0
+    max_damage: int = 0
+    min_crit: int = 0
+    max_crit: int = 0
+    rolls: dict[int, int] = field(default_factory=dict)
+    crit_rolls: dict[int, int] = field(default_factory=dict)
+    kill_pcts: dict[int, float] = field(default_factory=dict)
+    choice_pct: Optional[float] = None
+
+@dataclass
+class SideResult:
+    """One side of a battle and its moves against the other side"""
+    name: str
+    stats: str
+    mods: str
+    moves: list[MoveResult]
+
+@dataclass
+class HpResult:
+    """Your HP right after an enemy, when HP is tracked
+
+    turns is how many times the enemy attacked and fainted is the chance,
+    in percent, of having fainted so far in the route
+    """
+    turns: int
+    max_hp: int
+    average: float
+    fainted: float
+
+@dataclass
+class MatchupResult:
+    """A battle between your pokemon and a single enemy pokemon
+
+    player and opponent are only calculated for full (verbosity 2) output.
+    damage_taken maps the damage the enemy deals you in a turn to its
+    chance, only calculated for verbosity 3. hp is only set for the main
+    battle of routes that track HP
+    """
+    level: int
+    exp_to_next_level: int
+    exp_for_level: int
+    pokemon: str
+    enemy: str
+    exp_given: int
+    player: Optional[SideResult] = None
+    opponent: Optional[SideResult] = None
+    damage_taken: dict[int, float] = field(default_factory=dict)
+    hp: Optional[HpResult] = None
+
+@dataclass
+class RangeCheckTurn:
+    move: str
+    att_mod: StatModifier
+    def_mod: StatModifier
+
+@dataclass
+class RangeCheckResult:
+    name: str
+    kill_pct: float
+    turns: list[RangeCheckTurn]
+
+@dataclass
+class EnemyResult:
+    """Everything calculated against one enemy pokemon"""
+    index: int
+    matchup: MatchupResult
+    variations: dict[str, MatchupResult] = field(default_factory=dict)
+    range_checks: list[RangeCheckResult] = field(default_factory=list)
+
+@dataclass
+class BattleResult:
+    """A battle against a trainer or wild pokemon"""
+    opponent: str
+    wild: bool
+    verbosity: int
+    enemies: list[EnemyResult] = field(default_factory=list)
+
+@dataclass
+class PokemonState:
+    """Your pokemon and money right after an action"""
+    species: str
+    level: int
+    exp: int
+    hp: int
+    attack: int
+    defense: int
+    speed: int
+    special: int
+    money: int
+    badges: list[str]
+
+    @property
+    def stats(self) -> str:
+        return f'{self.hp}/{self.attack}/{self.defense}/{self.speed}/{self.special}'
+
+@dataclass
+class ActionResult:
+    """The outcome of a single route action
+
+    text is what the action prints besides battles, e.g. print stats
+    """
+    index: int
+    action: str
+    state: PokemonState
+    battles: list[BattleResult] = field(default_factory=list)
+    text: str = ''
+    branch: Optional['BranchResult'] = None
+
+@dataclass
+class BranchResult:
+    """Results of each branch of a branch action, run from the same state
+
+    common are the results of the actions every branch starts with and
+    final is each branch's state after its last action
+    """
+    common: list[ActionResult] = field(default_factory=list)
+    branches: dict[str, list[ActionResult]] = field(default_factory=dict)
+    final: dict[str, PokemonState] = field(default_factory=dict)
+
+def pokemon_state(pokemon, money: int) -> PokemonState:
+    '''Snapshots a Pokemon for ActionResult'''
+    badges = [name for name in ('att', 'def', 'spd', 'spc') if getattr(pokemon, f'{name}_badge')]
+    return PokemonState(pokemon.name, pokemon.level, pokemon.total_exp, pokemon.max_hp,
+                        pokemon.attack, pokemon.defense, pokemon.speed, pokemon.special,
+                        money, badges)
+
+def render_move(result: MoveResult) -> list[str]:
+    '''Renders a move's damage ranges as lines of text'''
+    line = f'{result.move}'
+    chosen = ''
+    if result.choice_pct is not None:
+        chosen = f'\t(chosen: {result.choice_pct:.2f}%)'
+    if result.max_damage == 0 and result.max_crit == 0:
+        return [line + chosen]
+
+    if result.max_damage:
+        line += f' {result.min_damage}-{result.max_damage}'
+    line += f'\t(crit: {result.min_crit}-{result.max_crit})'
+    ret = [line + chosen]
+
+    for name, rolls in zip(['Normal', 'Crit'], [result.rolls, result.crit_rolls]):
+        line = f'\t{name} rolls: '
+        for roll, frequency in rolls.items():
+            line += f'{roll}x{frequency}, '
+        ret.append(line.strip(', '))
+
+    for hits, kill_pct in result.kill_pcts.items():
+        ret.append(f'\t(Overall {hits}-hit Kill%: {kill_pct:.4f}%)')
+    return ret
+
+def render_side(result: SideResult) -> list[str]:
+    '''Renders one side of a battle as lines of text'''
+    line = f'{result.name} ({result.stats})'
+    if result.mods:
+        line += f' {result.mods}'
+    ret = [line]
+    for move in result.moves:
+        ret += render_move(move)
+    return ret
+
+def render_matchup(result: MatchupResult, verbosity: int, indent: bool=False) -> str:
+    '''Renders a single battle at the given verbosity'''
+    sep = '\n\t' if indent else '\n'
+    short = [f'LVL {result.level} EXP NEEDED: {result.exp_to_next_level}/{result.exp_for_level}',
+             f'{result.pokemon} vs {result.enemy}          >>> EXP GIVEN: {result.exp_given}']
+    if result.hp is not None:
+        short.append(render_hp(result.hp))
+    if verbosity == 0:
+        return ''
+    elif verbosity == 1:
+        return f'{sep}{sep.join(short)}'
+    elif verbosity in (2, 3):
+        ret = f'{sep}{sep.join(short)}'
+        ret += f'{sep}{sep.join(render_side(result.player))}'
+        ret += f'\n{sep}{sep.join(render_side(result.opponent))}'
+        if verbosity == 3:
+            ret += f'{sep}{render_damage_taken(result.damage_taken)}'
+        return ret + '\n'
+    raise IndexError(f'Could not parse verbosity level {verbosity}')
+
+def render_hp(result: HpResult) -> str:
+    '''Renders your HP after an enemy as its average and chance of having fainted'''
+    turns = f'{result.turns} enemy turn' + ('' if result.turns == 1 else 's')
+    ret = f'HP after {turns}: {result.average:.2f}/{result.max_hp} on average'
+    return ret + f', {result.fainted:.2f}% fainted'
+
+def render_damage_taken(damage_taken: dict[int, float]) -> str:
+    '''Renders the damage taken per turn as its average, maximum and chance of none'''
+    average = sum(damage * chance for damage, chance in damage_taken.items())
+    ret = f'Damage taken per turn: {average:.2f} on average, up to {max(damage_taken)}'
+    return ret + f' ({100 * damage_taken.get(0, 0):.2f}% none)'
+
+def render_battle(result: BattleResult) -> str:
+    '''Renders a trainer or wild battle the way it appears in output files'''
+    ret = ''
+    for enemy in result.enemies:
+        ret += render_matchup(enemy.matchup, result.verbosity)
+        for name, variation in enemy.variations.items():
+            ret += f'\nVariation {name}:\n{render_matchup(variation, result.verbosity, True)}'
+
+        rcs = ''
+        for rc in enemy.range_checks:
+            rcs += f'\nRange Check {rc.name}: {rc.kill_pct:.5f}%'
+            for idx, turn in enumerate(rc.turns, 1):
+                rcs += f'\n\tTurn #{idx}: '
+                rcs += f'Move: {turn.move}'
+                rcs += f'\n\t\tatt_mod: {turn.att_mod}'
+                rcs += f'\n\t\tdef_mod: {turn.def_mod}'
+        if rcs:
+            ret += rcs + '\n\n'
+
+    ret = ret.strip()
+    if result.verbosity:
+        ret = f'\n{result.opponent}\n{ret}\n\n'
+    return ret
+
+class Renderer(ABC):
+    """Turns action results into output text, one action at a time
+
+    started is set once something has been rendered, including by an
+    earlier run whose output was restored from checkpoints
+    """
+    suffix = '.txt'
+    started = False
+
+    @abstractmethod
+    def render(self, result: ActionResult) -> str:
+        pass
+
+class TextRenderer(Renderer):
+    """The human readable output format"""
+
+    def render(self, result: ActionResult) -> str:
+        ret = ''.join(render_battle(battle) for battle in result.battles)
+        if result.text:
+            ret += f'\n{result.text}\n'
+        if result.branch is not None:
+            ret += self.render_branch(result.branch)
+        return ret
+
+    def render_branch(self, result: BranchResult) -> str:
+        '''Renders each branch in turn, then their final states side by side'''
+        ret = ''
+        if result.common:
+            ret += '\n==== Every branch ====\n'
+            ret += ''.join(self.render(action) for action in result.common)
+        for name, actions in result.branches.items():
+            ret += f'\n==== Branch {name} ====\n'
+            ret += ''.join(self.render(action) for action in actions)
+
+        width = max(len('Branch'), *(len(name) for name in result.final))
+        ret += f'\n{"Branch".ljust(width)} | LVL | EXP     | STATS               | MONEY\n'
+        for name, state in result.final.items():
+            ret += f'{name.ljust(width)} | {str(state.level).rjust(3)} | {str(state.exp).ljust(7)} '
+            ret += f'| {state.stats.ljust(19)} | {state.money}\n'
+        return ret
+
+class JsonLinesRenderer(Renderer):
+    """One JSON object per action"""
+    suffix = '.jsonl'
+
+    def render(self, result: ActionResult) -> str:
+        import json
+
+        return json.dumps(asdict(result)) + '\n'
+
+class CsvRenderer(Renderer):
+    """One row per action state, matchup, move and range check
+
+    Rows are told apart by the section column. Actions inside a branch
+    action have the branch's name in the branch column, or "*" for the
+    actions every branch starts with. The header is written with the first
+    action.
+    """
+    suffix = '.csv'
+    COLUMNS = ['action', 'type', 'branch', 'section', 'opponent', 'enemy', 'name', 'attacker',
+               'defender', 'move', 'min', 'max', 'crit_min', 'crit_max', 'kill_pct',
+               'level', 'exp', 'stats', 'money']
+
+    def render(self, result: ActionResult) -> str:
+        import csv
+        import io
+
+        out = io.StringIO()
+        writer = csv.DictWriter(out, self.COLUMNS, lineterminator='\n')
+        if not self.started:
+            writer.writeheader()
+            self.started = True
+
+        self._rows(writer, result)
+        return out.getvalue()
+
+    def _rows(self, writer, result: ActionResult, branch: str='') -> None:
+        '''Writes the rows of an action and of any actions inside it'''
+        row = {'action': result.index, 'type': result.action, 'branch': branch}
+        state = result.state
+        writer.writerow({**row, 'section': 'state', 'level': state.level, 'exp': state.exp,
+                         'stats': state.stats, 'money': state.money})
+        for battle in result.battles:
+            for enemy in battle.enemies:
+                enemy_row = {**row, 'opponent': battle.opponent, 'enemy': enemy.index}
+                self._matchup(writer, enemy_row, 'matchup', '', enemy.matchup)
+                for name, variation in enemy.variations.items():
+                    self._matchup(writer, enemy_row, 'variation', name, variation)
+                for rc in enemy.range_checks:
+                    writer.writerow({**enemy_row, 'section': 'range_check', 'name': rc.name,
+                                     'move': ','.join(turn.move for turn in rc.turns),
+                                     'kill_pct': rc.kill_pct})
+        if result.branch is not None:
+            prefix = f'{branch}/' if branch else ''
+            for action in result.branch.common:
+                self._rows(writer, action, f'{prefix}*')
+            for name, actions in result.branch.branches.items():
+                for action in actions:
+                    self._rows(writer, action, f'{prefix}{name}')
+
+    def _matchup(self, writer, row: dict[str, Any], section: str, name: str, result: MatchupResult) -> None:
+        '''Writes a matchup row followed by a row per move of either side'''
+        row = {**row, 'name': name}
+        writer.writerow({**row, 'section': section, 'attacker': result.pokemon,
+                         'defender': result.enemy, 'level': result.level, 'exp': result.exp_given})
+        if result.player is None:
+            return
+        for side, defender in ((result.player, result.opponent), (result.opponent, result.player)):
+            for move in side.moves:
+                kill_pcts = ';'.join(f'{hits}:{pct:.4f}' for hits, pct in move.kill_pcts.items())
+                writer.writerow({**row, 'section': f'{section}_move', 'attacker': side.name,
+                                 'defender': defender.name, 'move': move.move,
+                                 'min': move.min_damage, 'max': move.max_damage,
+                                 'crit_min': move.min_crit, 'crit_max': move.max_crit,
+                                 'kill_pct': kill_pcts})
+
+RENDERERS = {'text': TextRenderer, 'jsonl': JsonLinesRenderer, 'csv': CsvRenderer}
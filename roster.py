@@ -0,0 +1,126 @@
+from array import array
+from typing import Mapping
+
+from damage_calc import _attack_stats, _damage_from_stats, _defense_stat, _fixed_damage
+from move import Move
+from pokemon import Pokemon
+from stat_modifier import StatModifier, modify_stat
+from trainers import Trainer
+from type import Type
+
+# Column name, array typecode
+COLUMNS = (
+    ('offset', 'L'),
+    ('slot', 'B'),
+    ('species', 'B'),
+    ('level', 'B'),
+    ('type1', 'b'),
+    ('type2', 'b'),
+    ('base_hp', 'B'),
+    ('base_att', 'B'),
+    ('base_def', 'B'),
+    ('base_spd', 'B'),
+    ('base_spc', 'B'),
+    ('hp', 'H'),
+    ('attack', 'H'),
+    ('defense', 'H'),
+    ('speed', 'H'),
+    ('special', 'H'),
+    ('exp', 'H'),
+    ('move1', 'B'),
+    ('move2', 'B'),
+    ('move3', 'B'),
+    ('move4', 'B'),
+)
+
+_types = {t.value: t for t in Type}
+
+class Roster:
+    """Column-oriented table of every trainer pokemon in a game
+
+    Every column is an array with one entry per party member, so queries
+    over the whole game run on plain numbers instead of Pokemon objects.
+    Slots are 1-indexed like route files, stats are the trainer pokemon's
+    actual stats and empty move slots are 0.
+    """
+
+    def __init__(self):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self) -> int:
+        return len(self.offset)
+
+    @classmethod
+    def from_trainers(cls, trainers: Mapping[int, Trainer]) -> 'Roster':
+        '''Builds the columns from trainer data'''
+        roster = cls()
+        for offset, trainer in trainers.items():
+            for slot, pokemon in enumerate(trainer.pokes, 1):
+                roster.append(offset, slot, pokemon)
+        return roster
+
+    def append(self, offset: int, slot: int, pokemon: Pokemon) -> None:
+        '''Adds a single party member to every column'''
+        species = pokemon.species
+        moves = [move.index for move in pokemon.moveset[:4]]
+        moves += [0] * (4 - len(moves))
+        row = (offset, slot, species.dex_num, pokemon.level,
+               species.type1.value, species.type2.value,
+               species.base_hp, species.base_att, species.base_def,
+               species.base_spd, species.base_spc,
+               pokemon._hp, pokemon._att, pokemon._def, pokemon._spd, pokemon._spc,
+               pokemon.exp_given(), *moves)
+        for (name, _), value in zip(COLUMNS, row):
+            getattr(self, name).append(value)
+
+    def damage(self,
+               attacker: Pokemon,
+               move: Move,
+               att_mod: StatModifier=StatModifier(),
+               def_mod: StatModifier=StatModifier(),
+               roll: int=217,
+               crit: bool=False
+        ) -> array:
+        '''Returns the damage attacker deals to every row for a single roll
+
+        Mirrors damage_calc._damage, with the attacker's side calculated
+        once. Trainer pokemon don't have badge boosts, so only the stages of
+        def_mod apply.
+        '''
+
+        fixed = _fixed_damage(move, attacker)
+        if fixed is not None:
+            return array('H', [fixed] * len(self))
+
+        roll = min(max(roll, 217), 255)
+        att_stat, level, stab = _attack_stats(move, attacker, att_mod, crit)
+        if move.type.special:
+            def_column, def_stage = self.special, def_mod.special
+        else:
+            def_column, def_stage = self.defense, def_mod.defense
+
+        ret = array('H')
+        for def_stat, type1, type2 in zip(def_column, self.type1, self.type2):
+            def_stat = _defense_stat(move, def_stat, max(modify_stat(def_stat, def_stage), 1), crit)
+            ret.append(_damage_from_stats(move, level, att_stat, def_stat, stab,
+                                          _types[type1], _types[type2], roll))
+        return ret
+
+    def kills(self,
+              attacker: Pokemon,
+              move: Move,
+              hits: int=1,
+              att_mod: StatModifier=StatModifier(),
+              def_mod: StatModifier=StatModifier()
+        ) -> list[bool]:
+        '''Returns whether attacker always kills each row in this many hits
+
+        Uses the lowest non-crit roll, so a True row is a guaranteed kill
+        '''
+        min_damage = self.damage(attacker, move, att_mod, def_mod)
+        return [dmg * hits >= hp for dmg, hp in zip(min_damage, self.hp)]
+
+    def select(self, mask: list[bool]) -> list[tuple[int, int]]:
+        '''Returns the (offset, slot) of every row where mask is True'''
+        return [(offset, slot) for offset, slot, m in zip(self.offset, self.slot, mask) if m]
@@ -1,20 +1,67 @@
-import yaml
 import re
+import sys
 from collections import defaultdict
+from contextlib import nullcontext
+from copy import copy, deepcopy
+from dataclasses import replace
 from pathlib import Path
 
+from typing import Callable, ContextManager, Mapping
+
 from pokemon import Pokemon
+from hp import HEALING_ITEMS, HpDistribution
 from ivs import ivs_from_hex, IVs
+from move import Move
+from actions import ACTIONS, BranchPlan, CompiledAction, FightPlan, WildPoke
+from output import OutputSink, FileSink, StreamSink, StringSink
+from results import (
+    RENDERERS,
+    ActionResult,
+    BattleResult,
+    BranchResult,
+    PokemonState,
+    pokemon_state,
+)
+from species import Species
+from trainers import Trainer
 import stat_modifier
 from battle import Battle
+from workers import executor, submit
 from fight_variation import FightVariation
 import data
 
 
 class RouteFile:
-    def __init__(self, route_file: str):
-        with open(route_file) as f:
-            self.route = yaml.safe_load(f)
+    def __init__(
+        self,
+        route_file: str,
+        cache_dir: Path = None,
+        output_format: str = None,
+        source: bytes = None,
+        route: dict = None,
+    ):
+        """Loads a route file
+
+        With a cache_dir, the parsed route and its compiled plan are cached
+        there by the file's contents, so unchanged files aren't parsed again,
+        and range check results are shared with every other route using it.
+        output_format overrides the config's format (text, jsonl or csv).
+        With source, the route is loaded from it instead of the file, and
+        route is used as an already loaded route. The file then only names
+        the route.
+        """
+        self.route_file = route_file
+        self.cache_dir = cache_dir
+        self.source = source
+        if route is not None:
+            self.route = route
+        else:
+            if source is None:
+                self.source = Path(route_file).read_bytes()
+            if cache_dir is None:
+                self.route = load_yaml(self.source)
+            else:
+                self.route = self._cached(".route", lambda: load_yaml(self.source))
 
         base_name = Path(route_file).stem
         self.actions = self.route.get("route")
@@ -24,7 +71,12 @@ class RouteFile:
         if not self.config:
             raise RouteException(f'Must have a valid "config" section')
         self.game = self.config.get("game", "rb")
-        self.output = self.config.get("output", f"{base_name}_output.txt")
+        self.output_format = output_format or self.config.get("format", "text")
+        if self.output_format not in RENDERERS:
+            raise RouteException(f"Unknown output format: {self.output_format}")
+        self.renderer = RENDERERS[self.output_format]()
+        suffix = self.renderer.suffix
+        self.output = self.config.get("output", f"{base_name}_output{suffix}")
         self.ivs = ivs_from_hex(self.config.get("ivs", 0x9888))
         species = self.config.get("species")
         if not species:
@@ -32,125 +84,421 @@ class RouteFile:
         level = self.config.get("level", 5)
         self.pokemon = Pokemon(species, level, self.ivs)
         self.verbosity = self.config.get("default_verbosity", 0)
+        self.max_hits = self.config.get("max_hits", 8)
         self.money = self.config.get("starting_money", 0)
+        self.hp = HpDistribution(self.pokemon.max_hp) if self.config.get("track_hp") else None
+        self.workers = self.config.get("workers", 1)
+        self.n_shot_cache = None
+        self.profiler = None
+        # Where progress like trainer names goes
+        self.log: Callable[[str], None] = print
 
         self.wild_regex = r"(?i)^(lvl|lv|l)(\d+) (.+)$"
 
-        self.aliases = data.get_trainer_aliases()[self.game]
-        self.trainers = data.get_game_trainers(self.game)
-        self.species = data.get_all_species()
-        self.moves = data.get_moves()
-
-    def parse(self) -> None:
-        """Parses the log file and stores result in self.log"""
-        self.log = ""
-        for action in self.actions:
-            if details := action.get("fight"):
-                self.parse_fight(details)
-            if details := action.get("wild"):
-                self.parse_fight(details, True)
-            elif move_name := action.get("learn move"):
-                self.parse_learn_move(move_name, self.pokemon.moveset.add_move)
-            elif move_name := action.get("unlearn move"):
-                self.parse_learn_move(move_name, self.pokemon.moveset.delete_move)
-            elif item_name := action.get("use item"):
-                self.parse_item(item_name)
-            elif details := action.get("print stats"):
-                self.log += f"\n{self.pokemon.print_possible_stats()}\n"
-            elif badge_name := action.get("get badge"):
-                self.add_badge(badge_name)
-            elif species := action.get("evolve"):
-                self.pokemon.evolve(species)
-            elif action := action.get("print money"):
-                self.log += f"\nCurrent money: {self.money}\n"
-
-    def add_badge(self, badge: str) -> None:
-        """Processes the get badge action"""
-        badge = badge.lower()
+    # Game data tables are only built the first time a route needs them
+    @property
+    def aliases(self) -> dict[str, int]:
+        return data.get_trainer_aliases()[self.game]
+
+    @property
+    def trainers(self) -> Mapping[int, Trainer]:
+        return data.get_game_trainers(self.game)
+
+    @property
+    def species(self) -> dict[str, Species]:
+        return data.get_all_species()
+
+    @property
+    def moves(self) -> dict[str, Move]:
+        return data.get_moves()
+
+    def parse(
+        self,
+        sink: OutputSink = None,
+        checkpoints: "RouteCheckpoints" = None,
+        plan: list[CompiledAction] = None,
+    ) -> None:
+        """Parses the route, streaming each action's output to sink
+
+        Defaults to writing config.output. Output is flushed after every
+        action, so everything before an error is kept.
+
+        With checkpoints, the route resumes after the last action that is
+        unchanged since the previous run and records a checkpoint after
+        every action it computes.
+
+        The route is compiled first unless an already compiled plan is given.
+        """
+        if plan is None:
+            plan = self.compile()
+        self.sink = sink if sink is not None else FileSink(self.output)
+        self.renderer = RENDERERS[self.output_format]()
+        if self.cache_dir is not None:
+            # Only imported when caching to keep startup fast
+            from nshot_cache import NShotCache
+
+            self.n_shot_cache = NShotCache(Path(self.cache_dir) / "n_shot.sqlite")
+        try:
+            start = 0
+            if checkpoints is not None:
+                start = checkpoints.restore(self)
+            # Restored output already includes anything written up front, e.g. headers
+            self.renderer.started = start > 0
+            for action in plan[start:]:
+                with self.measure(action):
+                    if checkpoints is None:
+                        self.parse_action(action)
+                    else:
+                        checkpoints.record(self, self.parse_action_output(action))
+                self.sink.flush()
+        finally:
+            if checkpoints is not None:
+                checkpoints.save()
+            if sink is None:
+                self.sink.close()
+            if self.n_shot_cache is not None:
+                self.n_shot_cache.close()
+                self.n_shot_cache = None
+
+    def compile(self) -> list[CompiledAction]:
+        """Resolves and validates every action before the route runs
+
+        Trainers, moves, species and items are resolved and stat modifiers,
+        variations and range checks are parsed here, so the route runs
+        without looking anything up by name. All invalid actions are
+        reported together.
+        """
+        return self.compile_actions(self.actions)
+
+    def compile_actions(
+        self, actions: list, prefix: str = "", start: int = 1
+    ) -> list[CompiledAction]:
+        """Compiles a list of actions, numbered from start in error messages"""
+        plan = []
+        errors = []
+        for idx, action in enumerate(actions, start):
+            if not isinstance(action, dict) or len(action) != 1:
+                errors.append(f"{prefix}Action #{idx} must have exactly one key: {action}")
+                continue
+            ((key, value),) = action.items()
+            if (handler := ACTIONS.get(key)) is None:
+                errors.append(f'{prefix}Action #{idx} is unknown: "{key}"')
+                continue
+            try:
+                # Empty values are skipped when the route runs
+                if value:
+                    value = handler.compile(self, value)
+            except InvalidRouteException as e:
+                errors += [f"{prefix}Action #{idx} ({key}): {error}" for error in e.errors]
+                continue
+            except (RouteException, ValueError) as e:
+                errors.append(f"{prefix}Action #{idx} ({key}): {e}")
+                continue
+            plan.append(CompiledAction(handler, value, idx))
+        if errors:
+            raise InvalidRouteException(errors)
+        return plan
+
+    def cached_plan(self, cache_dir: Path = None) -> list[CompiledAction]:
+        """Returns the compiled route, reusing the plan saved for identical route files"""
+        return self._cached(".plan", self.compile, cache_dir)
+
+    def _cached(self, suffix: str, build, cache_dir: Path = None):
+        """Loads data derived from the route file's contents, building it if not cached"""
+        if self.source is None:
+            return build()
+        # Only imported when caching to keep startup fast
+        from checkpoint import CACHE_DIR, load_cached, save_cached, source_path
+
+        path = source_path(self.source, suffix, cache_dir or self.cache_dir or CACHE_DIR)
+        value = load_cached(path)
+        if value is None:
+            value = build()
+            save_cached(path, value)
+        return value
+
+    def checkpoints(self, cache_dir: Path = None) -> "RouteCheckpoints":
+        """Loads the checkpoints saved by previous runs of this route file"""
+        from checkpoint import CACHE_DIR, RouteCheckpoints, checkpoint_path
+
+        path = checkpoint_path(
+            self.route_file, cache_dir or self.cache_dir or CACHE_DIR, self.output_format
+        )
+        return RouteCheckpoints(self.config, self.actions, path)
+
+    def measure(self, action: CompiledAction) -> ContextManager:
+        """Measures an action with the route's profiler, if it has one"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.action(action.index, self.action_label(action.index), self.n_shot_cache)
+
+    def action_label(self, index: int) -> str:
+        """Describes the action at a 1-based index, e.g. "fight BROCK" """
+        ((key, value),) = self.actions[index - 1].items()
+        if isinstance(value, dict) and "id" in value:
+            key += f" {', '.join(str(trainer) for trainer in _as_list(value['id']))}"
+        return key
+
+    def parse_action_output(self, action: CompiledAction) -> str:
+        """Performs a single route action, returning its output as well"""
+        sink, self.sink = self.sink, StringSink()
+        try:
+            self.parse_action(action)
+            output = self.sink.getvalue()
+        finally:
+            sink.write(self.sink.getvalue())
+            self.sink = sink
+        return output
+
+    def parse_action(self, action: CompiledAction) -> None:
+        """Performs a single route action, writing its rendered result"""
+        self.sink.write(self.renderer.render(self.perform(action)))
+
+    def perform(self, action: CompiledAction) -> ActionResult:
+        """Performs a single route action, returning its result
+
+        Actions with an empty value (e.g. print money: False) are skipped
+        """
+        output = action.run(self) if action.value else None
+        if self.hp is not None:
+            self.hp.set_max_hp(self.pokemon.max_hp)
+        result = ActionResult(action.index, action.handler.key, self.state())
+        if isinstance(output, str):
+            result.text = output
+        elif isinstance(output, BranchResult):
+            result.branch = output
+        elif output:
+            result.battles = output
+        return result
+
+    def perform_all(self, plan: list[CompiledAction]) -> tuple[list[ActionResult], PokemonState]:
+        """Performs actions in order, returning their results and the final state"""
+        return [self.perform(action) for action in plan], self.state()
+
+    def state(self) -> PokemonState:
+        """Snapshots your pokemon and money"""
+        return pokemon_state(self.pokemon, self.money)
+
+    def fork(self) -> "RouteFile":
+        """Returns a copy of the route with its own pokemon, money and HP
+
+        Forks don't share the output sink, they only return results.
+        """
+        ret = copy(self)
+        ret.pokemon = deepcopy(self.pokemon)
+        ret.hp = deepcopy(self.hp)
+        ret.sink = None
+        return ret
+
+    def badge_attribute(self, badge: str) -> str:
+        """Returns the Pokemon attribute set by the get badge action"""
+        badge = str(badge).lower()
         if badge in {"boulderbadge", "boulder", "attack", "atk", "att"}:
-            self.pokemon.att_badge = True
+            return "att_badge"
         elif badge in {"soulbadge", "soul", "speed", "spd"}:
-            self.pokemon.spd_badge = True
+            return "spd_badge"
         elif badge in {"thunderbadge", "thunder", "defense", "def"}:
-            self.pokemon.def_badge = True
+            return "def_badge"
         elif badge in {"volcanobadge", "volcano", "special", "spc", "spec"}:
-            self.pokemon.spc_badge = True
-        else:
-            raise BadItemIdentifierException(f"Could not parse badge name ({badge})")
+            return "spc_badge"
+        raise BadItemIdentifierException(f"Could not parse badge name ({badge})")
 
-    def parse_fight(self, details: dict, wild: bool = False) -> None:
-        """Process the fight actions
+    def compile_fight(self, details: dict, wild: bool = False) -> FightPlan:
+        """Resolves a fight action
 
         Parses out common fight details like exp split, verbosity, and stat
-        modifiers before determining what type of fight it is.
+        modifiers along with the trainers or wild pokemon that are fought.
         """
-        participants = details.get("split", 1)
-        verbosity = details.get("verbose", self.verbosity)
-
-        att_mod = details.get("att_mod", None)
-        def_mod = details.get("def_mod", None)
-
-        att_mod = stat_modifier.parse_stat_mod(att_mod)
-        def_mod = stat_modifier.parse_stat_mod(def_mod)
-
-        if not wild:
-            self.parse_trainer(details, participants, att_mod, def_mod, verbosity)
+        if not isinstance(details, dict):
+            raise RouteException(f"Fight details must be a mapping, got {details!r}")
+        if wild:
+            kind = "wild pokemon"
+            wild_ivs = _parse_ivs(details.get("wild_ivs", 0x9888))
+            opponents = tuple(
+                self.find_wild(name, wild_ivs) for name in _as_list(details.get("id"))
+            )
         else:
-            self.parse_wild_fight(details, participants, att_mod, def_mod, verbosity)
+            kind = "trainers"
+            opponents = tuple(
+                self.find_trainer(identifier) for identifier in _as_list(details.get("id"))
+            )
 
-    def parse_trainer(
-        self,
-        fight_details: dict,
-        participants: int,
-        att_mod: stat_modifier.StatModifier,
-        def_mod: stat_modifier.StatModifier,
-        verbosity: int,
-    ) -> None:
-        """Parses trainer fights"""
-        trainers = []
-        if t := fight_details.get("id", ""):
-            if not isinstance(t, list):
-                t = [t]
-            for identifier in t:
-                # offset
-                if isinstance(identifier, int):
-                    if trainer := self.trainers.get(identifier):
-                        trainers.append(trainer)
-                    else:
-                        raise BadTrainerIdentifierException(f"Bad offset: {identifier}")
-                elif isinstance(identifier, str):
-                    if offset := self.aliases.get(identifier):
-                        self.trainers[offset].alias = identifier
-                        trainers.append(self.trainers[offset])
-                    else:
-                        raise BadTrainerIdentifierException(f"Bad alias: {identifier}")
+        variations = _int_party_keys(details.get("variations", dict()))
+        if variations and len(opponents) > 1:
+            raise ValueError(f"Cannot specify both variations and multiple {kind}")
+
+        range_checks = _int_party_keys(details.get("range_check", dict()))
+        if range_checks and len(opponents) > 1:
+            raise ValueError(f"Cannot specity both range checks and multiple {kind}")
+
+        party_size = max((self.party_size(opponent) for opponent in opponents), default=0)
+        _check_party_keys("variations", variations, party_size, allow_all=True)
+        _check_party_keys("range_check", range_checks, party_size)
+        att_mod = stat_modifier.parse_stat_mod(_int_party_keys(details.get("att_mod")))
+        def_mod = stat_modifier.parse_stat_mod(_int_party_keys(details.get("def_mod")))
+        for name, mod in (("att_mod", att_mod), ("def_mod", def_mod)):
+            if isinstance(mod, dict):
+                _check_party_keys(name, mod, party_size)
+
+        return FightPlan(
+            opponents,
+            parse_variations(variations, self.ivs),
+            self.parse_range_checks(range_checks),
+            att_mod,
+            def_mod,
+            details.get("split", 1),
+            details.get("verbose", self.verbosity),
+            wild,
+            details.get("max_hits", self.max_hits),
+        )
+
+    def party_size(self, opponent) -> int:
+        """Returns how many pokemon a compiled opponent has"""
+        if isinstance(opponent, WildPoke):
+            return 1
+        offset, _ = opponent
+        return len(self.trainers[offset].pokes)
+
+    def find_trainer(self, identifier) -> tuple[int, str]:
+        """Resolves a trainer offset or alias to an (offset, alias) pair"""
+        if isinstance(identifier, int):
+            if identifier in self.trainers:
+                return identifier, None
+            raise BadTrainerIdentifierException(f"Bad offset: {identifier}")
+        elif isinstance(identifier, str):
+            if offset := self.aliases.get(identifier):
+                return offset, identifier
+            raise BadTrainerIdentifierException(f"Bad alias: {identifier}")
+        raise BadTrainerIdentifierException(f"Bad trainer identifier: {identifier}")
+
+    def find_wild(self, name: str, ivs: IVs) -> WildPoke:
+        """Resolves a wild identifier like L5 PIDGEY"""
+        if not (match := re.match(self.wild_regex, str(name))):
+            raise BadWildIdentifierException(f"Could not identify wild fight {name}")
+        species = match.group(3)
+        if not (spec := self.species.get(species.upper())):
+            raise BadWildIdentifierException(f"Could not identify wild species: {species}")
+        return WildPoke(spec, int(match.group(2)), ivs)
+
+    def find_move(self, name: str) -> Move:
+        """Resolves a move by name"""
+        if move := self.moves.get(str(name).strip().upper()):
+            return move
+        raise BadMoveIdentifierException(f"Could not identify move {name}")
+
+    def find_species(self, name: str) -> Species:
+        """Resolves a species by name"""
+        if species := self.species.get(str(name).upper()):
+            return species
+        raise BadSpeciesIdentifierException(f"Could not identify species {name}")
+
+    def compile_branch(self, branches: dict) -> BranchPlan:
+        """Compiles each named list of actions of a branch action
+
+        Actions every branch starts with are compiled, and later run, once.
+        """
+        if not isinstance(branches, dict) or not all(
+            isinstance(actions, list) and actions for actions in branches.values()
+        ):
+            raise RouteException("Branches must map names to lists of actions")
+
+        lists = list(branches.values())
+        shared = 0
+        if len(lists) > 1:
+            shortest = min(len(actions) for actions in lists)
+            while shared < shortest and all(actions[shared] == lists[0][shared] for actions in lists):
+                shared += 1
+
+        errors = []
+        common = []
+        plans = {}
+        try:
+            common = self.compile_actions(lists[0][:shared], "Every branch's ")
+        except InvalidRouteException as e:
+            errors += e.errors
+        for name, actions in branches.items():
+            try:
+                plans[name] = self.compile_actions(
+                    actions[shared:], f'Branch "{name}" ', shared + 1
+                )
+            except InvalidRouteException as e:
+                errors += e.errors
+        if errors:
+            raise InvalidRouteException(errors)
+        return BranchPlan(common, plans)
+
+    def compile_moves(self, move_name) -> tuple[Move, ...]:
+        """Resolves the moves of learn/unlearn move actions"""
+        return tuple(self.find_move(move) for move in _as_list(move_name))
+
+    def compile_items(self, item_name) -> tuple[str, ...]:
+        """Validates the items of a use item action"""
+        items = tuple(str(item).upper() for item in _as_list(item_name))
+        for item in items:
+            if item not in {"RARE CANDY", "PROTEIN", "IRON", "CARBOS", "CALCIUM", "HP UP"} | HEALING_ITEMS.keys():
+                raise BadItemIdentifierException(f"Could not identify item {item}")
+        return items
 
-        variations = fight_details.get("variations", dict())
-        if variations and len(trainers) > 1:
-            raise ValueError("Cannot specify both variations and multiple trainers")
-        variations = parse_variations(variations, self.pokemon.ivs)
+    def run_branch(self, branch: BranchPlan) -> BranchResult:
+        """Runs every branch from a copy of the current state
 
-        range_checks = fight_details.get("range_check", dict())
-        if range_checks and len(trainers) > 1:
-            raise ValueError("Cannot specity both range checks and multiple trainers")
-        range_checks = self.parse_range_checks(range_checks)
+        Branches run in parallel with more than one worker. The route
+        itself carries on from the state before the branch.
+        """
+        base = self.fork()
+        common, _ = base.perform_all(branch.common)
+        pool = executor(self.workers if len(branch.branches) > 1 else 1)
+
+        futures = {}
+        for name, plan in branch.branches.items():
+            fork = base.fork()
+            if pool is not None:
+                # Battles can't use the pool, database or profiler from inside a worker
+                fork.workers = 1
+                fork.n_shot_cache = None
+                fork.profiler = None
+            futures[name] = submit(pool, fork.perform_all, plan)
+
+        ret = BranchResult(common)
+        for name, future in futures.items():
+            ret.branches[name], ret.final[name] = future.result()
+        return ret
+
+    def run_fight(self, fight: FightPlan) -> list[BattleResult]:
+        """Performs a compiled fight action"""
+        results = []
+        for opponent in fight.opponents:
+            if fight.wild:
+                enemy = Pokemon(opponent.species, opponent.level, opponent.ivs, True, self.game)
+            else:
+                offset, alias = opponent
+                enemy = self.trainers[offset]
+                if alias:
+                    enemy = replace(enemy, alias=alias)
+                self.log(enemy.trainer_class.name)
 
-        for trainer in trainers:
-            trainer_name = trainer.trainer_class.name
-            print(trainer_name)
             battle = Battle(
                 self.pokemon,
-                trainer,
-                variations,
-                range_checks,
-                att_mod,
-                def_mod,
-                participants,
-                verbosity,
+                enemy,
+                fight.variations,
+                fight.range_checks,
+                fight.att_mod,
+                fight.def_mod,
+                fight.participants,
+                fight.verbosity,
+                fight.wild,
+                self.workers,
+                self.n_shot_cache,
+                self.profiler,
+                fight.max_hits,
+                self.hp,
             )
-            self.log += battle.battle()
-            self.money += trainer.prize_money
+            results.append(battle.result())
+            if fight.wild:
+                continue
 
+            self.money += enemy.prize_money
+            trainer_name = enemy.trainer_class.name
             if trainer_name == "BROCK":
                 self.pokemon.att_badge = True
             elif trainer_name == "LTSURGE":
@@ -159,61 +507,7 @@ class RouteFile:
                 self.pokemon.spd_badge = True
             elif trainer_name == "BLAINE":
                 self.pokemon.spc_badge = True
-
-    def parse_wild_fight(
-        self,
-        fight_details: dict,
-        participants: int,
-        att_mod: stat_modifier.StatModifier,
-        def_mod: stat_modifier.StatModifier,
-        verbosity: int,
-    ) -> None:
-        """Parses wild fights"""
-        wild_ivs = ivs_from_hex(fight_details.get("wild_ivs", 0x9888))
-        pokes = []
-        if t := fight_details.get("id", ""):
-            if not isinstance(t, list):
-                t = [t]
-            for name in t:
-                if match := re.match(self.wild_regex, name):
-                    level = int(match.group(2))
-                    species = match.group(3)
-                    if spec := self.species.get(species.upper()):
-                        pokes.append(Pokemon(spec, level, wild_ivs, True, self.game))
-                    else:
-                        raise BadWildIdentifierException(
-                            f"Could not identify wild species: {spec}"
-                        )
-                else:
-                    raise BadWildIdentifierException(
-                        f"Could not identify wild fight {name}"
-                    )
-
-        variations = fight_details.get("variations", dict())
-        if variations and len(pokes) > 1:
-            raise ValueError("Cannot specify both variations and multiple wild pokemon")
-        variations = parse_variations(variations, self.pokemon.ivs)
-
-        range_checks = fight_details.get("range_check", dict())
-        if range_checks and len(pokes) > 1:
-            raise ValueError(
-                "Cannot specity both range checks and multiple wild pokemon"
-            )
-        range_checks = self.parse_range_checks(range_checks)
-
-        for wild in pokes:
-            battle = Battle(
-                self.pokemon,
-                wild,
-                variations,
-                range_checks,
-                att_mod,
-                def_mod,
-                participants,
-                verbosity,
-                True,
-            )
-            self.log += battle.battle()
+        return results
 
     def parse_range_checks(self, details: dict) -> dict:
         """Parses range check dictionaries
@@ -229,20 +523,23 @@ class RouteFile:
         for idx, pokemon in details.items():
             if idx not in ranges:
                 ranges[idx] = defaultdict(dict)
+            if not isinstance(pokemon, dict):
+                raise RouteException(f"Range checks must be named, got {pokemon!r}")
             for name, range_details in pokemon.items():
-                if not (turns := range_details.get("turns")):
-                    raise TypeError(f"Must specify number of turns.")
-                if not (moves := range_details.get("moves")):
-                    raise TypeError(f"Must specify at least one move.")
+                if not isinstance(range_details, dict):
+                    raise RouteException(f"Range check {name} must be a mapping")
+                turns = range_details.get("turns")
+                if not isinstance(turns, int) or isinstance(turns, bool) or turns < 1:
+                    raise RouteException(f"Must specify number of turns.")
+                if not (moves := range_details.get("moves")) or not isinstance(moves, str):
+                    raise RouteException(f"Must specify at least one move.")
 
                 ranges[idx][name]["turns"] = turns
                 move_names = moves.split(",")
                 if len(move_names) > 1:
-                    ranges[idx][name]["moves"] = [
-                        self.moves[move.strip().upper()] for move in move_names
-                    ]
+                    ranges[idx][name]["moves"] = [self.find_move(move) for move in move_names]
                 else:
-                    ranges[idx][name]["moves"] = self.moves[moves.strip().upper()]
+                    ranges[idx][name]["moves"] = self.find_move(moves)
                 att_mods = range_details.get("att_mod", dict())
                 ranges[idx][name]["att_mods"] = (
                     stat_modifier.parse_stat_mod_range_checks(att_mods, turns)
@@ -254,32 +551,6 @@ class RouteFile:
 
         return ranges
 
-    def parse_item(self, item_name: str) -> None:
-        """Parses using an item"""
-        if not isinstance(item_name, list):
-            item_name = [item_name]
-
-        for item in item_name:
-            if item.upper() == "RARE CANDY":
-                self.pokemon.use_candy()
-            elif item.upper() in {"PROTEIN", "IRON", "CARBOS", "CALCIUM", "HP UP"}:
-                self.pokemon.use_vitamin(item)
-            else:
-                raise BadItemIdentifierException(f"Could not identify item {item}")
-
-    def parse_learn_move(self, move_name, func) -> None:
-        """Performs add/delete move functions"""
-        if not isinstance(move_name, list):
-            move_name = [move_name]
-        for move in move_name:
-            m = self.moves[move.upper()]
-            func(m)
-
-    def write_file(self) -> None:
-        """Saves log to output file"""
-        with open(self.output, "w") as f:
-            f.write(self.log)
-
 
 def parse_variations(details: dict, poke_ivs: IVs) -> dict:
     """Parses the variation dict
@@ -292,9 +563,13 @@ def parse_variations(details: dict, poke_ivs: IVs) -> dict:
     for k, v in details.items():
         if k not in variations:
             variations[k] = {}
+        if not isinstance(v, dict):
+            raise RouteException(f"Variations must be named, got {v!r}")
         for name, variation in v.items():
-            ivs = ivs_from_hex(variation.get("ivs", poke_ivs.hex))
-            wild_ivs = ivs_from_hex(variation.get("wild_ivs", 0x9888))
+            if not isinstance(variation, dict):
+                raise RouteException(f"Variation {name} must be a mapping")
+            ivs = _parse_ivs(variation.get("ivs", poke_ivs.hex))
+            wild_ivs = _parse_ivs(variation.get("wild_ivs", 0x9888))
             att_mod = stat_modifier.parse_stat_mod(variation.get("att_mod"))
             def_mod = stat_modifier.parse_stat_mod(variation.get("def_mod"))
             variations[k][name] = FightVariation(name, att_mod, def_mod, ivs, wild_ivs)
@@ -302,6 +577,58 @@ def parse_variations(details: dict, poke_ivs: IVs) -> dict:
     return variations
 
 
+def _int_party_keys(details):
+    """Converts party indexes given as strings to ints
+
+    Routes sent as JSON, e.g. to the server, can only have string keys.
+    """
+    if not isinstance(details, dict):
+        return details
+    return {
+        int(key) if isinstance(key, str) and key.isdigit() else key: value
+        for key, value in details.items()
+    }
+
+
+def _check_party_keys(section: str, details: dict, party_size: int, allow_all: bool = False) -> None:
+    """Checks that a fight section is keyed by party slots, 1-indexed like the party"""
+    if not isinstance(details, dict):
+        raise RouteException(f"{section} must be a mapping, got {details!r}")
+    for key in details:
+        if allow_all and key == "all":
+            continue
+        if not isinstance(key, int) or isinstance(key, bool) or not 1 <= key <= party_size:
+            raise RouteException(
+                f"{section} party index must be between 1 and {party_size}, got {key!r}"
+            )
+
+
+def _parse_ivs(value) -> IVs:
+    """Parses IVs given as a number like 0xffef"""
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise RouteException(f"IVs must be a number like 0xffef, got {value!r}")
+    return ivs_from_hex(value)
+
+
+def load_yaml(source: bytes) -> dict:
+    """Parses a route file, using libyaml when it's installed"""
+    # yaml is only imported when a route is loaded to keep startup fast
+    import yaml
+
+    return yaml.load(source, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _as_list(value) -> list:
+    """Actions take either a single value or a list of them"""
+    if value is None or value == "":
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def discard_log(text: str) -> None:
+    """Progress log for routes whose progress would only add noise"""
+
+
 class RouteException(Exception):
     pass
 
@@ -318,14 +645,185 @@ class BadWildIdentifierException(RouteException):
     pass
 
 
-if __name__ == "__main__":
-    import sys
+class BadMoveIdentifierException(RouteException):
+    pass
 
-    for f in sys.argv[1:]:
+
+class BadSpeciesIdentifierException(RouteException):
+    pass
+
+
+class InvalidRouteException(RouteException):
+    """Raised with every error found while compiling a route"""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def main(argv: list[str] = None) -> int:
+    """Command line entry point, also used by the drag-and-drop executable"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generates output files for route files")
+    parser.add_argument("routes", nargs="*", help="route .yaml files")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="run routes (files, directories or globs) in parallel, print a "
+        "status table and exit with a non-zero status if any failed",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes for --batch (defaults to the CPU count)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="with --batch, fail routes still running after this many seconds",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="reuse per-action checkpoints from the previous run and only "
+        "recompute actions after the first change",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="re-render a route's output every time the route file is saved, "
+        "recomputing only the actions after the first change",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl", "csv"],
+        default=None,
+        help="output format, overriding the route's config (defaults to text)",
+    )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="write route output to stdout instead of the configured files",
+    )
+    parser.add_argument(
+        "--optimize",
+        metavar="ITEMS",
+        help='search for where to use a pool of items, e.g. "RARE CANDY=2, PROTEIN", '
+        "to get the best kill%% on the route's range checks",
+    )
+    parser.add_argument(
+        "--weights",
+        help='weights of range checks by name for --optimize, e.g. "2_bbs=2, 1_bb=0.5" '
+        "(defaults to 1)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="serve newline delimited JSON-RPC requests on stdin/stdout, keeping "
+        "game data and open routes in memory between requests",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print the time, damage calculations, n-shot evaluations and cache "
+        "hits of the slowest actions and enemies of each route",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        action="store_true",
+        help="with --profile, also save cProfile stats next to each route as <route>.prof",
+    )
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="print the slowest imports of this entry point and exit, failing when over the import budget",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_report:
+        import import_time
+
+        print(import_time.import_report())
+        ratio = import_time.import_ratio()
+        print(f"Best of 3: {ratio:.2f}x the standard library (budget {import_time.IMPORT_BUDGET}x)")
+        return 0 if ratio <= import_time.IMPORT_BUDGET else 1
+
+    if args.serve:
+        import server
+
+        server.serve(sys.stdin, sys.stdout)
+        return 0
+
+    if args.watch:
+        import watch
+
+        if len(args.routes) != 1:
+            parser.error("--watch takes a single route file")
+        try:
+            watch.watch(args.routes[0], output_format=args.format)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.optimize:
+        import optimize
+
+        items = optimize.parse_items(args.optimize)
+        weights = optimize.parse_weights(args.weights) if args.weights else None
+        for f in args.routes:
+            try:
+                route = RouteFile(f)
+                result = optimize.optimize(route, items, weights)
+                print(f"{f}:\n{optimize.format_optimization(route, result)}")
+            except RouteException as e:
+                print(f"Raised error: {e}")
+        return 0
+
+    if args.batch:
+        import time
+
+        import batch
+
+        start = time.perf_counter()
+        routes = batch.find_routes(args.routes)
+        results = batch.run_batch(
+            routes, args.workers, args.incremental, args.format, args.timeout
+        )
+        print(batch.format_results(results, time.perf_counter() - start))
+        return 0 if all(result.ok for result in results) else 1
+
+    for f in args.routes:
         try:
-            route = RouteFile(f)
-            route.parse()
-            route.write_file()
+            sink = StreamSink(sys.stdout) if args.stdout else None
+            if args.incremental:
+                from checkpoint import CACHE_DIR
+
+                route = RouteFile(f, CACHE_DIR, args.format)
+                checkpoints, plan = route.checkpoints(), route.cached_plan()
+            else:
+                route = RouteFile(f, output_format=args.format)
+                checkpoints, plan = None, None
+            if not args.profile:
+                route.parse(sink, checkpoints, plan)
+                continue
+
+            import profiling
+
+            # Work done in worker processes can't be profiled
+            route.workers = 1
+            with profiling.RouteProfiler() as route.profiler:
+                route.parse(sink, checkpoints, plan)
+            print(f"{f}:\n{profiling.format_profile(route.profiler)}")
+            if args.profile_dump:
+                route.profiler.dump(Path(f).with_suffix(".prof"))
         except RouteException as e:
             print(f"Raised error: {e}")
     input("Press any <ENTER> to exit...")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
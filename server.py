@@ -0,0 +1,164 @@
+import inspect
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+import data
+import workers
+from checkpoint import Checkpoint, RouteCheckpoints
+from output import StringSink
+from route_parser import InvalidRouteException, RouteFile, discard_log, load_yaml
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+ROUTE_ERROR = -32000
+
+@dataclass
+class Document:
+    """A route kept open by the server, with the checkpoints of its last run"""
+    name: str
+    route: dict
+    output_format: str = None
+    checkpoints: list[Checkpoint] = field(default_factory=list)
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str, data: Any=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+class RouteServer:
+    """Runs routes for editor integrations, keeping everything warm in between
+
+    Game data is loaded once and open documents keep their checkpoints in
+    memory, so re-running a document after an edit only recomputes the
+    actions from the first one that changed.
+    """
+
+    def __init__(self):
+        self.documents: dict[str, Document] = {}
+        self.running = True
+        self.methods = {
+            'open': self.open,
+            'edit': self.edit,
+            'close': self.close,
+            'shutdown': self.shutdown,
+        }
+
+    def open(self, document: str, route: Any, format: str=None) -> dict:
+        '''Opens or replaces a document and runs it
+
+        route is the route file's text, or the route as an object
+        '''
+        if isinstance(route, str):
+            route = load_yaml(route.encode())
+        if not isinstance(route, dict):
+            raise RpcError(INVALID_PARAMS, 'route must be a route document or object')
+        old = self.documents.get(document)
+        self.documents[document] = Document(document, route, format)
+        if old is not None and old.output_format == format:
+            self.documents[document].checkpoints = old.checkpoints
+        return self.run(self.documents[document])
+
+    def edit(self, document: str, start: int, delete: int=0, insert: list=None) -> dict:
+        '''Replaces delete actions from the 0-based index start with insert and re-runs'''
+        doc = self._document(document)
+        actions = list(doc.route.get('route') or [])
+        if not _is_index(start) or start > len(actions):
+            raise RpcError(INVALID_PARAMS, f'start must be between 0 and {len(actions)}')
+        if not _is_index(delete):
+            raise RpcError(INVALID_PARAMS, 'delete must be a non-negative integer')
+        actions[start:start + delete] = insert or []
+        doc.route = {**doc.route, 'route': actions}
+        return self.run(doc)
+
+    def close(self, document: str) -> None:
+        self._document(document)
+        del self.documents[document]
+        if not self.documents:
+            # Routes' worker processes aren't needed until another one is opened
+            workers.shutdown()
+
+    def shutdown(self) -> None:
+        self.running = False
+        workers.shutdown()
+
+    def _document(self, document: str) -> Document:
+        if document not in self.documents:
+            raise RpcError(INVALID_PARAMS, f'Document is not open: {document}')
+        return self.documents[document]
+
+    def run(self, doc: Document) -> dict:
+        '''Runs a document from its checkpoints, returning its whole output'''
+        start = time.perf_counter()
+        route = RouteFile(doc.name, output_format=doc.output_format, route=doc.route)
+        # Trainer names are logged as progress, which would corrupt responses
+        route.log = discard_log
+        checkpoints = RouteCheckpoints(route.config, route.actions, saved=doc.checkpoints)
+        sink = StringSink()
+        try:
+            route.parse(sink, checkpoints)
+        finally:
+            doc.checkpoints = checkpoints.checkpoints
+        return {
+            'document': doc.name,
+            'format': route.output_format,
+            'output': sink.getvalue(),
+            'actions': len(route.actions),
+            'recomputed': len(route.actions) - checkpoints.resume_index,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def handle(self, request: Any) -> dict:
+        '''Handles a JSON-RPC request, returning its response, None for notifications'''
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RpcError(INVALID_REQUEST, 'Invalid request')
+            if (method := self.methods.get(request['method'])) is None:
+                raise RpcError(METHOD_NOT_FOUND, f'Method not found: {request["method"]}')
+            params = request.get('params', {})
+            args, kwargs = (params, {}) if isinstance(params, list) else ((), params)
+            try:
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e))
+            response = {'result': method(*args, **kwargs)}
+        except RpcError as e:
+            response = {'error': {'code': e.code, 'message': str(e)}}
+            if e.data is not None:
+                response['error']['data'] = e.data
+        except InvalidRouteException as e:
+            response = {'error': {'code': ROUTE_ERROR, 'message': str(e), 'data': {'errors': e.errors}}}
+        except Exception as e:
+            # Like watch mode, a bad route shouldn't end the session
+            response = {'error': {'code': ROUTE_ERROR, 'message': f'{type(e).__name__}: {e}'}}
+
+        if isinstance(request, dict) and 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, **response}
+
+def serve(stdin: TextIO, stdout: TextIO) -> None:
+    '''Serves newline delimited JSON-RPC 2.0 requests until shutdown or end of input'''
+    server = RouteServer()
+    data.load_database()
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            response = server.handle(json.loads(line))
+        except json.JSONDecodeError as e:
+            response = {'jsonrpc': '2.0', 'id': None,
+                        'error': {'code': PARSE_ERROR, 'message': f'Parse error: {e}'}}
+        if response is not None:
+            stdout.write(json.dumps(response) + '\n')
+            stdout.flush()
+        if not server.running:
+            break
+
+def _is_index(value: Any) -> bool:
+    '''JSON numbers and booleans both arrive as ints, only accept non-negative integers'''
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
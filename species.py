@@ -3,8 +3,15 @@ from dataclasses import dataclass
 from exp_curve import ExpCurve
 from type import Type
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class Species:
+    """Interned species data, compared and hashed by identity
+
+    Species are only created once by data.get_all_species, so copies and
+    pickles resolve back to that shared instance by dex number.
+    """
+    __slots__ = ('name', 'exp_curve', 'type1', 'type2', 'base_hp', 'base_att',
+                 'base_def', 'base_spd', 'base_spc', 'kill_exp', 'dex_num')
     name: str
     exp_curve: ExpCurve
     type1: Type
@@ -16,3 +23,11 @@ class Species:
     base_spc: int
     kill_exp: int
     dex_num: int
+
+    def __reduce__(self):
+        return (_interned_species, (self.dex_num,))
+
+def _interned_species(dex_num: int) -> Species:
+    '''Returns the shared Species for a dex number'''
+    import data
+    return data.get_species(dex_num)
@@ -117,29 +117,33 @@ def parse_stat_mod(mod: dict):
 
     if not mod:
         return StatModifier()
+    elif not isinstance(mod, dict):
+        raise ValueError(f'Invalid input for stat modifier: {mod}')
     elif any(isinstance(x, int) for x in mod.keys()):
         if not all(isinstance(x, int) for x in mod.keys()):
-            raise IndexError(f'If specifying pokemon index for Stat Modifiers, they must all be specified.')
+            raise ValueError(f'If specifying pokemon index for Stat Modifiers, they must all be specified.')
         mods = {}
         for idx, modifier in mod.items():
             mods[idx] = parse_stat_mod_dict(modifier)
         return mods
-    elif isinstance(mod, dict):
-        return parse_stat_mod_dict(mod)
-    raise TypeError(f'Invalid input for stat modifier: {mod}')
+    return parse_stat_mod_dict(mod)
 
 def parse_stat_mod_dict(mod_dict: dict) -> StatModifier:
     '''Given a singular stat modifier dictionary, return a StatModifier'''
-    stages = mod_dict.get('stages', '0/0/0/0')
+    if not isinstance(mod_dict, dict):
+        raise ValueError(f'Invalid input for stat modifier: {mod_dict}')
+    stages = _stages_str(mod_dict.get('stages', '0/0/0/0'))
     attack, defense, speed, special = [int(stage) for stage in stages.split('/')]
-    bbs = mod_dict.get('bbs', '0/0/0/0')
+    bbs = _stages_str(mod_dict.get('bbs', '0/0/0/0'))
     att_bb, def_bb, spd_bb, spc_bb = [int(bb) for bb in bbs.split('/')]
     return StatModifier(attack, defense, speed, special,
                         att_bb=att_bb, def_bb=def_bb, spd_bb=spd_bb, spc_bb=spc_bb)
 
 def parse_stat_mod_range_checks(mod: dict, turns) -> list[StatModifier]:
     '''Return a list of stat modifiers representing different turns'''
-    _stages = mod.get('stages', '0/0/0/0')
+    if not isinstance(mod, dict):
+        raise ValueError(f'Invalid input for stat modifier: {mod}')
+    _stages = _stages_str(mod.get('stages', '0/0/0/0'))
     stages = []
     for stage_turn in _stages.split(','):
         attack, defense, speed, special = [int(stage) for stage in stage_turn.split('/')]
@@ -148,9 +152,9 @@ def parse_stat_mod_range_checks(mod: dict, turns) -> list[StatModifier]:
         if len(stages) == 1:
             stages = stages * turns
         else:
-            raise IndexError(f'Invalid input for number of stages given ({len(stages)} and turns ({turns})')
+            raise ValueError(f'Invalid input for number of stages given ({len(stages)} and turns ({turns})')
 
-    _bbs = mod.get('bbs', '0/0/0/0')
+    _bbs = _stages_str(mod.get('bbs', '0/0/0/0'))
     bbs = []
     for bbs_turn in _bbs.split(','):
         att_bb, def_bb, spd_bb, spc_bb = [int(bb) for bb in bbs_turn.split('/')]
@@ -160,7 +164,7 @@ def parse_stat_mod_range_checks(mod: dict, turns) -> list[StatModifier]:
         if len(bbs) == 1:
             bbs = bbs * turns
         else:
-            raise IndexError(f'Invalid input for number of bbs given ({len(bbs)} and turns ({turns})')
+            raise ValueError(f'Invalid input for number of bbs given ({len(bbs)} and turns ({turns})')
 
     ret = []
     for stage, bb in zip(stages, bbs):
@@ -176,3 +180,9 @@ def parse_stat_mod_range_checks(mod: dict, turns) -> list[StatModifier]:
         ))
 
     return ret
+
+def _stages_str(stages) -> str:
+    '''Checks stages or badge boosts are given like "1/0/0/0"'''
+    if not isinstance(stages, str):
+        raise ValueError(f'Stages and badge boosts must look like 1/0/0/0, got {stages}')
+    return stages
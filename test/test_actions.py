@@ -0,0 +1,58 @@
+import unittest
+
+import actions
+import route_parser
+from actions import ACTIONS, ActionHandler, CompiledAction
+from output import StringSink
+
+class TestActions(unittest.TestCase):
+    def setUp(self):
+        self.route = route_parser.RouteFile('example_routes/squirtle.yaml')
+
+    def test_compile(self):
+        plan = self.route.compile()
+        self.assertEqual(len(plan), len(self.route.actions))
+        self.assertIs(plan[0].handler, ACTIONS['fight'])
+        self.assertEqual(plan[0].value.verbosity, self.route.actions[0]['fight'].get('verbose', self.route.verbosity))
+
+    def test_unknown_actions_reported_together(self):
+        self.route.actions = [{'fihgt': 'BUG_CATCHER_1'}, {'evolve': 'WARTORTLE'},
+                              {'evolve': 'WARTORTLE', 'get badge': 'boulder'}, {'shop': 'POTION'}]
+        with self.assertRaises(route_parser.InvalidRouteException) as cm:
+            self.route.compile()
+        message = str(cm.exception)
+        self.assertIn('#1 is unknown: "fihgt"', message)
+        self.assertIn('#3 must have exactly one key', message)
+        self.assertIn('#4 is unknown: "shop"', message)
+        self.assertNotIn('#2', message)
+
+    def test_register(self):
+        @actions.register
+        class Heal(ActionHandler):
+            key = 'heal'
+
+            def run(self, route, value):
+                route.sink.write(f'healed {value}\n')
+        self.addCleanup(ACTIONS.pop, 'heal')
+
+        self.route.actions = [{'heal': 'all'}, {'heal': False}]
+        sink = StringSink()
+        self.route.parse(sink)
+        self.assertEqual(sink.getvalue(), 'healed all\n')
+
+        # Handlers without run fail when they're registered
+        with self.assertRaises(TypeError):
+            @actions.register
+            class Shop(ActionHandler):
+                key = 'shop'
+        self.assertNotIn('shop', ACTIONS)
+
+    def test_empty_value_skipped(self):
+        self.route.sink = StringSink()
+        self.route.parse_action(CompiledAction(ACTIONS['print money'], False))
+        self.assertEqual(self.route.sink.getvalue(), '')
+        self.route.parse_action(CompiledAction(ACTIONS['print money'], True))
+        self.assertIn('Current money', self.route.sink.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import api
+from route_parser import InvalidRouteException, RouteException, load_yaml
+
+class TestApi(unittest.TestCase):
+    def test_run_route(self):
+        with open('example_routes/squirtle.yaml', 'rb') as f:
+            route = load_yaml(f.read())
+        with tempfile.TemporaryDirectory() as tmp:
+            route['config']['output'] = str(Path(tmp) / 'output.txt')
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                run = api.run_route(route)
+            self.assertEqual(stdout.getvalue(), '')
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+        with open('example_routes/squirtle_output.txt') as f:
+            self.assertEqual(run.render(), f.read())
+        self.assertEqual(len(run.actions), len(route['route']))
+        self.assertEqual(run.actions[0].battles[0].enemies[0].matchup.pokemon, 'L5 Squirtle')
+        self.assertEqual(run.final, run.actions[-1].state)
+        self.assertTrue(run.render('csv').startswith('action,type,branch,section'))
+
+    def test_reuse_plan(self):
+        route = {'config': {'species': 'nidoranm', 'level': 6, 'default_verbosity': 1},
+                 'route': [{'fight': {'id': 'BROCK'}}, {'use item': 'RARE CANDY'}]}
+        plan = api.compile_route(route)
+        for _ in range(2):
+            self.assertEqual(api.run_route(route, plan), api.run_route(route))
+
+        # The default verbosity is compiled into the plan, so changing it is rejected
+        route['config']['default_verbosity'] = 2
+        with self.assertRaises(RouteException):
+            api.run_route(route, plan)
+        with self.assertRaises(RouteException):
+            api.run_route({**route, 'route': route['route'][:1]}, plan)
+
+    def test_invalid_route(self):
+        route = {'config': {'species': 'nidoranm'},
+                 'route': [{'fight': {'id': 'BROKE'}}, {'use item': 'MASTER BALL'}]}
+        with self.assertRaises(InvalidRouteException) as e:
+            api.run_route(route)
+        self.assertEqual(len(e.exception.errors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
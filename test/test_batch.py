@@ -0,0 +1,107 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import batch
+
+ROUTE = '''config:
+    species: nidoranm
+    output: {output}
+route:
+    - use item: {item}
+    - print stats: True
+'''
+
+def sleepy_route(path: str, **kwargs) -> batch.BatchResult:
+    '''Stands in for run_route, sleeping for the seconds in path, seconds is when it started'''
+    start = time.time()
+    time.sleep(float(path))
+    return batch.BatchResult(path, True, start)
+
+class TestBatch(unittest.TestCase):
+    def test_find_routes(self):
+        routes = batch.find_routes(['example_routes'])
+        self.assertEqual([Path(r).name for r in routes], ['red.yaml', 'squirtle.yaml'])
+        routes = batch.find_routes(['example_routes/s*.yaml', 'example_routes/squirtle.yaml'])
+        self.assertEqual([Path(r).name for r in routes], ['squirtle.yaml'])
+        self.assertEqual(batch.find_routes(['example_routes/missing*.yaml']), [])
+
+    def test_run_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, item in (('good', 'RARE CANDY'), ('bad', 'MASTER BALL')):
+                path = Path(tmp) / f'{name}.yaml'
+                output = (Path(tmp) / f'{name}_output.txt').as_posix()
+                path.write_text(ROUTE.format(output=output, item=item))
+                paths.append(str(path))
+
+            results = batch.run_batch(paths, workers=2)
+            self.assertEqual([r.path for r in results], paths)
+            self.assertTrue(results[0].ok)
+            self.assertIn('L6 NidoranM', (Path(tmp) / 'good_output.txt').read_text())
+            self.assertFalse(results[1].ok)
+            self.assertIn('Could not identify item MASTER BALL', results[1].error)
+
+            table = batch.format_results(results, 1.0)
+            self.assertIn('FAILED', table)
+            self.assertTrue(table.endswith('2 routes, 1 failed in 1.00s (2.00 routes/s)'))
+
+    def write_routes(self, tmp: str, count: int) -> list[str]:
+        paths = []
+        for idx in range(count):
+            path = Path(tmp) / f'route{idx}.yaml'
+            output = (Path(tmp) / f'route{idx}_output.txt').as_posix()
+            path.write_text(ROUTE.format(output=output, item='RARE CANDY'))
+            paths.append(str(path))
+        return paths
+
+    def test_stream_batch(self):
+        async def collect(paths: list[str], stop_after: int=None, **kwargs) -> list[batch.BatchResult]:
+            ret = []
+            stream = batch.stream_batch(paths, workers=1, **kwargs)
+            async for result in stream:
+                ret.append(result)
+                if len(ret) == stop_after:
+                    await stream.aclose()
+                    break
+            return ret
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self.write_routes(tmp, 4)
+            results = asyncio.run(collect(paths))
+            self.assertEqual(sorted(r.path for r in results), sorted(paths))
+            self.assertTrue(all(r.ok for r in results))
+
+            # The slow route is stopped, freeing the only worker for the rest
+            slow = Path(tmp) / 'slow.yaml'
+            output = (Path(tmp) / 'slow_output.txt').as_posix()
+            slow.write_text(Path('example_routes/red.yaml').read_text().replace("'red_output.txt'", output))
+            results = asyncio.run(collect([str(slow)] + paths, timeout=0.5))
+            self.assertEqual([r.ok for r in results], [False, True, True, True, True])
+            self.assertEqual(results[0].error, 'TimeoutError: still running after 0.5s')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self.write_routes(tmp, 4)
+            results = asyncio.run(collect(paths, stop_after=1, concurrency=1))
+            self.assertEqual(len(results), 1)
+            time.sleep(0.5)
+            self.assertFalse((Path(tmp) / 'route3_output.txt').exists())
+    def test_timeout_without_signals_keeps_slot(self):
+        async def collect() -> list[batch.BatchResult]:
+            return [result async for result in batch.stream_batch(['1.0', '0'], workers=2, concurrency=1,
+                                                                  timeout=0.2)]
+
+        # Workers are forked after patching, so they see the same values
+        with patch.object(batch, 'CAN_TIME_LIMIT', False), patch.object(batch, 'run_route', sleepy_route):
+            before = time.time()
+            results = asyncio.run(collect())
+        self.assertEqual([r.ok for r in results], [False, True])
+        self.assertEqual(results[0].error, 'TimeoutError: still running after 0.2s')
+        # The second route only starts once the timed out one left the pool
+        self.assertGreaterEqual(results[1].seconds, before + 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
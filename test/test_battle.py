@@ -54,6 +54,21 @@ class TestBattle(unittest.TestCase):
 
         self.assertEqual(summary, exp)
 
+    def test_trainer_ai_battle(self):
+        nidoran = Pokemon('nidoranm', 4, ivs_from_hex(0xffef))
+        brock = self.trainers[self.aliases['BROCK']]
+        summary = Battle(nidoran, brock, participants=2, verbosity=3).battle()
+        self.assertIn('Tackle 11-14\t(crit: 20-24)\t(chosen: 49.61%)\n', summary)
+        self.assertIn('Defense Curl\t(chosen: 50.39%)\n', summary)
+        self.assertIn('Screech\t(chosen: 33.68%)\nBide\t(chosen: 33.16%)\n', summary)
+        self.assertIn('Damage taken per turn: 5.95 on average, up to 18 (53.11% none)\n', summary)
+
+        # Verbosity 2 output is unchanged
+        nidoran = Pokemon('nidoranm', 4, ivs_from_hex(0xffef))
+        summary = Battle(nidoran, brock, participants=2, verbosity=2).battle()
+        self.assertNotIn('chosen', summary)
+        self.assertNotIn('Damage taken', summary)
+
     def test_basic_battle_with_variations(self):
         squirtle_route = RouteFile('example_routes/squirtle.yaml')
         brock_variations = squirtle_route.actions[5]['fight']['variations']
@@ -66,6 +81,14 @@ class TestBattle(unittest.TestCase):
             exp_brock_vars = ''.join(f.readlines())
         self.assertEqual(exp_brock_vars, battle.battle())
 
+    def test_variations_do_not_change_trainer_data(self):
+        nidoran = Pokemon('nidoranm', 4, ivs_from_hex(0xffef))
+        vars = {'all': {'god': FightVariation('god', ivs=nidoran.ivs, enemy_ivs=ivs_from_hex(0xffff))}}
+        brock = self.trainers[self.aliases['BROCK']]
+        before = [(p.ivs, p.stats_str) for p in brock.pokes]
+        Battle(nidoran, brock, participants=2, verbosity=2, variations=vars).battle()
+        self.assertEqual([(p.ivs, p.stats_str) for p in brock.pokes], before)
+
     def test_basic_wild_battle_with_variations(self):
         squirtle_route = RouteFile('example_routes/squirtle.yaml')
         pidgey_variations = squirtle_route.actions[2]['wild']['variations']
@@ -124,3 +147,22 @@ class TestBattle(unittest.TestCase):
         with open('test/examples/bc1_ranges.txt') as f:
             exp_bc1_ranges = ''.join(f.readlines())
         self.assertEqual(exp_bc1_ranges, battle.battle())
+
+    def test_parallel_battle(self):
+        nido_route = RouteFile('example_routes/red.yaml')
+        squirtle_route = RouteFile('example_routes/squirtle.yaml')
+        brock_variations = squirtle_route.actions[5]['fight']['variations']
+        vars = parse_variations(brock_variations, squirtle_route.pokemon.ivs)
+        nidoran = Pokemon('nidoranm', 4, ivs_from_hex(0xffef))
+        battle = Battle(nidoran, self.trainers[self.aliases['BROCK']], participants=2,
+                        verbosity=2, variations=vars, workers=2)
+        with open('test/examples/brock_variations.txt') as f:
+            self.assertEqual(f.read(), battle.battle())
+
+        nidoran.att_badge = True
+        nidoran.moveset.add_move(self.moves['HORN ATTACK'])
+        range_checks = nido_route.parse_range_checks(nido_route.actions[2]['fight']['range_check'])
+        battle = Battle(nidoran, self.trainers[self.aliases['BC1']], range_checks=range_checks,
+                        verbosity=2, workers=2)
+        with open('test/examples/bc1_ranges.txt') as f:
+            self.assertEqual(f.read(), battle.battle())
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from output import StringSink
+from route_parser import InvalidRouteException, RouteFile
+
+ROUTE = '''config:
+    species: nidoranm
+    level: 6
+    ivs: 0xffef
+    default_verbosity: 1
+route:
+    - fight:
+        id: BROCK
+        split: 2
+{rest}'''
+
+BRANCH = '''    - branch:
+        candy first:
+            - learn move: HORN ATTACK
+            - use item: RARE CANDY
+            - fight:
+                id: BC1
+        candy after:
+            - learn move: HORN ATTACK
+            - fight:
+                id: BC1
+            - use item: RARE CANDY
+    - print money: True
+'''
+
+class TestBranch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def route(self, rest: str) -> RouteFile:
+        path = self.dir / 'route.yaml'
+        path.write_text(ROUTE.format(rest=rest))
+        return RouteFile(str(path))
+
+    def test_compile_shares_common_prefix(self):
+        branch = self.route(BRANCH).compile()[1].value
+        self.assertEqual([action.handler.key for action in branch.common], ['learn move'])
+        self.assertEqual(list(branch.branches), ['candy first', 'candy after'])
+        self.assertEqual(len(branch.branches['candy first']), 2)
+        self.assertEqual(branch.branches['candy first'][0].index, 2)
+
+    def test_branches_match_linear_routes(self):
+        route = self.route(BRANCH)
+        sink = StringSink()
+        route.parse(sink)
+        result = sink.getvalue()
+
+        linear = self.route('    - learn move: HORN ATTACK\n'
+                            '    - fight:\n'
+                            '        id: BC1\n'
+                            '    - use item: RARE CANDY\n')
+        linear.parse(StringSink())
+        self.assertIn('candy after |  12 | 973', result)
+        self.assertEqual(linear.pokemon.total_exp, 973)
+        self.assertEqual(linear.money, 1486)
+
+        # the route carries on from the state before the branch
+        self.assertTrue(result.endswith('\nCurrent money: 1386\n'))
+        unbranched = self.route('    - print money: True\n')
+        unbranched.parse(StringSink())
+        self.assertEqual(route.pokemon.total_exp, unbranched.pokemon.total_exp)
+        self.assertEqual(str(route.pokemon.moveset), str(unbranched.pokemon.moveset))
+
+    def test_parallel_branches(self):
+        serial = StringSink()
+        self.route(BRANCH).parse(serial)
+        route = self.route(BRANCH)
+        route.workers = 2
+        parallel = StringSink()
+        route.parse(parallel)
+        self.assertEqual(parallel.getvalue(), serial.getvalue())
+
+    def test_errors_name_the_branch(self):
+        route = self.route('    - branch:\n'
+                           '        a:\n'
+                           '            - learn move: HORN ATACK\n'
+                           '        b:\n'
+                           '            - use item: CANDY\n')
+        with self.assertRaises(InvalidRouteException) as cm:
+            route.compile()
+        self.assertEqual(cm.exception.errors, [
+            'Action #2 (branch): Branch "a" Action #1 (learn move): Could not identify move HORN ATACK',
+            'Action #2 (branch): Branch "b" Action #1 (use item): Could not identify item CANDY',
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
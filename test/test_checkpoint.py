@@ -0,0 +1,83 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+import checkpoint
+from output import StringSink
+from route_parser import RouteFile
+
+ROUTE = '''config:
+    species: nidoranm
+    level: 6
+    ivs: 0xffef
+    default_verbosity: 1
+route:
+    - fight:
+        id: BROCK
+        split: 2
+    - use item: RARE CANDY
+    - learn move: HORN ATTACK
+    - fight:
+        id: BC1
+    - {last}
+'''
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.route_path = self.dir / 'route.yaml'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_route(self, last: str, checkpoints: bool=True) -> tuple[RouteFile, str, int]:
+        self.route_path.write_text(ROUTE.format(last=last))
+        route = RouteFile(str(self.route_path))
+        computed = []
+        parse_action = route.parse_action
+        route.parse_action = lambda action: computed.append(action) or parse_action(action)
+        sink = StringSink()
+        route.parse(sink, route.checkpoints(self.dir / 'cache') if checkpoints else None)
+        return route, sink.getvalue(), len(computed)
+
+    def test_action_keys(self):
+        config = {'species': 'nidoranm'}
+        actions = [{'use item': 'RARE CANDY'}, {'fight': {'id': 'BROCK'}}]
+        keys = checkpoint.action_keys(config, actions)
+        self.assertEqual(len(set(keys)), 2)
+        self.assertEqual(checkpoint.action_keys(config, actions[:1]), keys[:1])
+        self.assertNotEqual(checkpoint.action_keys({'species': 'squirtle'}, actions)[0], keys[0])
+        self.assertNotEqual(checkpoint.action_keys(config, actions[::-1])[1], keys[1])
+
+    def test_resume(self):
+        _, expected, _ = self.run_route('print money: True', checkpoints=False)
+
+        route, output, computed = self.run_route('print money: True')
+        self.assertEqual(output, expected)
+        self.assertEqual(computed, 5)
+
+        rerun, output, computed = self.run_route('print money: True')
+        self.assertEqual(output, expected)
+        self.assertEqual(computed, 0)
+        self.assertEqual(rerun.money, route.money)
+        self.assertEqual(rerun.pokemon.level, route.pokemon.level)
+        self.assertEqual(rerun.pokemon.total_exp, route.pokemon.total_exp)
+        self.assertEqual(rerun.pokemon.ev_att, route.pokemon.ev_att)
+        self.assertTrue(rerun.pokemon.att_badge)
+        self.assertEqual(str(rerun.pokemon.moveset), str(route.pokemon.moveset))
+
+        _, expected, _ = self.run_route('print stats: True', checkpoints=False)
+        _, output, computed = self.run_route('print stats: True')
+        self.assertEqual(output, expected)
+        self.assertEqual(computed, 1)
+
+    def test_unreadable_checkpoints(self):
+        path = checkpoint.checkpoint_path(str(self.route_path), self.dir / 'cache')
+        path.parent.mkdir()
+        path.write_bytes(b'not a pickle')
+        _, _, computed = self.run_route('print money: True')
+        self.assertEqual(computed, 5)
+
+if __name__ == '__main__':
+    unittest.main()
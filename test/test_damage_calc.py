@@ -84,6 +84,26 @@ class TestDamageCalc(unittest.TestCase):
         exp_summary += '\t(Overall 3-hit Kill%: 68.1384%)'
         self.assertEqual('\n'.join(dmg_calc.summary), exp_summary)
 
+    def test_result_kill_pcts(self):
+        nidoran = Pokemon('nidoranm', 8, ivs = IVs(15, 15, 14, 15))
+        nidoran.att_badge = True
+        stat_mod = StatModifier()
+        for name in ('caterpie', 'geodude', 'onix', 'pidgey'):
+            enemy = Pokemon(name, 10)
+            for move in (get_move('horn attack'), get_move('tackle'), get_move('leer')):
+                expected = {}
+                for hits in range(1, 9):
+                    kill_pct = n_shot_with_mods(nidoran, enemy, hits, move, stat_mod, stat_mod, True)
+                    if kill_pct >= 1 and kill_pct <= 99.999:
+                        expected[hits] = kill_pct
+                result = DamageCalc(move, nidoran, enemy, stat_mod, stat_mod).result()
+                self.assertEqual(result.kill_pcts, expected)
+
+        caterpie = Pokemon('caterpie', 10)
+        dmg_calc = DamageCalc(get_move('tackle'), nidoran, caterpie, stat_mod, stat_mod)
+        self.assertEqual(list(dmg_calc.result().kill_pcts), [5])
+        self.assertEqual(dmg_calc.result(max_hits=4).kill_pcts, {})
+
     def test_n_shot_percent(self):
         nidoran = Pokemon('nidoranm', 4, ivs = IVs(15, 15, 14, 15))
         geodude = Pokemon('geodude', 12)
@@ -1,4 +1,7 @@
 import unittest
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
 
 import data
 # tests data integrity
@@ -22,6 +25,26 @@ class TestLearnsets(unittest.TestCase):
         self.assertEqual(bulb_ls[8].move.name, 'SolarBeam')
         self.assertEqual(bulb_ls[8].level, 48)
 
+class TestDefaultMovesets(unittest.TestCase):
+    def test_basic(self):
+        movesets = data.get_default_movesets()
+        bulb = movesets['rb'][1]
+        self.assertEqual(len(bulb), 101)
+        self.assertEqual([m.name for m in bulb[1]], ['Tackle', 'Growl'])
+        self.assertEqual([m.name for m in bulb[100]], ['Razor Leaf', 'Growth', 'Sleep Powder', 'SolarBeam'])
+
+    def test_matches_learnsets(self):
+        movesets = data.get_default_movesets()
+        learnsets = data.get_learnsets()
+        for game in ('rb', 'y'):
+            for dex_num, learnset in enumerate(learnsets[game]):
+                for level in range(101):
+                    exp = list(data.get_default_moveset(learnset, level))
+                    self.assertEqual(list(movesets[game][dex_num][level]), exp)
+
+    def test_shared(self):
+        self.assertIs(data.get_default_movesets(), data.get_default_movesets())
+
 class TestSpecies(unittest.TestCase):
     def test_basic(self):
         species = data.get_all_species()
@@ -33,6 +56,15 @@ class TestSpecies(unittest.TestCase):
         self.assertEqual(bulb.base_spd, 45)
         self.assertEqual(bulb.base_spc, 65)
         self.assertEqual(bulb.dex_num, 1)
+        self.assertIs(data.get_species(1), bulb)
+        self.assertIsNone(data.get_species(1000))
+
+    def test_interned(self):
+        bulb = data.get_species('bulbasaur')
+        self.assertIs(copy.deepcopy(bulb), bulb)
+        self.assertIs(pickle.loads(pickle.dumps(bulb)), bulb)
+        with self.assertRaises(FrozenInstanceError):
+            bulb.base_hp = 255
 
 class TestMoves(unittest.TestCase):
     def test_basic(self):
@@ -42,6 +74,15 @@ class TestMoves(unittest.TestCase):
         self.assertEqual(headbutt.pp, 15)
         self.assertEqual(headbutt.power, 70)
         self.assertEqual(headbutt.accuracy, 100)
+        self.assertIs(data.get_move_list()[headbutt.index], headbutt)
+
+    def test_interned(self):
+        tackle = data.get_move('tackle')
+        self.assertIs(copy.deepcopy(tackle), tackle)
+        self.assertIs(pickle.loads(pickle.dumps(tackle)), tackle)
+        self.assertEqual(len({tackle, data.get_move('TACKLE')}), 1)
+        with self.assertRaises(FrozenInstanceError):
+            tackle.power = 255
 
 class TestTrainer(unittest.TestCase):
     trainers = data.get_trainers()
@@ -66,6 +107,9 @@ class TestTrainerClass(unittest.TestCase):
         trainer_classes = data.get_trainer_classes()
         self.assertEqual(len(trainer_classes), 48)
         self.assertEqual(trainer_classes['BRUNO'].base_money, 99)
+        self.assertEqual(trainer_classes['YOUNGSTER'].ai_layers, ())
+        self.assertEqual(trainer_classes['MISTY'].ai_layers, (1, 3))
+        self.assertEqual(trainer_classes['LORELEI'].ai_layers, (1, 2, 3))
 
 class TestAliases(unittest.TestCase):
     def test_basic(self):
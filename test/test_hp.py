@@ -0,0 +1,36 @@
+import pickle
+import unittest
+
+from hp import HpDistribution
+
+class TestHpDistribution(unittest.TestCase):
+    def test_take_damage(self):
+        hp = HpDistribution(10)
+        self.assertEqual((hp.average, hp.fainted), (10, 0))
+        hp.take_damage({0: 0.5, 4: 0.25, 6: 0.25})
+        self.assertEqual(list(hp.chances), [0, 0, 0, 0, 0.25, 0, 0.25, 0, 0, 0, 0.5])
+        hp.take_damage({6: 1})
+        self.assertEqual(list(hp.chances), [0.5, 0, 0, 0, 0.5, 0, 0, 0, 0, 0, 0])
+        self.assertEqual((hp.average, hp.fainted), (2, 0.5))
+
+    def test_heal(self):
+        hp = HpDistribution(10)
+        hp.take_damage({2: 0.5, 10: 0.25, 9: 0.25})
+        hp.heal(5)
+        self.assertEqual(list(hp.chances), [0.25, 0, 0, 0, 0, 0, 0.25, 0, 0, 0, 0.5])
+        hp.heal()
+        self.assertEqual(list(hp.chances), [0.25] + [0] * 9 + [0.75])
+
+    def test_set_max_hp(self):
+        hp = HpDistribution(10)
+        hp.take_damage({0: 0.5, 10: 0.25, 9: 0.25})
+        hp.set_max_hp(12)
+        self.assertEqual(list(hp.chances), [0.25, 0, 0, 0.25] + [0] * 8 + [0.5])
+        hp.set_max_hp(3)
+        self.assertEqual(list(hp.chances), [0.25, 0.25, 0, 0.5])
+
+        copy = pickle.loads(pickle.dumps(hp))
+        self.assertEqual((copy.max_hp, copy.chances), (hp.max_hp, hp.chances))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+import import_time
+
+class TestImportTime(unittest.TestCase):
+    def test_parse_import_times(self):
+        output = 'import time: self [us] | cumulative | imported package\n'
+        output += 'import time:       368 |        368 |       exp_curve\n'
+        output += 'import time:      5134 |     102326 | route_parser\n'
+        times = import_time.parse_import_times(output)
+        self.assertEqual(len(times), 2)
+        self.assertEqual(times[0].name, 'exp_curve')
+        self.assertEqual(times[0].depth, 3)
+        self.assertEqual(times[1].self_us, 5134)
+        self.assertEqual(times[1].cumulative_us, 102326)
+        self.assertEqual(times[1].depth, 0)
+
+    def test_lazy_imports(self):
+        names = {t.name for t in import_time.measure_imports('route_parser')}
+        self.assertIn('route_parser', names)
+        self.assertNotIn('yaml', names)
+        self.assertNotIn('argparse', names)
+        self.assertNotIn('constants', names)
+
+    def test_split_import_us(self):
+        times = [import_time.ImportTime('re', 600, 6000, 1),
+                 import_time.ImportTime('pokemon', 2000, 9000, 1),
+                 import_time.ImportTime('route_parser', 1000, 16000, 0)]
+        self.assertEqual(import_time.split_import_us(times), (3000, 13000))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import battle
+import data
+from nshot_cache import NShotCache, n_shot_key
+from output import StringSink
+from pokemon import Pokemon
+from route_parser import RouteFile
+from stat_modifier import StatModifier
+
+class TestNShotCache(unittest.TestCase):
+    def setUp(self):
+        self.attacker = Pokemon('NidoranM', 10)
+        self.defender = Pokemon('Geodude', 12)
+        self.moves = [data.get_moves()['HORN ATTACK']] * 2
+        self.mods = [StatModifier()] * 2
+
+    def test_key(self):
+        key = n_shot_key(self.attacker, self.defender, 2, self.moves, self.mods, self.mods)
+        same = n_shot_key(Pokemon('NidoranM', 10), self.defender, 2, list(self.moves),
+                          [StatModifier(), StatModifier()], self.mods)
+        self.assertEqual(key, same)
+
+        boosted = [StatModifier(att_bb=1)] * 2
+        self.assertNotEqual(key, n_shot_key(self.attacker, self.defender, 2, self.moves, boosted, self.mods))
+        self.assertNotEqual(key, n_shot_key(self.attacker, self.defender, 1, self.moves[:1],
+                                            self.mods[:1], self.mods[:1]))
+        self.attacker.att_badge = True
+        self.assertNotEqual(key, n_shot_key(self.attacker, self.defender, 2, self.moves, self.mods, self.mods))
+
+    def test_get_put(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'n_shot.sqlite'
+            cache = NShotCache(path)
+            self.assertIsNone(cache.get('a'))
+            cache.put('a', 12.5)
+            self.assertEqual(cache.get('a'), 12.5)
+            cache.close()
+
+            cache = NShotCache(path)
+            self.assertEqual(cache.get('a'), 12.5)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            cache.close()
+
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'n_shot.sqlite'
+            with patch('nshot_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+                for key in ('a', 'b'):
+                    cache = NShotCache(path, max_entries=2)
+                    cache.put(key, 1.0)
+                    cache.close()
+                cache = NShotCache(path, max_entries=2)
+                self.assertEqual(cache.get('a'), 1.0)
+                cache.close()
+                cache = NShotCache(path, max_entries=2)
+                cache.put('c', 1.0)
+                cache.close()
+
+            # b was the least recently used
+            cache = NShotCache(path)
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('a'), 1.0)
+            cache.close()
+
+    def test_route(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            route = RouteFile('example_routes/red.yaml', Path(tmp))
+            sink = StringSink()
+            route.parse(sink)
+            with open('example_routes/red_output.txt') as f:
+                self.assertEqual(sink.getvalue(), f.read())
+            self.assertIsNone(route.n_shot_cache)
+            cache = NShotCache(Path(tmp) / 'n_shot.sqlite')
+            self.assertGreater(len(cache), 0)
+            cache.close()
+
+            # A second run, even of another copy of the route, calculates no range checks
+            with patch.object(battle, 'n_shot_with_mods') as n_shot:
+                route = RouteFile('example_routes/red.yaml', Path(tmp))
+                sink = StringSink()
+                route.parse(sink)
+            n_shot.assert_not_called()
+            with open('example_routes/red_output.txt') as f:
+                self.assertEqual(sink.getvalue(), f.read())
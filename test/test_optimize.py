@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import optimize
+from output import StringSink
+from route_parser import RouteFile
+
+ROUTE = '''config:
+    species: nidoranm
+    level: 6
+    ivs: 0xffef
+    default_verbosity: 1
+route:
+{candy1}    - fight:
+        id: BROCK
+        split: 2
+    - learn move: HORN ATTACK
+{candy3}    - fight:
+        id: BC1
+        range_check:
+            1:
+                two:
+                    turns: 2
+                    moves: Horn Attack
+            2:
+                one:
+                    turns: 1
+                    moves: Horn Attack
+{candy4}    - fight:
+        id: BC2
+        range_check:
+            1:
+                two:
+                    turns: 2
+                    moves: Horn Attack
+'''
+
+CANDY = '    - use item: RARE CANDY\n'
+
+class TestOptimize(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'route.yaml'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def score(self, candy1: str='', candy3: str='', candy4: str='') -> float:
+        '''Runs the route with candies added, returning the summed kill%'''
+        self.path.write_text(ROUTE.format(candy1=candy1, candy3=candy3, candy4=candy4))
+        route = RouteFile(str(self.path))
+        route.sink = StringSink()
+        return sum(optimize._score(route.perform(action).battles, {}) for action in route.compile())
+
+    def route_text(self) -> str:
+        return ROUTE.format(candy1='', candy3='', candy4='')
+
+    def test_parse_items(self):
+        self.assertEqual(optimize.parse_items('rare candy=2, PROTEIN, protein'),
+                         {'RARE CANDY': 2, 'PROTEIN': 2})
+        self.assertEqual(optimize.parse_weights('two=2, one=0.5'), {'two': 2.0, 'one': 0.5})
+
+    def test_matches_exhaustive_search(self):
+        self.path.write_text(self.route_text())
+        route = RouteFile(str(self.path))
+        result = optimize.optimize(route, {'RARE CANDY': 1})
+
+        scores = {1: self.score(candy1=CANDY), 3: self.score(candy3=CANDY),
+                  4: self.score(candy4=CANDY)}
+        best = max(scores, key=scores.get)
+        self.assertAlmostEqual(result.baseline, self.score())
+        self.assertAlmostEqual(result.score, scores[best])
+        self.assertEqual(result.placements, [optimize.Placement(best, 'RARE CANDY')])
+        self.assertGreater(result.pruned, 0)
+
+        # the route is left as it was
+        self.assertEqual(route.pokemon.level, 6)
+
+    def test_weights(self):
+        self.path.write_text(self.route_text())
+        route = RouteFile(str(self.path))
+        result = optimize.optimize(route, {'RARE CANDY': 1}, {'one': 0, 'two': 0})
+        self.assertEqual(result.score, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from output import FileSink, OutputSink, RewriteSink, StreamSink, StringSink
+
+class TestOutput(unittest.TestCase):
+    def test_string_sink(self):
+        sink = StringSink()
+        sink.write('a')
+        sink.write('b')
+        self.assertEqual(sink.getvalue(), 'ab')
+
+    def test_incomplete_sink(self):
+        class NoWrite(OutputSink):
+            pass
+        with self.assertRaises(TypeError):
+            NoWrite()
+
+    def test_file_sink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'out.txt'
+            with FileSink(str(path)) as sink:
+                sink.write('first\n')
+                sink.flush()
+                self.assertEqual(path.read_text(), 'first\n')
+                sink.write('second\n')
+            self.assertEqual(path.read_text(), 'first\nsecond\n')
+
+    def test_stream_sink(self):
+        stream = io.StringIO()
+        with StreamSink(stream) as sink:
+            sink.write('text')
+        self.assertFalse(stream.closed)
+        self.assertEqual(stream.getvalue(), 'text')
+
+    def test_rewrite_sink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'out.txt'
+            with RewriteSink(str(path)) as sink:
+                sink.write('first\n')
+                sink.write('second\n')
+            with FileSink(str(Path(tmp) / 'file.txt')) as sink:
+                sink.write('first\n')
+                sink.write('second\n')
+            self.assertEqual(path.read_bytes(), (Path(tmp) / 'file.txt').read_bytes())
+
+            with RewriteSink(str(path)) as sink:
+                sink.write('first\n')
+                sink.write('second\n')
+                self.assertIsNone(sink.rewritten_from)
+            self.assertEqual(path.read_text(), 'first\nsecond\n')
+
+            size = len('first\n'.encode()) + len(os.linesep) - 1
+            with RewriteSink(str(path)) as sink:
+                sink.write('first\n')
+                sink.write('seconds\nthird\n')
+                self.assertEqual(sink.rewritten_from, size + len('second'))
+            self.assertEqual(path.read_text(), 'first\nseconds\nthird\n')
+
+            with RewriteSink(str(path)) as sink:
+                sink.write('first\n')
+            self.assertEqual(path.read_text(), 'first\n')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,12 @@ class TestPokemon(unittest.TestCase):
         venusaur = Pokemon('venusaur', 65)
         self.assertEqual(venusaur.exp_given(1), 2896)
 
+    def test_default_moveset(self):
+        nidoran = Pokemon('nidoranm', 4)
+        self.assertEqual(str(nidoran.moveset), 'Leer, Tackle')
+        nidoran.moveset.add_move(data.get_move('horn attack'))
+        self.assertEqual(str(Pokemon('nidoranm', 4).moveset), 'Leer, Tackle')
+
     def test_print_possible_stats(self):
         nidoran = Pokemon('nidoranm', 4)
         exp_results = '''L4 NidoranM
@@ -67,7 +73,7 @@ SPC |  11|  11|  11|  11|  12|  12|  12|  12|  12|  12|  13|  13|  13|  13|  13|
 
         nidoran.ivs = ivs_from_hex(0x0000)
         nidoran.calculate_stats()
-        self.assertEqual(nidoran._hp, 25)
+        self.assertEqual(nidoran.max_hp, 25)
         self.assertEqual(nidoran._att, 14)
         self.assertEqual(nidoran._def, 11)
         self.assertEqual(nidoran._spd, 13)
@@ -77,6 +83,23 @@ SPC |  11|  11|  11|  11|  12|  12|  12|  12|  12|  12|  13|  13|  13|  13|  13|
         nidoran.calculate_stats()
         self.assertEqual(nidoran._att, 16)
 
+    def test_with_ivs(self):
+        nidoran = Pokemon('nidoranm', 10, ivs_from_hex(0xffef))
+        nidoran.att_badge = True
+        stats = nidoran.stats
+        self.assertIs(nidoran.with_ivs(ivs_from_hex(0xffef)), nidoran)
+
+        weak = nidoran.with_ivs(ivs_from_hex(0x0000))
+        self.assertEqual(nidoran.stats, stats)
+        self.assertEqual(nidoran.ivs, ivs_from_hex(0xffef))
+        self.assertLess(weak._att, nidoran._att)
+        self.assertEqual(weak.attack, 9 * weak._att // 8)
+
+        same = Pokemon('nidoranm', 10, ivs_from_hex(0x0000))
+        self.assertIs(same.stats, weak.stats)
+        self.assertIs(calculate_stats(same.species, 10, same.ivs, (0,) * 5),
+                      calculate_stats(weak.species, 10, weak.ivs, (0,) * 5))
+
 if __name__ == '__main__':
     unittest.main()
 
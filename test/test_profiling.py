@@ -0,0 +1,78 @@
+import pstats
+import tempfile
+import unittest
+from pathlib import Path
+
+import profiling
+from output import StringSink
+from route_parser import RouteFile
+
+ROUTE = '''config:
+    species: nidoranm
+    level: 12
+    ivs: 0xffef
+route:
+    - learn move: HORN ATTACK
+    - fight:
+        id: [BC1, BC2]
+    - fight:
+        id: BROCK
+        range_check:
+            2:
+                two:
+                    turns: 2
+                    moves: Horn Attack
+                one:
+                    turns: 1
+                    moves: Horn Attack
+'''
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'route.yaml'
+        self.path.write_text(ROUTE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def profile(self, cache_dir: Path=None) -> profiling.RouteProfiler:
+        route = RouteFile(str(self.path), cache_dir)
+        with profiling.RouteProfiler() as route.profiler:
+            route.parse(StringSink())
+        return route.profiler
+
+    def test_profile(self):
+        profiler = self.profile()
+        self.assertEqual([(e.action, e.name) for e in profiler.actions],
+                         [(1, 'learn move'), (2, 'fight BC1, BC2'), (3, 'fight BROCK')])
+        self.assertEqual(len(profiler.enemies), 9)
+        self.assertEqual([(e.action, e.name) for e in profiler.enemies[-2:]],
+                         [(3, 'BROCK: Geodude (1)'), (3, 'BROCK: Onix (2)')])
+
+        fight = profiler.actions[2]
+        self.assertEqual(fight.n_shots, 2)
+        self.assertGreater(fight.damage_calcs, 0)
+        self.assertGreater(fight.seconds, 0)
+        self.assertEqual(profiler.enemies[-1].n_shots, 2)
+        self.assertEqual(profiler.enemies[-1].damage_calcs, fight.damage_calcs)
+
+        report = profiling.format_profile(profiler, limit=1)
+        self.assertIn('Profiled 3 actions', report)
+        self.assertIn('2 n-shot evaluations', report)
+        self.assertIn('#3 fight BROCK', report)
+        self.assertIn('... and 8 more', report)
+
+        dump = Path(self.tmp.name) / 'route.prof'
+        profiler.dump(dump)
+        self.assertTrue(pstats.Stats(str(dump)).total_calls)
+
+    def test_cache_hits(self):
+        cache_dir = Path(self.tmp.name) / 'cache'
+        self.assertEqual(self.profile(cache_dir).actions[2].cache_misses, 2)
+        fight = self.profile(cache_dir).actions[2]
+        self.assertEqual((fight.cache_hits, fight.cache_misses, fight.n_shots), (2, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
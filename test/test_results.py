@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import unittest
+
+import results
+from route_parser import RouteFile
+from output import StringSink
+
+class TestResults(unittest.TestCase):
+    def setUp(self):
+        self.route = RouteFile('example_routes/squirtle.yaml')
+
+    def parse(self, output_format: str) -> str:
+        route = RouteFile('example_routes/squirtle.yaml', output_format=output_format)
+        sink = StringSink()
+        route.parse(sink)
+        return sink.getvalue()
+
+    def test_text_matches_output_file(self):
+        with open('example_routes/squirtle_output.txt') as f:
+            self.assertEqual(self.parse('text'), f.read())
+
+    def test_jsonl(self):
+        lines = self.parse('jsonl').splitlines()
+        self.assertEqual(len(lines), len(self.route.actions))
+        first = json.loads(lines[0])
+        self.assertEqual(first['index'], 1)
+        self.assertEqual(first['action'], 'fight')
+        self.assertEqual(first['state']['money'], 175)
+
+        enemy = first['battles'][0]['enemies'][0]
+        self.assertEqual(enemy['matchup']['enemy'], 'L5 Bulbasaur')
+        tackle = enemy['matchup']['player']['moves'][0]
+        self.assertEqual(tackle['move'], 'Tackle')
+        self.assertEqual(sum(tackle['rolls'].values()), 39)
+        self.assertIn('good_att', enemy['variations'])
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.parse('csv'))))
+        states = [row for row in rows if row['section'] == 'state']
+        self.assertEqual(len(states), len(self.route.actions))
+        self.assertEqual(states[0]['money'], '175')
+        moves = [row for row in rows if row['section'] == 'matchup_move']
+        self.assertEqual(moves[0]['move'], 'Tackle')
+        self.assertEqual(moves[0]['attacker'], 'Squirtle')
+
+    def test_csv_header_once(self):
+        renderer = results.CsvRenderer()
+        state = results.PokemonState('Squirtle', 5, 135, 19, 10, 12, 10, 10, 0, [])
+        first = renderer.render(results.ActionResult(1, 'learn move', state))
+        second = renderer.render(results.ActionResult(2, 'learn move', state))
+        self.assertTrue(first.startswith('action,'))
+        self.assertEqual(second, '2,learn move,,state,,,,,,,,,,,,5,135,19/10/12/10/10,0\n')
+
+    def test_output_suffix(self):
+        route = RouteFile('example_routes/squirtle.yaml', output_format='jsonl')
+        self.assertEqual(route.output, 'squirtle_output.jsonl')
+
+    def test_incomplete_renderer(self):
+        class NoRender(results.Renderer):
+            pass
+        with self.assertRaises(TypeError):
+            NoRender()
+
+if __name__ == '__main__':
+    unittest.main()
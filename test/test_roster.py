@@ -0,0 +1,50 @@
+import unittest
+
+import data
+from damage_calc import _damage
+from pokemon import Pokemon
+from stat_modifier import StatModifier
+
+class TestRoster(unittest.TestCase):
+    roster = data.get_roster('rb')
+    trainers = data.get_game_trainers('rb')
+
+    def test_columns(self):
+        total = sum(len(trainer.pokes) for trainer in self.trainers.values())
+        self.assertEqual(len(self.roster), total)
+
+        brock = self.trainers[0x3A3B5]
+        rows = [idx for idx, offset in enumerate(self.roster.offset) if offset == 0x3A3B5]
+        self.assertEqual(len(rows), 2)
+        onix = self.roster.slot.index(2, rows[0])
+        self.assertEqual(self.roster.species[onix], brock.pokes[1].species.dex_num)
+        self.assertEqual(self.roster.level[onix], 14)
+        self.assertEqual(self.roster.hp[onix], brock.pokes[1]._hp)
+        self.assertEqual(self.roster.defense[onix], brock.pokes[1]._def)
+        self.assertEqual(self.roster.base_def[onix], 160)
+        moves = [self.roster.move1[onix], self.roster.move2[onix], self.roster.move3[onix], self.roster.move4[onix]]
+        self.assertEqual(moves, [m.index for m in brock.pokes[1].moveset] + [0])
+
+    def test_damage_matches_damage_calc(self):
+        nidoking = Pokemon('nidoking', 20)
+        att_mod = StatModifier(attack=1, special=2)
+        def_mod = StatModifier(defense=-1, special=1)
+        for name in ('thrash', 'psychic', 'explosion', 'night shade', 'growl'):
+            move = data.get_move(name)
+            for roll, crit in ((217, False), (255, True)):
+                damage = self.roster.damage(nidoking, move, att_mod, def_mod, roll, crit)
+                exp = [_damage(move, nidoking, poke, att_mod, def_mod, roll, crit)
+                       for trainer in self.trainers.values() for poke in trainer.pokes]
+                self.assertEqual(list(damage), exp)
+
+    def test_kills(self):
+        nidoking = Pokemon('nidoking', 20)
+        thrash = data.get_move('thrash')
+        one_shots = self.roster.select(self.roster.kills(nidoking, thrash))
+        self.assertTrue(one_shots)
+        for offset, slot in one_shots:
+            poke = self.trainers[offset].pokes[slot - 1]
+            self.assertGreaterEqual(_damage(thrash, nidoking, poke, StatModifier(), StatModifier(), 217), poke._hp)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,13 @@
 import unittest
+import tempfile
+from unittest.mock import patch
+from pathlib import Path
 
+import actions
 import route_parser
+from move import Move
 from ivs import ivs_from_hex
+from output import StringSink
 
 class TestRouteParser(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -46,6 +52,191 @@ class TestRouteParser(unittest.TestCase):
         self.assertEqual(len(range2['att_mods']), 2)
         self.assertEqual(len(range2['def_mods']), 2)
 
+    def test_parse_output(self):
+        sink = StringSink()
+        self.squirtle_route.parse(sink)
+        with open('example_routes/squirtle_output.txt') as f:
+            self.assertEqual(sink.getvalue(), f.read())
+
+    def test_parse_streams_before_error(self):
+        @actions.register
+        class Fail(actions.ActionHandler):
+            key = 'fail'
+
+            def run(self, route, value):
+                raise route_parser.RouteException(value)
+        self.addCleanup(actions.ACTIONS.pop, 'fail')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            route_path = Path(tmp) / 'route.yaml'
+            output_path = Path(tmp) / 'route_output.txt'
+            route_path.write_text(
+                'config:\n'
+                '    species: nidoranm\n'
+                f'    output: {output_path.as_posix()}\n'
+                'route:\n'
+                '    - print money: True\n'
+                '    - fail: midway\n'
+            )
+            route = route_parser.RouteFile(str(route_path))
+            with self.assertRaises(route_parser.RouteException):
+                route.parse()
+            self.assertEqual(output_path.read_text(), '\nCurrent money: 0\n')
+
+    def test_compile_reports_all_errors(self):
+        self.squirtle_route.actions = [
+            {'fight': {'id': 0x3A1E7, 'range_check': {1: {'x': {'turns': 1, 'moves': 'TACKEL'}}}}},
+            {'learn move': ['BUBBLE', 'SURFF']},
+            {'use item': 'MASTER BALL'},
+            {'wild': {'id': 'L5 PIDGY'}},
+            {'evolve': 'WARTORTLE'},
+            {'get badge': 'rainbow'},
+        ]
+        with self.assertRaises(route_parser.InvalidRouteException) as cm:
+            self.squirtle_route.compile()
+        errors = cm.exception.errors
+        self.assertEqual(len(errors), 5)
+        self.assertIn('TACKEL', errors[0])
+        self.assertIn('SURFF', errors[1])
+        self.assertIn('MASTER BALL', errors[2])
+        self.assertIn('PIDGY', errors[3])
+        self.assertIn('rainbow', errors[4])
+
+    def test_compile_checks_party_indexes(self):
+        rc = {'x': {'turns': 1, 'moves': 'TACKLE'}}
+        self.squirtle_route.actions = [
+            {'fight': {'id': 'BROCK', 'range_check': {'second': rc, '2': rc}}},
+            {'fight': {'id': 'BROCK', 'range_check': {3: rc}}},
+            {'fight': {'id': 'BROCK', 'variations': {'all': {}, 0: {}}}},
+            {'wild': {'id': 'L5 PIDGEY', 'def_mod': {2: {'stages': '0/1/0/0'}}}},
+            {'fight': {'id': 'BROCK', 'range_check': {2: rc}, 'variations': {'all': {}}}},
+        ]
+        with self.assertRaises(route_parser.InvalidRouteException) as cm:
+            self.squirtle_route.compile()
+        errors = cm.exception.errors
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(errors[0].startswith("Action #1 (fight): range_check party index"))
+        self.assertIn("'second'", errors[0])
+        self.assertIn('between 1 and 2, got 3', errors[1])
+        self.assertIn('variations', errors[2])
+        self.assertTrue(errors[3].startswith('Action #4 (wild): def_mod party index must be between 1 and 1'))
+
+    def test_compile_reports_malformed_actions(self):
+        self.squirtle_route.actions = [
+            {'fight': 'BROCK'},
+            {'fight': {'id': 'BROCK', 'range_check': {1: {'x': {'moves': 'TACKLE'}}}}},
+            {'fight': {'id': 'BROCK', 'att_mod': {'stages': 1}}},
+            {'fight': {'id': 'BROCK', 'variations': ['good']}},
+            {'wild': {'id': 'L5 PIDGEY', 'wild_ivs': 'ffff'}},
+        ]
+        with self.assertRaises(route_parser.InvalidRouteException) as cm:
+            self.squirtle_route.compile()
+        self.assertEqual([error[:len('Action #1')] for error in cm.exception.errors],
+                         [f'Action #{idx}' for idx in range(1, 6)])
+
+        # Bugs in a handler aren't reported as route errors
+        @actions.register
+        class Broken(actions.ActionHandler):
+            key = 'broken'
+
+            def compile(self, route, value):
+                return value.missing
+
+            def run(self, route, value):
+                pass
+        self.addCleanup(actions.ACTIONS.pop, 'broken')
+        self.squirtle_route.actions = [{'broken': True}]
+        with self.assertRaises(AttributeError):
+            self.squirtle_route.compile()
+
+    def test_compile_resolves_identifiers(self):
+        plan = self.squirtle_route.compile()
+        fight = plan[0].value
+        self.assertIsInstance(fight.opponents[0][0], int)
+        self.assertIn('good_att', fight.variations['all'])
+        learn = next(action for action in plan if action.handler.key == 'learn move')
+        self.assertTrue(all(isinstance(move, Move) for move in learn.value))
+
+    def test_cached_plan(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plan = self.squirtle_route.cached_plan(Path(tmp))
+            self.assertEqual(len(list(Path(tmp).glob('routes/*.plan'))), 1)
+
+            route = route_parser.RouteFile('example_routes/squirtle.yaml')
+            cached = route.cached_plan(Path(tmp))
+            self.assertEqual([a.value for a in cached], [a.value for a in plan])
+            self.assertIs(cached[0].handler, actions.ACTIONS['fight'])
+
+            sink = StringSink()
+            route.parse(sink, plan=cached)
+            with open('example_routes/squirtle_output.txt') as f:
+                self.assertEqual(sink.getvalue(), f.read())
+
+    def test_cached_route(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            route = route_parser.RouteFile('example_routes/squirtle.yaml', Path(tmp))
+            self.assertEqual(route.route, self.squirtle_route.route)
+            self.assertEqual(len(list(Path(tmp).glob('routes/*.route'))), 1)
+
+            with patch.object(route_parser, 'load_yaml') as load_yaml:
+                cached = route_parser.RouteFile('example_routes/squirtle.yaml', Path(tmp))
+            load_yaml.assert_not_called()
+            self.assertEqual(cached.route, route.route)
+            self.assertIsNot(cached.route, route.route)
+
+    def test_track_hp(self):
+        route = {'config': {'species': 'nidoranm', 'level': 12, 'default_verbosity': 1, 'track_hp': True},
+                 'route': [{'fight': {'id': 'BROCK'}}, {'use item': 'SUPER POTION'},
+                           {'fight': {'id': 'BC1'}}, {'pokemon center': True}]}
+        hp_route = route_parser.RouteFile('hp', route=route)
+        plan = hp_route.compile()
+        results = [hp_route.perform(action) for action in plan[:1]]
+        geodude, onix = (enemy.matchup.hp for enemy in results[0].battles[0].enemies)
+        self.assertEqual((geodude.turns, geodude.max_hp), (7, 34))
+        self.assertLess(onix.average, geodude.average)
+        self.assertGreater(onix.fainted, geodude.fainted)
+        self.assertAlmostEqual(hp_route.hp.fainted * 100, onix.fainted)
+
+        max_hp, before = hp_route.hp.max_hp, list(hp_route.hp.chances)
+        hp_route.perform(plan[1])
+        self.assertEqual(hp_route.hp.fainted, before[0])
+        self.assertAlmostEqual(hp_route.hp.average, max_hp * (1 - before[0]))
+        hp_route.perform(plan[2])
+        self.assertEqual(hp_route.hp.max_hp, hp_route.pokemon.max_hp)
+        hp_route.perform(plan[3])
+        self.assertEqual((hp_route.hp.average, hp_route.hp.fainted), (hp_route.pokemon.max_hp, 0))
+
+        sink = StringSink()
+        route_parser.RouteFile('hp', route=route).parse(sink)
+        self.assertIn('L12 NidoranM vs L12 Geodude          >>> EXP GIVEN: 220\n'
+                      'HP after 7 enemy turns: ', sink.getvalue())
+
+        # HP is restored with the rest of the state when resuming from checkpoints
+        from checkpoint import RouteCheckpoints
+        hp_route = route_parser.RouteFile('hp', route=route)
+        checkpoints = RouteCheckpoints(route['config'], route['route'])
+        hp_route.parse(StringSink(), checkpoints)
+        route['route'][3] = {'fight': {'id': 'BROCK'}}
+        resumed = route_parser.RouteFile('hp', route=route)
+        checkpoints = RouteCheckpoints(route['config'], route['route'], saved=checkpoints.checkpoints)
+        sink, fresh = StringSink(), StringSink()
+        resumed.parse(sink, checkpoints)
+        self.assertEqual(checkpoints.resume_index, 3)
+        route_parser.RouteFile('hp', route=route).parse(fresh)
+        self.assertEqual(sink.getvalue(), fresh.getvalue())
+
+        # Without track_hp nothing changes
+        del route['config']['track_hp']
+        route['route'][3] = {'pokemon center': True}
+        sink, log = StringSink(), []
+        plain_route = route_parser.RouteFile('hp', route=route)
+        plain_route.log = log.append
+        plain_route.parse(sink)
+        self.assertNotIn('HP after', sink.getvalue())
+        self.assertEqual([line for line in log if 'track_hp' in line],
+                         ['SUPER POTION has no effect without track_hp',
+                          'pokemon center has no effect without track_hp'])
+
     def test_parse_wild_fight(self):
         ...
 
@@ -0,0 +1,102 @@
+import io
+import json
+import unittest
+
+import server
+import workers
+from route_parser import load_yaml
+
+ROUTE = '''config:
+    species: nidoranm
+    default_verbosity: 1
+route:
+    - fight:
+        id: BROCK
+    - print stats: True
+'''
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.server = server.RouteServer()
+        self.next_id = 0
+
+    def call(self, method: str, **params) -> dict:
+        self.next_id += 1
+        request = {'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params}
+        response = self.server.handle(request)
+        self.assertEqual(response['id'], self.next_id)
+        return response
+
+    def test_open_and_edit(self):
+        result = self.call('open', document='route', route=ROUTE)['result']
+        self.assertEqual((result['actions'], result['recomputed']), (2, 2))
+        self.assertIn('L5 NidoranM vs L12 Geodude', result['output'])
+        self.assertIn('Stat ranges WITHOUT badge boosts', result['output'])
+
+        result = self.call('edit', document='route', start=1, delete=1,
+                           insert=[{'print money': True}])['result']
+        self.assertEqual((result['actions'], result['recomputed']), (2, 1))
+        self.assertIn('L5 NidoranM vs L12 Geodude', result['output'])
+        self.assertTrue(result['output'].endswith('Current money: 1386\n'))
+
+        # The same route as an object in another format starts over
+        route = {'config': {'species': 'nidoranm'}, 'route': [{'print money': True}]}
+        result = self.call('open', document='route', route=route, format='jsonl')['result']
+        self.assertEqual(result['recomputed'], 1)
+        self.assertEqual(json.loads(result['output'])['text'], 'Current money: 0')
+
+        self.assertIsNone(self.call('close', document='route')['result'])
+        self.assertEqual(self.call('close', document='route')['error']['code'], server.INVALID_PARAMS)
+
+    def test_json_route(self):
+        # JSON object keys are strings, including the party indexes of fights
+        with open('example_routes/red.yaml', 'rb') as f:
+            route = json.loads(json.dumps(load_yaml(f.read())))
+        result = self.call('open', document='red', route=route)['result']
+        with open('example_routes/red_output.txt') as f:
+            self.assertEqual(result['output'], f.read())
+
+        fight = {'fight': {'id': 'BROCK', 'range_check': {'2': {'x': {'turns': 2, 'moves': 'TACKLE'}}}}}
+        result = self.call('edit', document='red', start=0, delete=len(route['route']), insert=[fight])['result']
+        self.assertIn('Range Check x: ', result['output'])
+        fight['fight']['range_check'] = {'3': {}}
+        response = self.call('edit', document='red', start=0, delete=1, insert=[fight])
+        self.assertEqual(response['error']['code'], server.ROUTE_ERROR)
+
+    def test_close_releases_workers(self):
+        self.call('open', document='route', route=ROUTE.replace('nidoranm', 'nidoranm\n    workers: 2'))
+        self.assertIn(2, workers._executors)
+        self.call('close', document='route')
+        self.assertEqual(workers._executors, {})
+
+    def test_errors(self):
+        response = self.call('open', document='bad', route=ROUTE.replace('BROCK', 'BROKE'))
+        self.assertEqual(response['error']['code'], server.ROUTE_ERROR)
+        self.assertEqual(len(response['error']['data']['errors']), 1)
+        self.assertEqual(self.call('missing')['error']['code'], server.METHOD_NOT_FOUND)
+        self.assertEqual(self.call('open', route=ROUTE)['error']['code'], server.INVALID_PARAMS)
+        self.call('open', document='route', route=ROUTE)
+        for start, delete in ((0, -1), (0, 1.5), (0, True), (-1, 0), (3, 0), ('0', 0)):
+            response = self.call('edit', document='route', start=start, delete=delete)
+            self.assertEqual(response['error']['code'], server.INVALID_PARAMS)
+        self.assertIsNone(self.server.handle({'jsonrpc': '2.0', 'method': 'shutdown'}))
+        self.assertFalse(self.server.running)
+
+    def test_serve(self):
+        requests = [
+            json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'open',
+                        'params': {'document': 'route', 'route': ROUTE}}),
+            'not json',
+            json.dumps({'jsonrpc': '2.0', 'id': 2, 'method': 'shutdown'}),
+            json.dumps({'jsonrpc': '2.0', 'id': 3, 'method': 'close', 'params': ['route']}),
+        ]
+        stdout = io.StringIO()
+        server.serve(io.StringIO('\n'.join(requests) + '\n'), stdout)
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([r.get('id') for r in responses], [1, None, 2])
+        self.assertIn('L5 NidoranM vs L12 Geodude', responses[0]['result']['output'])
+        self.assertEqual(responses[1]['error']['code'], server.PARSE_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
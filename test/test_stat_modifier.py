@@ -115,7 +115,7 @@ class TestStatModfier(unittest.TestCase):
         }
         self.assertEqual(parse_stat_mod_range_checks(rc_dict, 2)[0], StatModifier(attack=1, att_bb=2))
         self.assertEqual(parse_stat_mod_range_checks(rc_dict, 2)[1], StatModifier(attack=2, att_bb=-1))
-        with self.assertRaises(IndexError):
+        with self.assertRaises(ValueError):
             parse_stat_mod_range_checks(rc_dict, 3)
 
 if __name__ == '__main__':
@@ -1,4 +1,6 @@
 import unittest
+import copy
+from dataclasses import FrozenInstanceError, replace
 
 import data
 
@@ -19,16 +21,30 @@ class TestTrainer(unittest.TestCase):
         self.assertEqual(str(TestTrainer.trainers['y'][0x3A5A6]), exp_str)
 
     def test_set_move(self):
-        y_lance = TestTrainer.trainers['y'][0x3a5a6]
+        # Trainer data is shared, so only change copies of it
+        y_lance = copy.deepcopy(TestTrainer.trainers['y'][0x3a5a6])
         tackle = data.get_move('tackle')
         self.assertEqual(y_lance.pokes[0].moveset[0].name, 'Dragon Rage')
         y_lance.set_move(1, 1, tackle)
         self.assertEqual(y_lance.pokes[0].moveset[0].name, 'Tackle')
 
-        rb_lance = TestTrainer.trainers['rb'][0x3a522]
+        rb_lance = copy.deepcopy(TestTrainer.trainers['rb'][0x3a522])
         self.assertEqual(rb_lance.pokes[0].moveset[0].name, 'Dragon Rage')
         rb_lance.set_move(0, 0, tackle, False)
         self.assertEqual(rb_lance.pokes[0].moveset[0].name, 'Tackle')
+        self.assertEqual(TestTrainer.trainers['rb'][0x3a522].pokes[0].moveset[0].name, 'Dragon Rage')
+
+    def test_read_only(self):
+        y_lance = TestTrainer.trainers['y'][0x3A5A6]
+        with self.assertRaises(FrozenInstanceError):
+            y_lance.alias = 'LANCE'
+        with self.assertRaises(TypeError):
+            TestTrainer.trainers['y'][0x3A5A6] = y_lance
+
+        aliased = replace(y_lance, alias='E4 LANCE')
+        self.assertEqual(aliased, y_lance)
+        self.assertIs(aliased.pokes, y_lance.pokes)
+        self.assertEqual(y_lance.alias, '')
 
 if __name__ == '__main__':
     unittest.main()
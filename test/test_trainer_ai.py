@@ -0,0 +1,61 @@
+import unittest
+
+import data
+import trainer_ai
+from moveset import Moveset
+from pokemon import Pokemon
+from stat_modifier import StatModifier
+from trainer_ai import ai_effectiveness, damage_taken, hit_chance, move_choices
+from type import Type
+
+def pokemon(species: str, level: int, *moves: str) -> Pokemon:
+    return Pokemon(species, level, moveset=Moveset(data.get_move(move) for move in moves))
+
+class TestTrainerAI(unittest.TestCase):
+    def test_slot_weights(self):
+        staryu = pokemon('staryu', 18, 'tackle', 'water gun', 'harden', 'recover')
+        choices = move_choices(tuple(staryu.moveset), (), Pokemon('charmander', 10))
+        self.assertEqual(choices, (63 / 256, 64 / 256, 63 / 256, 66 / 256))
+        choices = move_choices(tuple(staryu.moveset)[:2], (), Pokemon('charmander', 10))
+        self.assertEqual(choices, (63 / 127, 64 / 127))
+
+    def test_layers(self):
+        moves = tuple(pokemon('staryu', 18, 'tackle', 'water gun', 'thunder wave', 'harden').moveset)
+        charmander = Pokemon('charmander', 10)
+        bulbasaur = Pokemon('bulbasaur', 10)
+
+        # Layer 3 prefers super effective moves and avoids not very effective ones
+        self.assertEqual(move_choices(moves, (3,), charmander), (0, 1, 0, 0))
+        self.assertEqual(move_choices(moves, (3,), bulbasaur), (63 / 129, 0, 0, 66 / 129))
+        # Layer 2 prefers setup moves on the second turn only
+        self.assertEqual(move_choices(moves, (2,), charmander, turn=2), (0, 0, 0, 1))
+        self.assertEqual(move_choices(moves, (2,), charmander), move_choices(moves, (), charmander))
+        # Layer 1 avoids status moves once you have a status
+        self.assertEqual(move_choices(moves, (1,), charmander, status=True)[2], 0)
+        self.assertEqual(move_choices(moves, (1,), charmander)[2], 63 / 256)
+
+    def test_ai_effectiveness(self):
+        self.assertEqual(ai_effectiveness(Type.Water, Type.Fire), 2)
+        self.assertEqual(ai_effectiveness(Type.Normal, Type.Ghost), 0)
+        self.assertEqual(ai_effectiveness(Type.Normal, Type.Water), 1)
+        # Only the first matching type chart entry counts, water before flying
+        self.assertEqual(ai_effectiveness(Type.Ice, Type.Water, Type.Flying), 0.5)
+
+    def test_damage_taken(self):
+        staryu = pokemon('staryu', 18, 'tackle', 'water gun')
+        charmander = Pokemon('charmander', 10)
+        mod = StatModifier()
+        damage = damage_taken(staryu, charmander, mod, mod, (3,))
+        self.assertAlmostEqual(sum(damage.values()), 1)
+        self.assertAlmostEqual(damage[0], 1 - hit_chance(data.get_move('water gun')))
+        self.assertEqual(max(damage), charmander._hp)
+
+        self.assertIn(damage, trainer_ai._memo.values())
+        self.assertEqual(damage_taken(staryu, charmander, mod, mod, (3,)), damage)
+        self.assertNotEqual(damage_taken(staryu, charmander, mod, mod), damage)
+
+        self.assertEqual(hit_chance(data.get_move('swift')), 1)
+        self.assertEqual(hit_chance(data.get_move('tackle')), 242 / 256)
+
+if __name__ == '__main__':
+    unittest.main()
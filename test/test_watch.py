@@ -0,0 +1,57 @@
+import unittest
+import os
+import tempfile
+from pathlib import Path
+
+import watch
+
+ROUTE = '''config:
+    species: nidoranm
+    level: 6
+    default_verbosity: 1
+    output: {output}
+route:
+    - fight:
+        id: BROCK
+    - {last}
+'''
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.route = Path(self.tmp.name) / 'route.yaml'
+        self.output = Path(self.tmp.name) / 'route_output.txt'
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_route(self, last: str) -> None:
+        self.route.write_text(ROUTE.format(output=self.output.as_posix(), last=last))
+
+    def test_rerender(self):
+        self.write_route('print money: True')
+        summary = watch.rerender(str(self.route))
+        self.assertIn('recomputed 2/2 actions', summary)
+        self.assertTrue(self.output.read_text().endswith('Current money: 1386\n'))
+
+        summary = watch.rerender(str(self.route))
+        self.assertIn('recomputed 0/2 actions, output unchanged', summary)
+
+        self.write_route('use item: RARE CANDY')
+        summary = watch.rerender(str(self.route))
+        self.assertIn('recomputed 1/2 actions, rewrote output from byte', summary)
+        self.assertNotIn('Current money', self.output.read_text())
+        self.assertIn('BROCK', self.output.read_text())
+
+    def test_watch_logs_errors(self):
+        self.route.write_text('config:\n    species: nidoranm\nroute:\n    - use item: MASTER BALL\n')
+        logs = []
+        watch.watch(str(self.route), interval=0, max_runs=1, log=logs.append)
+        self.assertEqual(len(logs), 1)
+        self.assertIn('Could not identify item MASTER BALL', logs[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+from collections import defaultdict
+
+from damage_calc import _range_rolls, crit_chance
+from move import Move
+from pokemon import Pokemon
+from stat_modifier import StatModifier
+from type import Type, effect_list
+
+# Chance out of 256 of the random move choice landing on each move slot.
+# Rolls on a slot the AI filtered out are rerolled.
+SLOT_WEIGHTS = (63, 64, 63, 66)
+
+# Layer 1 discourages these when your pokemon already has a status
+STATUS_MOVES = frozenset({'SING', 'SLEEP POWDER', 'HYPNOSIS', 'LOVELY KISS', 'SPORE',
+                          'POISONPOWDER', 'POISON GAS', 'TOXIC',
+                          'THUNDER WAVE', 'STUN SPORE', 'GLARE'})
+
+# Layer 2 encourages these on the enemy's second turn out
+SETUP_MOVES = frozenset({'MEDITATE', 'SHARPEN', 'HARDEN', 'WITHDRAW', 'DEFENSE CURL',
+                         'GROWTH', 'DOUBLE TEAM', 'PAY DAY', 'SWIFT', 'GROWL', 'TAIL WHIP',
+                         'LEER', 'STRING SHOT', 'SAND-ATTACK', 'SMOKESCREEN', 'KINESIS',
+                         'FLASH', 'CONVERSION', 'HAZE', 'SWORDS DANCE', 'BARRIER',
+                         'ACID ARMOR', 'AGILITY', 'AMNESIA', 'MINIMIZE', 'RECOVER',
+                         'SOFTBOILED', 'REST', 'TRANSFORM', 'SCREECH', 'LIGHT SCREEN',
+                         'REFLECT'})
+
+# Layer 3 counts these as better than a not very effective move of any type
+BETTER_MOVES = frozenset({'SUPER FANG', 'SEISMIC TOSS', 'NIGHT SHADE', 'SONICBOOM',
+                          'DRAGON RAGE', 'PSYWAVE', 'FLY'})
+
+# Moves without power here that have a power of 1 in the game's move data
+ONE_POWER_MOVES = frozenset({'GUILLOTINE', 'HORN DRILL', 'FISSURE', 'COUNTER'})
+
+MEMO_SIZE = 4096
+_memo: dict[tuple, dict[int, float]] = {}
+
+def move_choices(moves: tuple[Move, ...],
+                 layers: tuple[int, ...],
+                 defender: Pokemon,
+                 turn: int=1,
+                 status: bool=False
+    ) -> tuple[float, ...]:
+    '''Returns the chance of the enemy choosing each of its moves
+
+    Every move starts with the same priority, the trainer class's layers
+    adjust it and the enemy picks randomly between the moves left with the
+    best priority. Wild pokemon have no layers. turn is the enemy's turn
+    since it was sent out and status whether the defender has a status.
+    '''
+    priorities = [10] * len(moves)
+    for idx, move in enumerate(moves):
+        name = move.name.upper()
+        if 1 in layers and status and name in STATUS_MOVES:
+            priorities[idx] += 5
+        if 2 in layers and turn == 2 and name in SETUP_MOVES:
+            priorities[idx] -= 1
+        if 3 in layers:
+            multiplier = ai_effectiveness(move.type, defender.species.type1, defender.species.type2)
+            if multiplier > 1:
+                priorities[idx] -= 1
+            elif multiplier < 1 and any(_better_move(other, move.type) for other in moves):
+                priorities[idx] += 1
+
+    best = min(priorities)
+    weights = [weight if priority == best else 0
+               for weight, priority in zip(SLOT_WEIGHTS, priorities)]
+    return tuple(weight / sum(weights) for weight in weights)
+
+def ai_effectiveness(att_type: Type, def_type1: Type, def_type2: Type=Type.Null) -> float:
+    '''Returns the type multiplier the trainer AI sees
+
+    Unlike damage, the AI only uses the first matching entry of the type
+    chart, so a move that is super effective against one type and not very
+    effective against the other can be either.
+    '''
+    for e in effect_list:
+        if e.att_type == att_type and e.def_type in (def_type1, def_type2):
+            return e.effectiveness.value
+    return 1
+
+def _better_move(move: Move, move_type: Type) -> bool:
+    '''Whether layer 3 considers move a better choice than a move_type move'''
+    name = move.name.upper()
+    if name in BETTER_MOVES:
+        return True
+    return move.type != move_type and (move.power > 0 or name in ONE_POWER_MOVES)
+
+def hit_chance(move: Move) -> float:
+    '''Returns the chance of a move hitting, without accuracy or evasion stages'''
+    if move.name.upper() == 'SWIFT':
+        return 1
+    return (move.accuracy * 255 // 100) / 256
+
+def damage_taken(attacker: Pokemon,
+                 defender: Pokemon,
+                 att_mod: StatModifier,
+                 def_mod: StatModifier,
+                 layers: tuple[int, ...]=(),
+                 turn: int=1,
+                 status: bool=False
+    ) -> dict[int, float]:
+    '''Returns the chance of each amount of damage the enemy deals in a turn
+
+    The attacker is the enemy, choosing its move with move_choices. Misses
+    and moves that don't deal damage count as 0 and damage is capped at the
+    defender's HP. Results are memoized per matchup.
+    '''
+    moves = tuple(attacker.moveset)
+    key = (moves, layers, turn, status, _pokemon_key(attacker), _pokemon_key(defender),
+           att_mod, def_mod)
+    if key in _memo:
+        return dict(_memo[key])
+
+    ret = defaultdict(float)
+    for move, choice in zip(moves, move_choices(moves, layers, defender, turn, status)):
+        if not choice:
+            continue
+        hit = choice * hit_chance(move)
+        crit = crit_chance(move, attacker)
+        ret[0] += choice - hit
+        rolls, crit_rolls = _range_rolls(move, attacker, defender, att_mod, def_mod)
+        for damage, count in rolls.items():
+            ret[damage] += hit * (1 - crit) * count / 39
+        for damage, count in crit_rolls.items():
+            ret[damage] += hit * crit * count / 39
+
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+    _memo[key] = dict(sorted(ret.items()))
+    return dict(_memo[key])
+
+def _pokemon_key(pokemon: Pokemon) -> tuple:
+    return (pokemon.species, pokemon.level, pokemon.stats,
+            pokemon.att_badge, pokemon.def_badge, pokemon.spd_badge, pokemon.spc_badge)
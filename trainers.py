@@ -1,15 +1,26 @@
 from dataclasses import dataclass
 from move import Move
 
-@dataclass
+@dataclass(frozen=True)
 class TrainerClass:
+    """A trainer class's prize money and how its AI chooses moves
+
+    ai_layers are the move choice modifications (1-3) its pokemon apply,
+    see trainer_ai
+    """
     name: str
     base_money: int
+    ai_layers: tuple[int, ...] = ()
 
-@dataclass
+@dataclass(frozen=True)
 class Trainer:
+    """Read-only trainer data shared by every route
+
+    Use dataclasses.replace to get an aliased view, and copy party pokemon
+    before changing them.
+    """
     trainer_class: TrainerClass
-    pokes: list
+    pokes: tuple
     offset: int
     alias: str=''
 
@@ -28,7 +39,8 @@ class Trainer:
         '''Sets the move of a pokemon given the party index and move index
 
         Move object is expected, not a string. For backwards compatability,
-        yellow uses a different indexing system
+        yellow uses a different indexing system. Only meant to be used while
+        building trainer data.
         '''
 
         if is_yellow:
@@ -42,6 +54,9 @@ class Trainer:
     def __eq__(self, other) -> bool:
         return isinstance(other, Trainer) and self.offset == other.offset
 
+    def __hash__(self) -> int:
+        return hash(self.offset)
+
     def __repr__(self) -> str:
         alias_str = ''
         # Don't add the alias to the repr when it matches the class
@@ -0,0 +1,69 @@
+import os
+import time
+from typing import Callable
+
+from checkpoint import CACHE_DIR
+from output import RewriteSink
+from route_parser import RouteFile, discard_log
+from workers import shutdown
+
+def file_stamp(path: str) -> tuple[int, int]:
+    '''Returns what is compared between polls to detect a changed file'''
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def rerender(route_file: str, output_format: str=None) -> str:
+    '''Re-parses a route from its checkpoints, returning a one line summary
+
+    Only actions after the first change are recomputed and only the part
+    of the output file after the first changed section is rewritten.
+    '''
+    start = time.perf_counter()
+    route = RouteFile(route_file, CACHE_DIR, output_format)
+    route.log = discard_log
+    checkpoints = route.checkpoints()
+    unchanged = checkpoints.resume_index
+
+    with RewriteSink(route.output) as sink:
+        route.parse(sink, checkpoints, route.cached_plan())
+    rewritten_from = sink.rewritten_from
+
+    elapsed = time.perf_counter() - start
+    ret = f'{route.output}: recomputed {len(route.actions) - unchanged}/{len(route.actions)} actions'
+    if rewritten_from is None:
+        ret += ', output unchanged'
+    else:
+        ret += f', rewrote output from byte {rewritten_from}'
+    return ret + f' ({elapsed:.2f}s)'
+
+def watch(route_file: str,
+          interval: float=0.25,
+          max_runs: int=None,
+          log: Callable[[str], None]=print,
+          output_format: str=None
+    ) -> None:
+    '''Polls a route file and re-renders its output whenever it changes
+
+    Errors are logged rather than raised so a half-saved file doesn't end
+    the session. Runs until interrupted, or for max_runs renders.
+    '''
+    last = None
+    runs = 0
+    try:
+        while max_runs is None or runs < max_runs:
+            try:
+                stamp = file_stamp(route_file)
+            except OSError:
+                stamp = None
+            if stamp is not None and stamp != last:
+                last = stamp
+                runs += 1
+                try:
+                    log(rerender(route_file, output_format))
+                except Exception as e:
+                    log(f'{route_file}: {type(e).__name__}: {e}')
+                continue
+            time.sleep(interval)
+    finally:
+        # The route's worker processes stay up between renders
+        shutdown()
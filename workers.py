@@ -0,0 +1,38 @@
+import atexit
+
+class Done:
+    """Stands in for a Future when running serially"""
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+_executors = {}
+
+def executor(workers: int):
+    '''Returns a process pool shared by every caller, None to run serially'''
+    if workers <= 1:
+        return None
+    if workers not in _executors:
+        # Only imported when used, multiprocessing is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+@atexit.register
+def shutdown() -> None:
+    '''Stops every shared process pool, the next executor call starts a new one
+
+    Long-running modes call this to release the worker processes between
+    routes, and it runs at exit.
+    '''
+    while _executors:
+        _, pool = _executors.popitem()
+        pool.shutdown()
+
+def submit(executor, func, *args):
+    '''Runs func on the executor, or right away when there isn't one'''
+    if executor is not None:
+        return executor.submit(func, *args)
+    return Done(func(*args))